@@ -1,14 +1,36 @@
 """ATS Resume Optimizer - Keyword extraction and injection for job-specific resume optimization."""
 
+import asyncio
+import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import pypandoc
 import yake
 import re
 
+from .llm import agent_options, run_prompt
+from .pipeline import StageGraph
+from .profiles import KEYWORD_INJECTION, SKILL_EXTRACTION, get_prompt_budget
+from .prompt_builder import PromptBuilder, truncate_to_tokens
+
 logger = logging.getLogger(__name__)
 
+# System instruction for the keyword injection agent; kept static so every
+# injection request shares the same prefix
+KEYWORD_INJECTION_INSTRUCTIONS = """You are a LaTeX resume expert. Your goal is to subtly optimize the resume for ATS by adding relevant keywords.
+
+INSTRUCTIONS:
+1.  **Locate the "Skills" or "Technical Skills" section.**
+2.  **Integrate the new keywords into this existing section.**
+    *   If the section is a comma-separated list, simply append the new keywords.
+    *   If the section is categorized (e.g., "Languages:", "Tools:"), add each keyword to the most relevant category.
+    *   Do NOT create a new "Additional Skills" subsection unless the Skills section is missing entirely.
+3.  **Be conservative.** Only add keywords that fit naturally. Do not disrupt the layout or make the section overly long.
+4.  **Preserve ALL other resume content exactly as-is.** Do not change fonts, margins, or other sections.
+5.  If no Skills section exists, create a small \\section{Skills} before Education with the keywords.
+6.  Return ONLY the complete modified LaTeX code."""
+
 
 class ResumeATSOptimizer:
     """Optimizes resumes for ATS by injecting missing keywords from job descriptions."""
@@ -55,55 +77,100 @@ class ResumeATSOptimizer:
         ]
     )
 
-    def __init__(self, top_keywords: int = 20):
+    # Descriptions packed into one batched extraction request, and the
+    # per-description token budget inside that request
+    BATCH_SIZE = 10
+    BATCH_DESCRIPTION_TOKENS = 500
+
+    def __init__(self, top_keywords: int = 20, profile: Optional[str] = None):
         """
         Initialize ATS optimizer.
 
         Args:
             top_keywords: Number of top keywords to extract from job description
+            profile: Latency profile for the LLM stages (see ai.profiles)
         """
         self.top_keywords = top_keywords
+        self.profile = profile
         self._kw_extractor = yake.KeywordExtractor(
             top=top_keywords, lan="en", n=2, dedupLim=0.8  # Extract 1-2 word phrases
         )
 
-    def optimize(
+    async def optimize_async(
         self,
         job_description: str,
         company: str,
         title: str,
         resume_path: Path = Path("assets/user_file.tex"),
+        job_keywords: Optional[List[str]] = None,
     ) -> Dict[str, any]:
         """
         Optimize resume for specific job by injecting missing keywords.
 
+        The work runs as a small stage graph: keyword extraction and resume
+        parsing are independent and overlap, matching waits for both, and
+        injection waits for matching.
+
         Args:
             job_description: Full job description text
             company: Company name
             title: Job title
             resume_path: Path to original resume .tex file
+            job_keywords: Keywords already extracted for this job (e.g. by
+                `extract_job_keywords_batch`); skips the extraction call
 
         Returns:
             Dictionary with:
                 - tex_content: Optimized LaTeX resume content
                 - keywords_added: List of keywords that were added
                 - keywords_matched: List of keywords already in resume
+                - timings: Per-stage durations in milliseconds
         """
         logger.info(f"Starting ATS optimization for {company} - {title}")
 
-        # 1. Extract keywords from job description
-        job_keywords = self._extract_job_keywords(job_description)
-        logger.info(f"Extracted {len(job_keywords)} keywords from job description")
+        async def keywords_stage():
+            if job_keywords is not None:
+                return job_keywords[: self.top_keywords]
+            return await self._extract_job_keywords_async(job_description)
+
+        graph = StageGraph()
+        graph.add("keywords", keywords_stage)
+        graph.add(
+            "resume", lambda: asyncio.to_thread(self._parse_resume_text, resume_path)
+        )
+        # Matching is CPU-bound; keep it off the event loop like parsing
+        graph.add(
+            "match",
+            lambda keywords, resume: asyncio.to_thread(
+                self._match_stage, keywords, resume
+            ),
+            deps=("keywords", "resume"),
+        )
+        graph.add("inject", self._inject_stage, deps=("match", "resume"))
+
+        results, timings = await graph.run()
+        missing_keywords, matched_keywords = results["match"]
 
-        # 2. Parse resume
-        resume_text, resume_tex = self._parse_resume_text(resume_path)
-        logger.info(f"Parsed resume from {resume_path}")
+        logger.info(f"ATS pipeline stage timings (ms): {timings}")
+
+        return {
+            "tex_content": results["inject"],
+            "keywords_added": missing_keywords,
+            "keywords_matched": matched_keywords,
+            "timings": timings,
+        }
+
+    def _match_stage(
+        self, keywords: List[str], resume: Tuple[str, str]
+    ) -> Tuple[List[str], List[str]]:
+        """Split job keywords into (missing, matched) against the parsed resume."""
+        resume_text, _ = resume
+        logger.info(f"Extracted {len(keywords)} keywords from job description")
 
-        # 3. Filter keywords not semantically present
         missing_keywords = []
         matched_keywords = []
 
-        for kw in job_keywords:
+        for kw in keywords:
             if self._check_semantic_presence(kw, resume_text):
                 matched_keywords.append(kw)
             else:
@@ -112,45 +179,101 @@ class ResumeATSOptimizer:
         logger.info(
             f"Found {len(missing_keywords)} missing keywords, {len(matched_keywords)} already matched"
         )
+        return missing_keywords, matched_keywords
 
-        # 4. Inject missing keywords into resume
-        if missing_keywords:
-            optimized_tex = self._inject_keywords(resume_tex, missing_keywords)
-        else:
-            optimized_tex = resume_tex
+    async def _inject_stage(
+        self, match: Tuple[List[str], List[str]], resume: Tuple[str, str]
+    ) -> str:
+        """Inject the missing keywords into the LaTeX source."""
+        missing_keywords, _ = match
+        _, resume_tex = resume
+
+        if not missing_keywords:
             logger.info(
                 "No keywords to add - resume already contains all relevant keywords"
             )
+            return resume_tex
 
-        return {
-            "tex_content": optimized_tex,
-            "keywords_added": missing_keywords,
-            "keywords_matched": matched_keywords,
-        }
+        return await self._inject_keywords_async(resume_tex, missing_keywords)
 
-    def _extract_job_keywords(self, description: str) -> List[str]:
+    def optimize(
+        self,
+        job_description: str,
+        company: str,
+        title: str,
+        resume_path: Path = Path("assets/user_file.tex"),
+        job_keywords: Optional[List[str]] = None,
+    ) -> Dict[str, any]:
         """
-        Extract relevant skills from job description using LLM (with YAKE fallback).
-        Wrapper for async implementation.
+        Synchronous entry point for callers without an event loop.
+
+        Async code should await `optimize_async` directly instead.
         """
-        import asyncio
+        return asyncio.run(
+            self.optimize_async(
+                job_description=job_description,
+                company=company,
+                title=title,
+                resume_path=resume_path,
+                job_keywords=job_keywords,
+            )
+        )
 
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    future = pool.submit(
-                        asyncio.run, self._extract_job_keywords_async(description)
-                    )
-                    return future.result()
+    async def extract_job_keywords_batch(
+        self, descriptions: List[str]
+    ) -> List[List[str]]:
+        """
+        Extract skills for many job descriptions with as few LLM calls as possible.
+
+        Descriptions are packed `BATCH_SIZE` at a time into one structured
+        request. Jobs missing from (or malformed in) a batch response fall
+        back to a per-item call, which in turn falls back to YAKE.
+
+        Args:
+            descriptions: Job description texts
+
+        Returns:
+            Skill lists in the same order as `descriptions`
+        """
+        results: List[Optional[List[str]]] = [None] * len(descriptions)
+        pending = []
+        for i, description in enumerate(descriptions):
+            if not description or len(description) < 50:
+                results[i] = []
             else:
-                return loop.run_until_complete(
-                    self._extract_job_keywords_async(description)
+                pending.append(i)
+
+        batches = [
+            pending[start : start + self.BATCH_SIZE]
+            for start in range(0, len(pending), self.BATCH_SIZE)
+        ]
+
+        async def run_batch(indices: List[int]):
+            try:
+                batch = await self._extract_skills_batch_with_llm(
+                    [descriptions[i] for i in indices]
                 )
-        except RuntimeError:
-            return asyncio.run(self._extract_job_keywords_async(description))
+            except Exception as e:
+                logger.error(f"Batched keyword extraction failed: {e}")
+                batch = [None] * len(indices)
+            for i, skills in zip(indices, batch):
+                results[i] = skills
+
+        await asyncio.gather(*(run_batch(indices) for indices in batches))
+
+        fallback = [i for i, skills in enumerate(results) if skills is None]
+        if fallback:
+            logger.warning(
+                f"Falling back to per-job extraction for {len(fallback)} of "
+                f"{len(descriptions)} descriptions"
+            )
+            fallback_results = await asyncio.gather(
+                *(self._extract_job_keywords_async(descriptions[i]) for i in fallback)
+            )
+            for i, skills in zip(fallback, fallback_results):
+                results[i] = skills
+
+        return results
 
     async def _extract_job_keywords_async(self, description: str) -> List[str]:
         """Async LLM extraction of skills."""
@@ -162,25 +285,22 @@ class ResumeATSOptimizer:
             return await self._extract_skills_with_llm(description)
         except Exception as e:
             logger.error(f"LLM keyword extraction failed: {e}. Falling back to YAKE.")
-            return self._extract_job_keywords_yake(description)
+            return await asyncio.to_thread(self._extract_job_keywords_yake, description)
 
     async def _extract_skills_with_llm(self, description: str) -> List[str]:
         """Extract skills using Google ADK agent."""
         from google.adk.agents import LlmAgent
         from google.adk.sessions import InMemorySessionService
         from google.adk.runners import Runner
-        from google.genai import types
-        from google.adk.planners.built_in_planner import BuiltInPlanner
+
+        profile = self.profile
 
         class SkillExtractionAgent(LlmAgent):
             def __init__(self):
                 super().__init__(
                     name="skill_extraction_agent",
                     description="Extracts technical skills and tools from job descriptions",
-                    model="gemini-3-flash-preview",
-                    planner=BuiltInPlanner(
-                        thinking_config=types.ThinkingConfig(thinking_budget=-1)
-                    ),
+                    **agent_options(SKILL_EXTRACTION, profile),
                 )
 
         session_service = InMemorySessionService()
@@ -196,7 +316,7 @@ class ResumeATSOptimizer:
             session_service=session_service,
         )
 
-        prompt = f"""Extract 15-20 most important hard skills, tools, languages, and frameworks from this job description.
+        template = """Extract 15-20 most important hard skills, tools, languages, and frameworks from this job description.
         
         INSTRUCTIONS:
         1. Return ONLY a comma-separated list of skills.
@@ -205,26 +325,142 @@ class ResumeATSOptimizer:
         4. Normalize terms (e.g. "ReactJS" -> "React", "Amazon Web Services" -> "AWS").
         
         JOB DESCRIPTION:
-        {description[:4000]}
+        {description}
         """
+        prompt = (
+            PromptBuilder(
+                template, get_prompt_budget(SKILL_EXTRACTION), SKILL_EXTRACTION
+            )
+            .add("description", description)
+            .build()
+        )
 
-        user_message = types.Content(role="user", parts=[types.Part(text=prompt)])
-
-        async for event in runner.run_async(
+        response = await run_prompt(
+            runner,
+            prompt,
             user_id="user_001",
             session_id="skill_extraction_session",
-            new_message=user_message,
-        ):
-            if event.is_final_response() and event.content and event.content.parts:
-                response = event.content.parts[0].text.strip()
-                # Clean up response
-                if response.startswith("Skills:"):
-                    response = response.replace("Skills:", "")
+            call_site="ats_skill_extraction",
+            expected_output_tokens=300,
+        )
+        response = response.strip()
+        if not response:
+            return []
+
+        # Clean up response
+        if response.startswith("Skills:"):
+            response = response.replace("Skills:", "")
 
-                skills = [s.strip() for s in response.split(",") if s.strip()]
-                return skills[: self.top_keywords]
+        skills = [s.strip() for s in response.split(",") if s.strip()]
+        return skills[: self.top_keywords]
 
-        return []
+    async def _extract_skills_batch_with_llm(
+        self, descriptions: List[str]
+    ) -> List[Optional[List[str]]]:
+        """
+        Extract skills for several descriptions in one structured LLM call.
+
+        Returns:
+            One skill list per description, or None where the response had no
+            usable entry for that job
+        """
+        from google.adk.agents import LlmAgent
+        from google.adk.sessions import InMemorySessionService
+        from google.adk.runners import Runner
+        from google.genai import types
+
+        options = agent_options(SKILL_EXTRACTION, self.profile)
+        # The per-job output cap of the profile scales with the batch size
+        config = options.get("generate_content_config") or types.GenerateContentConfig()
+        options["generate_content_config"] = config.model_copy(
+            update={
+                "response_mime_type": "application/json",
+                "max_output_tokens": (
+                    config.max_output_tokens * len(descriptions)
+                    if config.max_output_tokens
+                    else None
+                ),
+            }
+        )
+
+        class BatchSkillExtractionAgent(LlmAgent):
+            def __init__(self):
+                super().__init__(
+                    name="batch_skill_extraction_agent",
+                    description="Extracts technical skills from several job descriptions at once",
+                    **options,
+                )
+
+        session_service = InMemorySessionService()
+        await session_service.create_session(
+            app_name="ats_optimizer_app",
+            user_id="user_001",
+            session_id="skill_batch_session",
+        )
+
+        runner = Runner(
+            agent=BatchSkillExtractionAgent(),
+            app_name="ats_optimizer_app",
+            session_service=session_service,
+        )
+
+        jobs = "\n\n".join(
+            f"### JOB {i}\n{truncate_to_tokens(description, self.BATCH_DESCRIPTION_TOKENS)}"
+            for i, description in enumerate(descriptions)
+        )
+        prompt = f"""Extract the 15-20 most important hard skills, tools, languages, and frameworks from EACH job description below.
+
+        INSTRUCTIONS:
+        1. Return ONLY a JSON object mapping each job number to its list of skills, e.g. {{"0": ["Python", "AWS"], "1": ["React"]}}.
+        2. Include every job number exactly once.
+        3. Focus on: Programming Languages, Frameworks, Cloud Platforms, Databases, Tools (Git, Docker), Key Technical Concepts (CI/CD, REST APIs).
+        4. IGNORE: Soft skills (Communication, Leadership), generic terms (Engineering, Development), and company names.
+        5. Normalize terms (e.g. "ReactJS" -> "React", "Amazon Web Services" -> "AWS").
+
+        JOB DESCRIPTIONS:
+        {jobs}
+        """
+
+        response = await run_prompt(
+            runner,
+            prompt,
+            user_id="user_001",
+            session_id="skill_batch_session",
+            call_site="ats_skill_extraction_batch",
+            expected_output_tokens=300 * len(descriptions),
+        )
+        return self._parse_batch_skills(response, len(descriptions))
+
+    def _parse_batch_skills(
+        self, response: str, count: int
+    ) -> List[Optional[List[str]]]:
+        """Per-job skill lists from a batched JSON response (None where unusable)."""
+        text = response.strip()
+        # Tolerate a fenced code block around the JSON
+        fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+        if fenced:
+            text = fenced.group(1)
+
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            logger.error("Batched keyword response is not valid JSON")
+            return [None] * count
+
+        if isinstance(data, list):
+            data = {str(i): skills for i, skills in enumerate(data)}
+        if not isinstance(data, dict):
+            return [None] * count
+
+        results = []
+        for i in range(count):
+            skills = data.get(str(i))
+            if not isinstance(skills, list):
+                results.append(None)
+                continue
+            cleaned = [str(s).strip() for s in skills if str(s).strip()]
+            results.append(cleaned[: self.top_keywords])
+        return results
 
     def _extract_job_keywords_yake(self, description: str) -> List[str]:
         """Legacy YAKE extraction fallback."""
@@ -352,24 +588,23 @@ class ResumeATSOptimizer:
         from google.adk.agents import LlmAgent
         from google.adk.sessions import InMemorySessionService
         from google.adk.runners import Runner
-        from google.genai import types
-        from google.adk.planners.built_in_planner import BuiltInPlanner
 
         keywords_str = ", ".join(keywords)
+        profile = self.profile
 
         # Create ADK agent for keyword injection
         class KeywordInjectionAgent(LlmAgent):
             """Agent for injecting keywords into LaTeX resumes."""
 
             def __init__(self):
-                model_args = types.ThinkingConfig(thinking_budget=-1)
-                planner = BuiltInPlanner(thinking_config=model_args)
-
                 super().__init__(
                     name="keyword_injection_agent",
                     description="Injects ATS keywords into LaTeX resumes naturally",
-                    model="gemini-3-flash-preview",
-                    planner=planner,
+                    **agent_options(
+                        KEYWORD_INJECTION,
+                        profile,
+                        instruction=KEYWORD_INJECTION_INSTRUCTIONS,
+                    ),
                 )
 
         # Create session and runner
@@ -388,56 +623,43 @@ class ResumeATSOptimizer:
             session_service=session_service,
         )
 
-        # Create prompt
-        prompt = f"""You are a LaTeX resume expert. Your goal is to subtly optimize the resume for ATS by adding relevant keywords.
-
-KEYWORDS TO ADD: {keywords_str}
-
-INSTRUCTIONS:
-1.  **Locate the "Skills" or "Technical Skills" section.**
-2.  **Integrate the new keywords into this existing section.**
-    *   If the section is a comma-separated list, simply append the new keywords.
-    *   If the section is categorized (e.g., "Languages:", "Tools:"), add each keyword to the most relevant category.
-    *   Do NOT create a new "Additional Skills" subsection unless the Skills section is missing entirely.
-3.  **Be conservative.** Only add keywords that fit naturally. Do not disrupt the layout or make the section overly long.
-4.  **Preserve ALL other resume content exactly as-is.** Do not change fonts, margins, or other sections.
-5.  If no Skills section exists, create a small \\section{{Skills}} before Education with the keywords.
-6.  Return ONLY the complete modified LaTeX code.
-
-ORIGINAL RESUME:
+        # Create prompt. The resume comes first: it is identical across jobs, so variants
+        # for several jobs share everything up to the keyword list
+        prompt = f"""ORIGINAL RESUME:
 ```latex
 {resume_tex}
 ```
 
-Return the modified resume:"""
+KEYWORDS TO ADD: {keywords_str}
 
-        user_message = types.Content(role="user", parts=[types.Part(text=prompt)])
+Return the modified resume:"""
 
         try:
-            async for event in runner.run_async(
+            modified_tex = await run_prompt(
+                runner,
+                prompt,
                 user_id="user_001",
                 session_id="keyword_injection_session",
-                new_message=user_message,
-            ):
-                if event.is_final_response() and event.content and event.content.parts:
-                    modified_tex = event.content.parts[0].text.strip()
-
-                    # Remove markdown code fences if present
-                    if modified_tex.startswith("```"):
-                        lines = modified_tex.split("\n")
-                        lines = lines[1:]  # Remove first line (```latex or ```)
-                        if lines and lines[-1].strip() == "```":
-                            lines = lines[:-1]  # Remove last line
-                        modified_tex = "\n".join(lines)
-
-                    logger.info("ADK agent successfully injected keywords")
-                    return modified_tex
-
+                call_site="ats_keyword_injection",
+            )
         except Exception as e:
             logger.error(f"Error using ADK for keyword injection: {e}", exc_info=True)
             raise
 
-        return resume_tex
+        modified_tex = modified_tex.strip()
+        if not modified_tex:
+            return resume_tex
+
+        # Remove markdown code fences if present
+        if modified_tex.startswith("```"):
+            lines = modified_tex.split("\n")
+            lines = lines[1:]  # Remove first line (```latex or ```)
+            if lines and lines[-1].strip() == "```":
+                lines = lines[:-1]  # Remove last line
+            modified_tex = "\n".join(lines)
+
+        logger.info("ADK agent successfully injected keywords")
+        return modified_tex
 
     async def _inject_keywords_async(self, resume_tex: str, keywords: List[str]) -> str:
         """
@@ -470,39 +692,6 @@ Return the modified resume:"""
             logger.info("Falling back to simple keyword append")
             return self._simple_inject_keywords(resume_tex, conservative_keywords)
 
-    def _inject_keywords(self, resume_tex: str, keywords: List[str]) -> str:
-        """
-        Synchronous wrapper for _inject_keywords_async.
-
-        Args:
-            resume_tex: Original LaTeX resume content
-            keywords: List of keywords to add
-
-        Returns:
-            Modified LaTeX content with keywords injected
-        """
-        import asyncio
-
-        # Get or create event loop
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If loop is already running, use run_in_executor
-                import concurrent.futures
-
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    future = pool.submit(
-                        asyncio.run, self._inject_keywords_async(resume_tex, keywords)
-                    )
-                    return future.result()
-            else:
-                return loop.run_until_complete(
-                    self._inject_keywords_async(resume_tex, keywords)
-                )
-        except RuntimeError:
-            # No event loop, create new one
-            return asyncio.run(self._inject_keywords_async(resume_tex, keywords))
-
     def _simple_inject_keywords(self, resume_tex: str, keywords: List[str]) -> str:
         """
         Fallback: Simple keyword injection by appending before \\end{document}.
@@ -0,0 +1,274 @@
+"""Process-wide pool of warm crawl4ai browsers.
+
+Launching headless Chromium is often the largest part of crawl latency, so
+browsers are started once and reused across requests. Playwright objects are
+bound to the event loop that created them while crawls are requested from
+several loops (the FastAPI loop and the loops of synchronous taskiq tasks),
+so the pool runs its own event loop on a daemon thread and callers submit
+work to it.
+
+Each browser serves at most ``max_pages`` concurrent pages across the pool
+and is recycled after ``max_navigations`` page loads (or after a crash) to
+bound memory growth. Pages load through the resource-blocking profile in
+`resource_blocking`, so only what text extraction needs is downloaded.
+
+Environment:
+    BROWSER_POOL_SIZE: Number of warm browsers (default 1)
+    BROWSER_POOL_MAX_PAGES: Concurrent pages across the pool (default 4)
+    BROWSER_POOL_MAX_NAVIGATIONS: Page loads before a browser is recycled
+        (default 50)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+
+from .resource_blocking import (
+    BlockingProfile,
+    BlockingStats,
+    make_page_hook,
+    resource_blocking_enabled,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def default_browser_config() -> BrowserConfig:
+    return BrowserConfig(
+        browser_type="chromium",
+        headless=True,
+        viewport_width=1280,
+        viewport_height=720,
+    )
+
+
+class _PooledBrowser:
+    """A started crawler plus its usage counters (touched only on the pool loop)."""
+
+    def __init__(self, crawler: AsyncWebCrawler):
+        self.crawler = crawler
+        self.in_flight = 0
+        self.navigations = 0
+        self.retiring = False
+
+
+class BrowserPool:
+    """
+    Warm `AsyncWebCrawler` instances shared by every crawl in the process.
+
+    Example:
+        >>> results = await get_browser_pool().crawl_many(urls, run_config)
+    """
+
+    def __init__(
+        self,
+        browser_config: Optional[BrowserConfig] = None,
+        size: int = 1,
+        max_pages: int = 4,
+        max_navigations: int = 50,
+        blocking_profile: Optional[BlockingProfile] = None,
+    ):
+        self.browser_config = browser_config or default_browser_config()
+        self.blocking_profile = blocking_profile
+        self.blocking_stats = BlockingStats()
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.max_navigations = max(1, max_navigations)
+
+        self._start_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        # Pool-loop state
+        self._members: List[_PooledBrowser] = []
+        self._pages = asyncio.Semaphore(self.max_pages)
+        self._launch_lock = asyncio.Lock()
+        self._stats = {"launches": 0, "recycles": 0, "navigations": 0, "failures": 0}
+
+    # -- caller side (any thread / event loop) --------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="browser-pool", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+                # asyncio primitives bind to the first loop that uses them
+                self._pages = asyncio.Semaphore(self.max_pages)
+                self._launch_lock = asyncio.Lock()
+            return self._loop
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    async def crawl_many(
+        self, urls: List[str], config: CrawlerRunConfig
+    ) -> List[Optional[Any]]:
+        """
+        Crawl `urls` on pooled browsers.
+
+        Returns:
+            One crawl4ai result per URL, in order (None where the crawl raised)
+        """
+        if not urls:
+            return []
+        return await asyncio.wrap_future(self._submit(self._crawl_many(urls, config)))
+
+    async def crawl(self, url: str, config: CrawlerRunConfig) -> Optional[Any]:
+        """Crawl one URL on a pooled browser (None if the crawl raised)."""
+        return (await self.crawl_many([url], config))[0]
+
+    def warm_up(self):
+        """Start the pool's browsers in the background without waiting."""
+
+        def _log_failure(future):
+            if not future.cancelled() and future.exception():
+                logger.warning(f"Browser pool warm-up failed: {future.exception()}")
+
+        self._submit(self._warm_up()).add_done_callback(_log_failure)
+
+    async def shutdown(self):
+        """Close every browser and stop the pool thread."""
+        with self._start_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        try:
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self._close_all(), loop)
+            )
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            await asyncio.to_thread(thread.join, 10)
+
+    def metrics(self) -> Dict[str, Any]:
+        members = list(self._members)
+        return {
+            **self._stats,
+            "browsers": len(members),
+            "pages_in_flight": sum(m.in_flight for m in members),
+            "max_pages": self.max_pages,
+            "max_navigations": self.max_navigations,
+            "resource_blocking": (
+                self.blocking_stats.snapshot() if self.blocking_profile else None
+            ),
+        }
+
+    # -- pool loop side -------------------------------------------------------
+
+    def _active(self) -> List[_PooledBrowser]:
+        return [m for m in self._members if not m.retiring]
+
+    async def _launch(self) -> _PooledBrowser:
+        crawler = AsyncWebCrawler(config=self.browser_config)
+        if self.blocking_profile:
+            crawler.crawler_strategy.set_hook(
+                "on_page_context_created",
+                make_page_hook(self.blocking_profile, self.blocking_stats),
+            )
+        await crawler.start()
+        member = _PooledBrowser(crawler)
+        self._members.append(member)
+        self._stats["launches"] += 1
+        logger.info(f"Launched pooled browser ({len(self._members)} running)")
+        return member
+
+    async def _warm_up(self):
+        async with self._launch_lock:
+            while len(self._active()) < self.size:
+                await self._launch()
+
+    async def _checkout(self) -> _PooledBrowser:
+        async with self._launch_lock:
+            active = self._active()
+            if len(active) < self.size:
+                member = await self._launch()
+            else:
+                member = min(active, key=lambda m: m.in_flight)
+            member.in_flight += 1
+            return member
+
+    async def _checkin(self, member: _PooledBrowser, failed: bool):
+        member.in_flight -= 1
+        member.navigations += 1
+        self._stats["navigations"] += 1
+
+        if not member.retiring and (
+            failed or member.navigations >= self.max_navigations
+        ):
+            member.retiring = True
+            self._stats["recycles"] += 1
+
+        if member.retiring and member.in_flight == 0 and member in self._members:
+            self._members.remove(member)
+            await self._close(member)
+
+    async def _close(self, member: _PooledBrowser):
+        try:
+            await member.crawler.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {e}")
+
+    async def _close_all(self):
+        members, self._members = self._members, []
+        await asyncio.gather(*(self._close(m) for m in members))
+
+    async def _crawl_one(self, url: str, config: CrawlerRunConfig):
+        async with self._pages:
+            try:
+                member = await self._checkout()
+            except Exception as e:
+                self._stats["failures"] += 1
+                logger.error(f"Could not start a browser for {url}: {e}")
+                return None
+            failed = False
+            try:
+                return await member.crawler.arun(url, config=config)
+            except Exception as e:
+                # crawl4ai reports page errors on the result; an exception
+                # usually means the browser itself is unusable
+                failed = True
+                self._stats["failures"] += 1
+                logger.error(f"Pooled crawl of {url} failed: {e}")
+                return None
+            finally:
+                await self._checkin(member, failed)
+
+    async def _crawl_many(self, urls: List[str], config: CrawlerRunConfig):
+        return await asyncio.gather(*(self._crawl_one(url, config) for url in urls))
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get or create the process-wide browser pool configured from the environment."""
+    global _browser_pool
+
+    if _browser_pool is None:
+        with _browser_pool_lock:
+            if _browser_pool is None:  # Double-check pattern
+                _browser_pool = BrowserPool(
+                    size=int(os.getenv("BROWSER_POOL_SIZE", "1")),
+                    max_pages=int(os.getenv("BROWSER_POOL_MAX_PAGES", "4")),
+                    max_navigations=int(
+                        os.getenv("BROWSER_POOL_MAX_NAVIGATIONS", "50")
+                    ),
+                    blocking_profile=(
+                        BlockingProfile.from_env()
+                        if resource_blocking_enabled()
+                        else None
+                    ),
+                )
+
+    return _browser_pool
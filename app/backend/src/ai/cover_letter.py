@@ -15,15 +15,18 @@ import re
 from google.adk.agents import LlmAgent
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
-from google.genai import types
-from google.adk.planners.built_in_planner import BuiltInPlanner
 
 from ai.jobs import JobMatcher
+from ai.fake_llm import use_fake_backend
+from ai.llm import agent_options, run_prompt
+from ai.profiles import COVER_LETTER, get_prompt_budget
+from ai.prompt_builder import PromptBuilder
+from ai.ranking import select_excerpts
 
 logger = logging.getLogger(__name__)
 
-# Verify API key is available
-if not os.getenv("GOOGLE_API_KEY"):
+# Verify API key is available (not needed for the offline fake backend)
+if not os.getenv("GOOGLE_API_KEY") and not use_fake_backend():
     logger.error("GOOGLE_API_KEY environment variable is not set!")
     raise ValueError(
         "GOOGLE_API_KEY is required for cover letter generation. Please set it in your .env file."
@@ -66,26 +69,51 @@ STRUCTURE (4 Paragraphs):
 TONE: Professional, confident, authentic - should NOT feel AI-generated"""
 
 
+# Token budget for the resume excerpts included in the prompt
+RESUME_EXCERPT_TOKENS = 350
+
+COVER_LETTER_PROMPT = """Generate a professional cover letter following the guidelines in your instructions.
+
+RESUME HIGHLIGHTS:
+{resume_text}
+
+KEY SKILLS FROM RESUME:
+{resume_skills}
+
+JOB DETAILS:
+- Company: {company}
+- Position: {title}
+- Job Description: {job_description}
+
+Generate ONLY the 4 paragraphs (Opening, Mission Connection, Experience, Closing).
+Do NOT include date, address, salutation, or signature - just the body paragraphs.
+Keep total output to 400-500 words."""
+
+
 class CoverLetterAgent(LlmAgent):
     """Agent for generating professional cover letters."""
 
-    def __init__(self):
-        self._model_args = types.ThinkingConfig(thinking_budget=-1)
-        self._planner = BuiltInPlanner(thinking_config=self._model_args)
-
+    def __init__(self, profile=None):
         super().__init__(
             name="cover_letter_agent",
             description="Generates professional cover letters following Harvard guidelines",
-            model="gemini-3-flash-preview",
-            planner=self._planner,
+            **agent_options(
+                COVER_LETTER, profile, instruction=HARVARD_GUIDELINES_SYSTEM
+            ),
         )
 
 
 class CoverLetterGenerator:
     """Generates professional cover letters using Google ADK and Harvard guidelines."""
 
-    def __init__(self):
-        """Initialize the cover letter generator."""
+    def __init__(self, profile=None):
+        """
+        Initialize the cover letter generator.
+
+        Args:
+            profile: Latency profile for the LLM call (see ai.profiles)
+        """
+        self.profile = profile
         self._runner = None
         self._session_initialized = False
 
@@ -98,7 +126,7 @@ class CoverLetterGenerator:
                 user_id="user_001",
                 session_id="cover_letter_session",
             )
-            agent = CoverLetterAgent()
+            agent = CoverLetterAgent(self.profile)
             self._runner = Runner(
                 agent=agent,
                 session_service=session_service,
@@ -140,22 +168,19 @@ class CoverLetterGenerator:
     async def _get_llm_response(self, prompt: str) -> str:
         """Get LLM response using ADK runner."""
         runner = await self._get_runner()
-        user_message = types.Content(role="user", parts=[types.Part(text=prompt)])
 
         try:
-            async for event in runner.run_async(
+            return await run_prompt(
+                runner,
+                prompt,
                 user_id="user_001",
                 session_id="cover_letter_session",
-                new_message=user_message,
-            ):
-                if event.is_final_response() and event.content and event.content.parts:
-                    return event.content.parts[0].text
+                call_site="cover_letter",
+            )
         except Exception as e:
             logger.error(f"Error getting LLM response: {e}")
             raise
 
-        return ""
-
     async def generate(
         self,
         job_description: str,
@@ -191,25 +216,31 @@ class CoverLetterGenerator:
         resume_info = self._extract_resume_info(resume_text)
         resume_skills = matcher.skills[:10]
 
-        # Create generation prompt
-        user_prompt = f"""{HARVARD_GUIDELINES_SYSTEM}
-
-Generate a professional cover letter following the guidelines above.
-
-JOB DETAILS:
-- Company: {company}
-- Position: {title}
-- Job Description: {job_description[:1500]}
-
-RESUME HIGHLIGHTS:
-{resume_text[:1000]}
-
-KEY SKILLS FROM RESUME:
-{', '.join(resume_skills)}
+        # Resume bullets most relevant to this job, best first, within a
+        # fixed budget
+        resume_highlights = await asyncio.to_thread(
+            select_excerpts,
+            resume_text,
+            job_description,
+            RESUME_EXCERPT_TOKENS,
+            by_score=True,
+        )
 
-Generate ONLY the 4 paragraphs (Opening, Mission Connection, Experience, Closing).
-Do NOT include date, address, salutation, or signature - just the body paragraphs.
-Keep total output to 400-500 words."""
+        # Create generation prompt. The guidelines are the agent's system
+        # instruction. The ranked highlights are already bounded, so when the
+        # prompt exceeds its budget the job description is trimmed first, and
+        # the highlights lose their weakest excerpts last.
+        user_prompt = (
+            PromptBuilder(
+                COVER_LETTER_PROMPT, get_prompt_budget(COVER_LETTER), COVER_LETTER
+            )
+            .add("resume_text", resume_highlights, priority=3, min_tokens=100)
+            .add("resume_skills", ", ".join(resume_skills), required=True)
+            .add("company", company, required=True)
+            .add("title", title, required=True)
+            .add("job_description", job_description, priority=2, min_tokens=200)
+            .build()
+        )
 
         # Generate with ADK
         generated_text = await self._get_llm_response(user_prompt)
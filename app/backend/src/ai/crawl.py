@@ -1,19 +1,24 @@
 import os
 import json
+import asyncio
 import logging
-from typing import List, Optional, Dict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from crawl4ai import (
-    AsyncWebCrawler,
     CrawlerRunConfig,
     LLMConfig,
-    BrowserConfig,
     CacheMode,
 )
-from crawl4ai.extraction_strategy import LLMExtractionStrategy
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 from functools import lru_cache
 
+from .browser_pool import get_browser_pool
+from .crawl_scheduler import get_crawl_scheduler
+from .extraction import AdaptiveLLMExtractionStrategy
+from .fake_llm import fake_base_url, use_fake_backend
+from .page_cache import get_page_cache
+from .site_adapters import claims_url, parse_with_adapters
+from .static_fetch import StaticPage, get_static_fetcher, static_fetch_enabled
 from .prompts import SCRAPER_LLM_INSTRUCTION_GENERIC, SCRAPER_LLM_INSTRUCTION_JOB
 
 load_dotenv(dotenv_path=".env")
@@ -21,25 +26,40 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _has_extraction_error(content: str) -> bool:
+    """Whether crawl4ai reported an LLM failure inside the extracted blocks."""
+    try:
+        blocks = json.loads(content)
+    except (TypeError, ValueError):
+        return True
+    if isinstance(blocks, dict):
+        blocks = [blocks]
+    return any(isinstance(b, dict) and b.get("error") for b in blocks or [])
+
+
 class InfoExtractor:
     def __init__(self, mode=None):
         api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
+        if not api_key and not use_fake_backend():
             raise ValueError("GOOGLE_API_KEY required")
 
-        self.browser_config = BrowserConfig(
-            browser_type="chromium",
-            headless=True,
-            viewport_width=1280,
-            viewport_height=720,
-        )
-
-        self.llm_config = LLMConfig(
-            provider="gemini/gemini-3-flash-preview", api_token=api_key
-        )
+        if use_fake_backend():
+            # OpenAI-compatible fake endpoint served by routes/fake_llm.py
+            self.llm_config = LLMConfig(
+                provider="openai/fake-gemini-3-flash-preview",
+                api_token="fake",
+                base_url=fake_base_url(),
+            )
+        else:
+            self.llm_config = LLMConfig(
+                provider="gemini/gemini-3-flash-preview", api_token=api_key
+            )
 
         self.extra_args = {"temperature": 0, "top_p": 0.9, "max_tokens": 2000}
 
+        # Cache namespace for extractions made with this instruction
+        self.mode = mode or "generic"
+
         if mode is None:
             _instruction = SCRAPER_LLM_INSTRUCTION_GENERIC
         elif mode == "job_desc":
@@ -48,11 +68,11 @@ class InfoExtractor:
         self.crawler_config = CrawlerRunConfig(
             cache_mode=CacheMode.DISABLED,
             word_count_threshold=1,
-            extraction_strategy=LLMExtractionStrategy(
+            # Chunk size is chosen per page from its length and the context window
+            extraction_strategy=AdaptiveLLMExtractionStrategy(
                 llm_config=self.llm_config,
                 instruction=_instruction,
                 extra_args=self.extra_args,
-                chunk_token_threshold=500,
             ),
             exclude_all_images=True,
             exclude_external_links=True,  # Faster parsing
@@ -64,8 +84,6 @@ class InfoExtractor:
             max_range=0.3,
         )
 
-        self.async_crawler = AsyncWebCrawler(config=self.browser_config)
-
     @staticmethod
     @lru_cache(maxsize=1000)
     def _is_valid_url(url: str) -> bool:
@@ -77,67 +95,232 @@ class InfoExtractor:
             return False
 
     async def scrape_many(self, urls: List[str]) -> List[Optional[Dict]]:
-        if not urls:
-            return []
+        results: List[Optional[str]] = [None] * len(urls)
+        async for index, content in self.stream_many(urls):
+            results[index] = content
+        return results
 
-        valid_urls = [url for url in urls if InfoExtractor._is_valid_url(url)]
+    async def stream_many(
+        self, urls: List[str]
+    ) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """
+        Extract `urls`, yielding each result as soon as it is ready.
 
-        async with self.async_crawler as crawler:
-            results = await crawler.arun_many(
-                urls=valid_urls, config=self.crawler_config
-            )
+        Cached pages come first, then crawled pages in completion order, so
+        one slow site does not hold back the others.
 
-            processed = []
-            for result in results:
-                if result and result.success and result.extracted_content:
-                    processed.append(result.extracted_content)
-                else:
-                    processed.append(None)
-
-            # Map back to original URL order
-            final_results = []
-            valid_idx = 0
-            for url in urls:
-                if url.startswith(("http://", "https://")):
-                    final_results.append(
-                        processed[valid_idx] if valid_idx < len(processed) else None
-                    )
-                    valid_idx += 1
-                else:
-                    final_results.append(None)
+        Yields:
+            (index into `urls`, extracted JSON or None) once per URL
+        """
+        positions: Dict[str, List[int]] = {}
+        for index, url in enumerate(urls):
+            if InfoExtractor._is_valid_url(url):
+                positions.setdefault(url, []).append(index)
+            else:
+                yield index, None
+        if not positions:
+            return
 
-            return final_results
+        # Fresh or revalidated cache entries skip the browser and the LLM
+        extracted = await get_page_cache().lookup_many(list(positions), self.mode)
+        if extracted:
+            logger.info(f"Page cache served {len(extracted)} of {len(positions)} links")
+        for url, content in extracted.items():
+            for index in positions[url]:
+                yield index, content
 
-    async def get_extracted_text(self, urls: List[str]) -> str:
-        results = await self.scrape_many(urls)
-        output = []
+        to_crawl = [url for url in positions if url not in extracted]
+        if not to_crawl:
+            return
+
+        async for url, content in self._crawl_stream(to_crawl):
+            for index in positions[url]:
+                yield index, content
+
+    async def _crawl_stream(
+        self, urls: List[str]
+    ) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """Crawl and extract `urls`, yielding (url, extracted JSON) as each finishes."""
+        done: asyncio.Queue = asyncio.Queue()
+        running = set()
+        page_cache = get_page_cache()
+
+        def spawn(url: str, work):
+            async def settle():
+                content = None
+                try:
+                    content = await work()
+                except Exception as e:
+                    logger.error(f"Crawl of {url} failed: {e}")
+                finally:
+                    done.put_nowait((url, content or None))
+
+            task = asyncio.create_task(settle())
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        async def finish(url, html, headers, content):
+            if content and not _has_extraction_error(content):
+                await asyncio.to_thread(
+                    page_cache.store, url, html, headers, self.mode, content
+                )
+            return content
+
+        async def extract_static(page: StaticPage):
+            # Known page structures are parsed directly, without the LLM
+            blocks = await asyncio.to_thread(
+                parse_with_adapters, page.url, page.html, self.mode
+            )
+            if blocks:
+                content = json.dumps(blocks, indent=4, ensure_ascii=False)
+                return await finish(page.url, page.html, page.headers, content)
+
+            # The extraction strategy reserves limiter capacity per chunk call
+            content = await self._extract_static(page)
+            return await finish(page.url, page.html, page.headers, content)
+
+        # Links that need the browser, fed to one scheduler stream as they are
+        # found so its per-host interleaving covers all of them
+        to_browse: asyncio.Queue = asyncio.Queue()
+        browsed: List[str] = []
+        browser_failed = False
 
-        for i, content in enumerate(results, 1):
-            if not content:
-                output.append(f"=== Source {i} ===\n[No content extracted]\n")
-                continue
+        async def browse_urls():
+            while True:
+                url = await to_browse.get()
+                if url is None:
+                    return
+                browsed.append(url)
+                yield url
 
+        async def browse_all():
+            nonlocal browser_failed
+            settled = set()
             try:
-                data = json.loads(content)
-                if not isinstance(data, list):
-                    data = [data] if isinstance(data, dict) else []
-
-                formatted = f"=== Source {i} ===\n"
-                for item in data:
-                    if isinstance(item, dict):
-                        tag = (
-                            item.get("tags", ["unknown"])[0]
-                            if item.get("tags")
-                            else "unknown"
+                # Warm pooled browsers; the extraction strategy reserves
+                # limiter capacity per chunk call
+                async for index, result in get_crawl_scheduler().stream(
+                    browse_urls(),
+                    lambda u: get_browser_pool().crawl(u, self.crawler_config),
+                ):
+                    url = browsed[index]
+                    settled.add(url)
+                    if result and result.success:
+                        spawn(
+                            url,
+                            lambda url=url, result=result: finish(
+                                url,
+                                result.html,
+                                result.response_headers,
+                                result.extracted_content,
+                            ),
                         )
-                        formatted += f"\n--- {tag.upper()} ---\n"
-                        for entry in item.get("content", []):
-                            if entry:
-                                formatted += f"- {entry}\n"
-                output.append(formatted)
+                    else:
+                        done.put_nowait((url, None))
+            except Exception as e:
+                browser_failed = True
+                logger.error(f"Browser crawl failed: {e}")
+                pending = [url for url in browsed if url not in settled]
+                while not to_browse.empty():
+                    pending.append(to_browse.get_nowait())
+                for url in pending:
+                    if url is not None:
+                        done.put_nowait((url, None))
+
+        def browse(url: str):
+            if browser_failed:
+                done.put_nowait((url, None))
+            else:
+                to_browse.put_nowait(url)
+
+        async def dispatch():
+            try:
+                await feed()
+            finally:
+                to_browse.put_nowait(None)
+
+        async def feed():
+            if not static_fetch_enabled():
+                for url in urls:
+                    browse(url)
+                return
 
+            # Server-rendered pages skip the browser; the rest escalate to it
+            served = 0
+            started = set()
+            # Pages with a site adapter are parsed from their markup as served
+            keep = {url for url in urls if claims_url(url, self.mode)}
+            try:
+                async for url, page in get_static_fetcher().stream_many(urls, keep):
+                    started.add(url)
+                    if page is not None:
+                        served += 1
+                        spawn(url, lambda page=page: extract_static(page))
+                    else:
+                        browse(url)
             except Exception as e:
-                logger.error(f"Error processing source {i}: {e}")
-                output.append(f"=== Source {i} ===\n[Error decoding JSON]\n")
+                logger.error(f"Static fetch failed, using the browser: {e}")
+                for url in urls:
+                    if url not in started:
+                        browse(url)
+            logger.info(
+                f"Static fetch served {served} of {len(urls)} links, "
+                f"{len(urls) - served} need the browser"
+            )
+
+        browser = asyncio.create_task(browse_all())
+        dispatcher = asyncio.create_task(dispatch())
+        try:
+            for _ in urls:
+                yield await done.get()
+        finally:
+            dispatcher.cancel()
+            browser.cancel()
+
+    async def _extract_static(self, page: StaticPage) -> Optional[str]:
+        """Run the LLM extraction on a statically fetched page's markdown."""
+        strategy = self.crawler_config.extraction_strategy
+        sections = self.crawler_config.chunking_strategy.chunk(page.markdown)
+        try:
+            blocks = await strategy.arun(page.url, sections)
+        except Exception as e:
+            logger.error(f"Extraction failed for {page.url}: {e}")
+            return None
+        # Same serialization crawl4ai applies to browser crawls
+        return json.dumps(blocks, indent=4, default=str, ensure_ascii=False)
 
-        return "\n".join(output)
+    @staticmethod
+    def format_source(i: int, content: Optional[str]) -> str:
+        """Readable text for the extraction of source number `i`."""
+        if not content:
+            return f"=== Source {i} ===\n[No content extracted]\n"
+
+        try:
+            data = json.loads(content)
+            if not isinstance(data, list):
+                data = [data] if isinstance(data, dict) else []
+
+            formatted = f"=== Source {i} ===\n"
+            for item in data:
+                if isinstance(item, dict):
+                    tag = (
+                        item.get("tags", ["unknown"])[0]
+                        if item.get("tags")
+                        else "unknown"
+                    )
+                    formatted += f"\n--- {tag.upper()} ---\n"
+                    for entry in item.get("content", []):
+                        if entry:
+                            formatted += f"- {entry}\n"
+            return formatted
+
+        except Exception as e:
+            logger.error(f"Error processing source {i}: {e}")
+            return f"=== Source {i} ===\n[Error decoding JSON]\n"
+
+    async def get_extracted_text(self, urls: List[str]) -> str:
+        results = await self.scrape_many(urls)
+        return "\n".join(
+            InfoExtractor.format_source(i, content)
+            for i, content in enumerate(results, 1)
+        )
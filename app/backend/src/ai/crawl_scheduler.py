@@ -0,0 +1,294 @@
+"""Process-wide crawl scheduler with per-host concurrency and politeness delays.
+
+URLs are queued per host and dispatched round-robin across hosts, so one
+domain with many links cannot starve the others while each host still gets
+at most its configured number of concurrent requests and a minimum gap
+between request starts. A global cap bounds total parallelism.
+
+Like the LLM limiter, crawls are scheduled from several event loops, so the
+shared counters are guarded by a threading lock and waiting is done with
+asyncio.sleep instead of loop-bound asyncio primitives.
+
+Environment:
+    CRAWL_MAX_CONCURRENCY: Requests in flight across all hosts (default 8)
+    CRAWL_HOST_CONCURRENCY: Requests in flight per host (default 2)
+    CRAWL_HOST_DELAY_SECONDS: Minimum gap between starts per host (default 0.5)
+    CRAWL_HOST_OVERRIDES: Per-domain policies as ``domain=concurrency/delay``,
+        comma-separated (e.g. ``github.com=4/0.2,linkedin.com=1/2``)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on a dispatcher sleep while slots are busy
+_SLOT_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """Concurrency and politeness settings for one host."""
+
+    concurrency: int = 2
+    delay_seconds: float = 0.5
+
+
+def host_key(url: str) -> str:
+    """Host a URL is scheduled under (lowercase, without ``www.``)."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def parse_overrides(value: str) -> Dict[str, HostPolicy]:
+    """Parse ``domain=concurrency/delay`` pairs, skipping malformed entries."""
+    overrides = {}
+    for item in value.split(","):
+        domain, _, spec = item.strip().partition("=")
+        if not domain or not spec:
+            continue
+        concurrency, _, delay = spec.partition("/")
+        try:
+            overrides[domain.lower()] = HostPolicy(
+                concurrency=max(1, int(concurrency)),
+                delay_seconds=max(0.0, float(delay or 0)),
+            )
+        except ValueError:
+            logger.warning(f"Ignoring malformed crawl host override: {item!r}")
+    return overrides
+
+
+class CrawlScheduler:
+    """
+    Fair, polite dispatcher for crawl requests.
+
+    Example:
+        >>> results = await get_crawl_scheduler().map(urls, fetch_one)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        default_policy: Optional[HostPolicy] = None,
+        overrides: Optional[Dict[str, HostPolicy]] = None,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.default_policy = default_policy or HostPolicy()
+        self.overrides = overrides or {}
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._host_in_flight: Counter = Counter()
+        self._next_start: Dict[str, float] = {}
+        self._stats = {
+            "dispatched": 0,
+            "failures": 0,
+            "host_waits": 0,
+            "global_waits": 0,
+        }
+
+    def policy_for(self, host: str) -> HostPolicy:
+        for domain, policy in self.overrides.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return policy
+        return self.default_policy
+
+    def _try_start(self, host: str) -> float:
+        """Take a slot for `host` and return 0, or return seconds worth waiting."""
+        policy = self.policy_for(host)
+        with self._lock:
+            if self._in_flight >= self.max_concurrency:
+                self._stats["global_waits"] += 1
+                return _SLOT_POLL_SECONDS
+            if self._host_in_flight[host] >= policy.concurrency:
+                self._stats["host_waits"] += 1
+                return _SLOT_POLL_SECONDS
+
+            now = time.monotonic()
+            wait = self._next_start.get(host, 0.0) - now
+            if wait > 0:
+                self._stats["host_waits"] += 1
+                return wait
+
+            self._in_flight += 1
+            self._host_in_flight[host] += 1
+            self._next_start[host] = now + policy.delay_seconds
+            self._stats["dispatched"] += 1
+            return 0.0
+
+    def _release(self, host: str):
+        with self._lock:
+            self._in_flight -= 1
+            self._host_in_flight[host] -= 1
+            if self._host_in_flight[host] <= 0:
+                del self._host_in_flight[host]
+
+    async def _run(self, host: str, url: str, fetch: Callable[[str], Awaitable[Any]]):
+        try:
+            return await fetch(url)
+        except Exception as e:
+            with self._lock:
+                self._stats["failures"] += 1
+            logger.error(f"Scheduled crawl of {url} failed: {e}")
+            return None
+        finally:
+            self._release(host)
+
+    async def stream(
+        self,
+        urls: Union[Iterable[str], AsyncIterable[str]],
+        fetch: Callable[[str], Awaitable[Any]],
+    ) -> AsyncIterator[Tuple[int, Optional[Any]]]:
+        """
+        Run `fetch(url)` for every URL under the host policies.
+
+        `urls` may be an async iterable, so URLs that only become known while
+        others are in flight share one dispatcher and its host interleaving.
+
+        Yields:
+            (position of the URL in `urls`, result) as each fetch completes;
+            the result is None where `fetch` raised
+        """
+        done: asyncio.Queue = asyncio.Queue()
+        running = set()
+        queues: "OrderedDict[str, deque]" = OrderedDict()
+        arrived = asyncio.Event()
+        fed = {"count": 0, "closed": False}
+
+        def enqueue(url: str):
+            queues.setdefault(host_key(url), deque()).append((fed["count"], url))
+            fed["count"] += 1
+            arrived.set()
+
+        async def feed():
+            try:
+                if hasattr(urls, "__aiter__"):
+                    async for url in urls:
+                        enqueue(url)
+                else:
+                    for url in urls:
+                        enqueue(url)
+            except Exception as e:
+                logger.error(f"Crawl URL source failed: {e}")
+            finally:
+                fed["closed"] = True
+                arrived.set()
+
+        async def run(host: str, index: int, url: str):
+            done.put_nowait((index, await self._run(host, url, fetch)))
+
+        def start(host: str, index: int, url: str):
+            task = asyncio.create_task(run(host, index, url))
+            # Keep a reference so the task is not garbage-collected mid-flight
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        async def dispatch():
+            while queues or not fed["closed"]:
+                arrived.clear()
+                soonest = None
+                # One start per host per pass interleaves hosts fairly
+                for host in list(queues):
+                    wait = self._try_start(host)
+                    if wait > 0:
+                        soonest = wait if soonest is None else min(soonest, wait)
+                        continue
+                    index, url = queues[host].popleft()
+                    if not queues[host]:
+                        del queues[host]
+                    start(host, index, url)
+                if not queues and fed["closed"]:
+                    break
+                if queues and soonest is None:
+                    continue
+                # Sleep until a slot may be free or more URLs arrive
+                try:
+                    await asyncio.wait_for(
+                        arrived.wait(),
+                        timeout=min(soonest, 1.0) if soonest is not None else None,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            if running:
+                await asyncio.gather(*list(running), return_exceptions=True)
+            done.put_nowait(None)
+
+        feeder = asyncio.create_task(feed())
+        dispatcher = asyncio.create_task(dispatch())
+        try:
+            while True:
+                item = await done.get()
+                if item is None:
+                    return
+                yield item
+        finally:
+            # A consumer that stops early also stops feeding and dispatching
+            feeder.cancel()
+            dispatcher.cancel()
+
+    async def map(
+        self, urls: List[str], fetch: Callable[[str], Awaitable[Any]]
+    ) -> List[Optional[Any]]:
+        """
+        Run `fetch(url)` for every URL under the host policies.
+
+        Returns:
+            One result per URL, in order (None where `fetch` raised)
+        """
+        results: List[Optional[Any]] = [None] * len(urls)
+        async for index, result in self.stream(urls, fetch):
+            results[index] = result
+        return results
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "in_flight": self._in_flight,
+                "hosts_in_flight": dict(self._host_in_flight),
+                "max_concurrency": self.max_concurrency,
+            }
+
+
+_crawl_scheduler: Optional[CrawlScheduler] = None
+_crawl_scheduler_lock = threading.Lock()
+
+
+def get_crawl_scheduler() -> CrawlScheduler:
+    """Get or create the process-wide crawl scheduler configured from the environment."""
+    global _crawl_scheduler
+
+    if _crawl_scheduler is None:
+        with _crawl_scheduler_lock:
+            if _crawl_scheduler is None:  # Double-check pattern
+                _crawl_scheduler = CrawlScheduler(
+                    max_concurrency=int(os.getenv("CRAWL_MAX_CONCURRENCY", "8")),
+                    default_policy=HostPolicy(
+                        concurrency=int(os.getenv("CRAWL_HOST_CONCURRENCY", "2")),
+                        delay_seconds=float(
+                            os.getenv("CRAWL_HOST_DELAY_SECONDS", "0.5")
+                        ),
+                    ),
+                    overrides=parse_overrides(os.getenv("CRAWL_HOST_OVERRIDES", "")),
+                )
+
+    return _crawl_scheduler
@@ -0,0 +1,212 @@
+"""LLM extraction for crawled pages with adaptive chunk sizes.
+
+crawl4ai splits a page into chunks of a fixed token size and sends each one
+with the full extraction instruction, so a long page at a small threshold
+becomes many calls that mostly repeat the same overhead. Here the chunk size
+is chosen per page: as few chunks as the model context window, the
+extraction prompt budget and the output cap allow, balanced in size,
+extracted in parallel under a cap, with duplicate content from overlapping
+chunks merged away. Every chunk call takes its own LLM limiter reservation
+and is recorded in the LLM telemetry as one `crawl_extraction` call.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from crawl4ai.extraction_strategy import LLMExtractionStrategy
+from crawl4ai.utils import sanitize_input_encode
+
+from .limiter import get_limiter
+from .profiles import CRAWL_EXTRACTION, get_context_window, get_prompt_budget
+from .telemetry import CallTimer, get_telemetry
+
+logger = logging.getLogger(__name__)
+
+# crawl4ai's block-extraction prompt around the page content
+EXTRACTION_PROMPT_OVERHEAD_TOKENS = 1200
+# Chunks never get smaller than this unless the page itself is smaller
+MIN_CHUNK_TOKENS = 500
+# Block extraction reproduces the chunk's content, so a chunk may be at most
+# this many times the output cap before the response gets cut off
+MAX_CHUNK_TO_OUTPUT_RATIO = 1.5
+
+
+def adaptive_chunk_tokens(
+    page_tokens: int,
+    context_window: int,
+    max_output_tokens: int,
+    budget_tokens: int,
+) -> int:
+    """
+    Chunk size that covers `page_tokens` in the fewest, evenly sized chunks.
+
+    Each chunk must fit the context window next to the instruction and the
+    reserved output, stay within the extraction prompt budget, and be small
+    enough for its extracted blocks to fit in `max_output_tokens`.
+    """
+    fits = context_window - EXTRACTION_PROMPT_OVERHEAD_TOKENS - max_output_tokens
+    limits = [budget_tokens, fits]
+    if max_output_tokens > 0:
+        limits.append(int(max_output_tokens * MAX_CHUNK_TO_OUTPUT_RATIO))
+    ceiling = max(MIN_CHUNK_TOKENS, min(limits))
+    if page_tokens <= ceiling:
+        return max(page_tokens, MIN_CHUNK_TOKENS)
+    chunks = math.ceil(page_tokens / ceiling)
+    return math.ceil(page_tokens / chunks)
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def merge_blocks(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Combine per-chunk blocks, dropping content already seen in earlier chunks.
+
+    Error blocks are kept as-is; blocks left empty are dropped and the rest
+    are renumbered in order.
+    """
+    seen = set()
+    merged = []
+    for block in blocks:
+        if not isinstance(block, dict):
+            continue
+        if block.get("error"):
+            merged.append(block)
+            continue
+
+        content = block.get("content")
+        items = content if isinstance(content, list) else [content]
+        unique = []
+        for item in items:
+            key = _normalize(str(item)) if item is not None else ""
+            if key and key not in seen:
+                seen.add(key)
+                unique.append(item)
+        if not unique:
+            continue
+        merged.append(
+            {**block, "content": unique if isinstance(content, list) else unique[0]}
+        )
+
+    for index, block in enumerate(merged):
+        block["index"] = index
+    return merged
+
+
+def max_parallel_chunks() -> int:
+    """Concurrent chunk calls per page (EXTRACTION_MAX_PARALLEL_CHUNKS, default 4)."""
+    return max(1, int(os.getenv("EXTRACTION_MAX_PARALLEL_CHUNKS", "4")))
+
+
+class AdaptiveLLMExtractionStrategy(LLMExtractionStrategy):
+    """
+    `LLMExtractionStrategy` that sizes chunks per page instead of using a fixed threshold.
+
+    Example:
+        >>> strategy = AdaptiveLLMExtractionStrategy(
+        ...     llm_config=llm_config, instruction=instruction, extra_args=args
+        ... )
+        >>> blocks = await strategy.arun(url, sections)
+    """
+
+    def _page_tokens(self, sections: List[str]) -> int:
+        # Same word-based estimate crawl4ai's chunk merging uses
+        return int(
+            sum(len(section.split()) for section in sections) * self.word_token_rate
+        )
+
+    def chunk_size_for(self, sections: List[str]) -> int:
+        model = self.llm_config.provider.split("/")[-1]
+        return adaptive_chunk_tokens(
+            self._page_tokens(sections),
+            get_context_window(model),
+            self.extra_args.get("max_tokens", 0),
+            get_prompt_budget(CRAWL_EXTRACTION),
+        )
+
+    def _claim_usage(self) -> Optional[Any]:
+        """
+        Token usage of the `aextract` call that just returned, if it reached the model.
+
+        `aextract` appends its usage and returns without awaiting again, so an
+        unclaimed last entry belongs to the call that just finished; a call
+        whose request failed appends nothing and finds it already claimed.
+        """
+        usage = self.usages[-1] if self.usages else None
+        if usage is None or getattr(usage, "_recorded", False):
+            return None
+        usage._recorded = True
+        return usage
+
+    async def arun(self, url: str, sections: List[str]) -> List[Dict[str, Any]]:
+        """Extract blocks from `sections` in adaptively sized, parallel chunks."""
+        chunk_tokens = self.chunk_size_for(sections)
+        chunks = self._merge(
+            sections, chunk_tokens, overlap=int(chunk_tokens * self.overlap_rate)
+        )
+        logger.info(
+            f"Extracting {url} in {len(chunks)} chunk(s) of ~{chunk_tokens} tokens"
+        )
+
+        semaphore = asyncio.Semaphore(max_parallel_chunks())
+        estimated_tokens = (
+            chunk_tokens
+            + EXTRACTION_PROMPT_OVERHEAD_TOKENS
+            + self.extra_args.get("max_tokens", 0)
+        )
+
+        async def extract(index: int, chunk: str):
+            async with semaphore:
+                timer = CallTimer(CRAWL_EXTRACTION)
+                try:
+                    # One reservation per model call, so parallel chunks count
+                    # against the in-flight cap and the request rate
+                    async with get_limiter().acquire(estimated_tokens=estimated_tokens):
+                        blocks = await self.aextract(
+                            url, index, sanitize_input_encode(chunk)
+                        )
+                        usage = self._claim_usage()
+                except Exception as e:
+                    get_telemetry().record(timer.finish(success=False, error=str(e)))
+                    raise
+
+            if usage is None:
+                # aextract reports a failed request as an error block
+                error = blocks[0].get("content") if blocks else "no response"
+                get_telemetry().record(timer.finish(success=False, error=str(error)))
+            else:
+                timer.add_usage(
+                    input_tokens=usage.prompt_tokens,
+                    output_tokens=usage.completion_tokens,
+                )
+                get_telemetry().record(timer.finish())
+            return blocks
+
+        results = await asyncio.gather(
+            *(extract(index, chunk) for index, chunk in enumerate(chunks)),
+            return_exceptions=True,
+        )
+
+        blocks: List[Dict[str, Any]] = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Chunk extraction failed for {url}: {result}")
+                blocks.append(
+                    {
+                        "index": 0,
+                        "error": True,
+                        "tags": ["error"],
+                        "content": str(result),
+                    }
+                )
+            else:
+                blocks.extend(result or [])
+        return merge_blocks(blocks)
+
+    def run(self, url: str, sections: List[str]) -> List[Dict[str, Any]]:
+        return asyncio.run(self.arun(url, sections))
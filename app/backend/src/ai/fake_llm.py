@@ -0,0 +1,346 @@
+"""Offline fake LLM backend for benchmarks and load tests.
+
+Set ``AUTORESUME_LLM_BACKEND=fake`` to route every ADK agent to `FakeLlm` and
+crawl4ai's LLM extraction to the OpenAI-compatible endpoint served by
+``routes/fake_llm.py``. Responses are deterministic and derived from the
+prompt (the resume is echoed back, skills are picked from the job
+description, and so on). Latency follows a simple model of time to first
+token plus output tokens divided by throughput; streamed requests receive
+the completion in partial chunks before the full response. Like the provider's implicit
+cache, a system instruction of at least ``IMPLICIT_CACHE_MIN_TOKENS`` that
+repeats within the cache TTL is reported as ``cached_content_token_count``
+and skips the simulated prefill time.
+
+Environment:
+    FAKE_LLM_TTFT_MS: Time to first token in milliseconds (default 300)
+    FAKE_LLM_TOKENS_PER_SEC: Output throughput (default 200)
+    FAKE_LLM_JITTER: Relative latency jitter, seeded by the prompt (default 0)
+    FAKE_LLM_PREFILL_TOKENS_PER_SEC: Input processing throughput for uncached
+        prompt tokens, 0 to disable (default 0)
+    FAKE_LLM_BASE_URL: Base URL of the fake chat-completions endpoint used by
+        crawl4ai (default http://localhost:8000/fake-llm/v1)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import AsyncGenerator
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from .utils import estimate_tokens
+
+FAKE_BACKEND = "fake"
+DEFAULT_FAKE_BASE_URL = "http://localhost:8000/fake-llm/v1"
+
+# Terms recognised as skills when faking keyword extraction
+_KNOWN_SKILLS = (
+    "Python",
+    "Java",
+    "JavaScript",
+    "TypeScript",
+    "Go",
+    "Rust",
+    "C++",
+    "SQL",
+    "React",
+    "Node.js",
+    "Django",
+    "FastAPI",
+    "Flask",
+    "AWS",
+    "GCP",
+    "Azure",
+    "Docker",
+    "Kubernetes",
+    "Terraform",
+    "PostgreSQL",
+    "MySQL",
+    "MongoDB",
+    "Redis",
+    "Kafka",
+    "Spark",
+    "Git",
+    "CI/CD",
+    "REST APIs",
+    "GraphQL",
+    "Linux",
+    "Machine Learning",
+    "PyTorch",
+    "TensorFlow",
+)
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the this "
+    "to we will with you your who what which".split()
+)
+
+_CODE_MARKERS = (
+    "### Current LaTeX Resume Code:",
+    "### Current LaTeX Resume:",
+    "### Current Section:",
+)
+
+
+def use_fake_backend() -> bool:
+    """Whether the offline fake backend is selected."""
+    return os.getenv("AUTORESUME_LLM_BACKEND", "gemini").lower() == FAKE_BACKEND
+
+
+def fake_base_url() -> str:
+    return os.getenv("FAKE_LLM_BASE_URL", DEFAULT_FAKE_BASE_URL)
+
+
+@dataclass
+class LatencyModel:
+    """Simulated latency: prefill and time to first token, then steady token throughput."""
+
+    ttft_ms: float = 300.0
+    tokens_per_second: float = 200.0
+    jitter: float = 0.0
+    prefill_tokens_per_second: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "LatencyModel":
+        return cls(
+            ttft_ms=float(os.getenv("FAKE_LLM_TTFT_MS", "300")),
+            tokens_per_second=float(os.getenv("FAKE_LLM_TOKENS_PER_SEC", "200")),
+            jitter=float(os.getenv("FAKE_LLM_JITTER", "0")),
+            prefill_tokens_per_second=float(
+                os.getenv("FAKE_LLM_PREFILL_TOKENS_PER_SEC", "0")
+            ),
+        )
+
+    def _factor(self, seed: str) -> float:
+        if not self.jitter:
+            return 1.0
+        # Seeded by the prompt so repeated runs see identical latencies
+        rng = random.Random(hashlib.sha256(seed.encode()).hexdigest())
+        return 1.0 + rng.uniform(-self.jitter, self.jitter)
+
+    def first_token_delay(self, seed: str = "") -> float:
+        return self.ttft_ms / 1000.0 * self._factor(seed)
+
+    def prefill_delay(self, uncached_tokens: int, seed: str = "") -> float:
+        if self.prefill_tokens_per_second <= 0:
+            return 0.0
+        return uncached_tokens / self.prefill_tokens_per_second * self._factor(seed)
+
+    def generation_delay(self, output_tokens: int, seed: str = "") -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return output_tokens / self.tokens_per_second * self._factor(seed)
+
+
+def _after(text: str, marker: str) -> str:
+    return text.split(marker, 1)[1].strip() if marker in text else ""
+
+
+def _fake_skills(prompt: str) -> str:
+    return ", ".join(_skills_in(_after(prompt, "JOB DESCRIPTION:") or prompt))
+
+
+def _fake_skills_batch(prompt: str) -> str:
+    jobs = re.split(
+        r"^\s*### JOB (\d+)\s*$", _after(prompt, "JOB DESCRIPTIONS:"), flags=re.M
+    )
+    # re.split yields [preamble, id, text, id, text, ...]
+    return json.dumps(
+        {job_id: _skills_in(text) for job_id, text in zip(jobs[1::2], jobs[2::2])}
+    )
+
+
+def _skills_in(description: str) -> list:
+    lowered = description.lower()
+    skills = [s for s in _KNOWN_SKILLS if s.lower() in lowered]
+    if len(skills) < 5:
+        words = re.findall(r"[A-Za-z][A-Za-z+#.]{2,}", description)
+        counts = Counter(w for w in words if w.lower() not in _STOPWORDS)
+        skills += [w for w, _ in counts.most_common(15) if w not in skills]
+    return skills[:20]
+
+
+def _fake_cover_letter(prompt: str) -> str:
+    company = re.search(r"- Company: (.+)", prompt)
+    position = re.search(r"- Position: (.+)", prompt)
+    company = company.group(1).strip() if company else "your company"
+    position = position.group(1).strip() if position else "the open role"
+    return "\n\n".join(
+        [
+            f"I am applying for the {position} position at {company}.",
+            f"The mission of {company} matches the work I want to do next.",
+            "In previous roles I shipped features used by thousands of people "
+            "and cut processing time by 30%.",
+            "Thank you for your consideration. I look forward to an interview.",
+        ]
+    )
+
+
+def _fake_crawl_blocks(prompt: str) -> str:
+    # crawl4ai wraps the page in <html> or, with an instruction, <url_content>
+    tag = "url_content" if "<url_content>" in prompt else "html"
+    html = _after(prompt, f"<{tag}>").split(f"</{tag}>", 1)[0]
+    text = re.sub(r"<[^>]+>", " ", html)
+    lines = [line.strip() for line in re.split(r"[\n.]", text) if line.strip()]
+    blocks = [{"index": 0, "tags": ["skills"], "content": lines[:10]}]
+    return f"<blocks>{json.dumps(blocks)}</blocks>"
+
+
+def fake_completion(prompt: str) -> str:
+    """Deterministic response derived from the prompt text."""
+    if "JSON object mapping each job number" in prompt:
+        return _fake_skills_batch(prompt)
+
+    if "comma-separated list of skills" in prompt:
+        return _fake_skills(prompt)
+
+    if "ORIGINAL RESUME:" in prompt:
+        original = _after(prompt, "ORIGINAL RESUME:")
+        match = re.search(r"```(?:latex)?\s*(.*?)```", original, re.DOTALL)
+        return match.group(1).strip() if match else original
+
+    for marker in _CODE_MARKERS:
+        if marker in prompt:
+            return _after(prompt, marker)
+
+    if "Generate ONLY the 4 paragraphs" in prompt:
+        return _fake_cover_letter(prompt)
+
+    if "<url>" in prompt and ("<html>" in prompt or "<url_content>" in prompt):
+        return _fake_crawl_blocks(prompt)
+
+    return "OK"
+
+
+def fake_usage(prompt: str, completion: str) -> dict:
+    """Token accounting for a fake call."""
+    return {
+        "prompt_tokens": estimate_tokens(prompt),
+        "completion_tokens": estimate_tokens(completion),
+    }
+
+
+# Characters per partial chunk of a streamed completion
+STREAM_CHUNK_CHARS = 256
+
+# Smallest prefix the provider's implicit cache applies to
+IMPLICIT_CACHE_MIN_TOKENS = 1024
+# Implicit cache entries expire after a few minutes without reuse
+IMPLICIT_CACHE_TTL_SECONDS = 300
+
+
+class _ProviderPrefixCache:
+    """Local stand-in for the provider's implicit prefix cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_used = {}
+
+    def cached_tokens(self, prefix: str) -> int:
+        """Tokens of `prefix` served from cache, marking it as used."""
+        tokens = estimate_tokens(prefix)
+        if tokens < IMPLICIT_CACHE_MIN_TOKENS:
+            return 0
+        key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_used.get(key)
+            self._last_used[key] = now
+        if last is not None and now - last <= IMPLICIT_CACHE_TTL_SECONDS:
+            return tokens
+        return 0
+
+
+_provider_prefix_cache = _ProviderPrefixCache()
+
+
+def _system_instruction(llm_request: LlmRequest) -> str:
+    instruction = llm_request.config.system_instruction if llm_request.config else None
+    if not instruction:
+        return ""
+    if isinstance(instruction, str):
+        return instruction
+    parts = getattr(instruction, "parts", None) or []
+    return "".join(getattr(part, "text", "") or "" for part in parts)
+
+
+class FakeLlm(BaseLlm):
+    """ADK model that answers locally with `fake_completion` and simulated latency."""
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"fake-.*"]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        prompt = ""
+        for content in reversed(llm_request.contents or []):
+            if content.role == "user" and content.parts:
+                prompt = "".join(part.text or "" for part in content.parts)
+                break
+
+        latency = LatencyModel.from_env()
+        completion = fake_completion(prompt)
+        usage = fake_usage(prompt, completion)
+
+        cached_tokens = 0
+        system = _system_instruction(llm_request)
+        if system:
+            usage["prompt_tokens"] += estimate_tokens(system)
+            cached_tokens = _provider_prefix_cache.cached_tokens(system)
+
+        await asyncio.sleep(
+            latency.prefill_delay(usage["prompt_tokens"] - cached_tokens, prompt)
+        )
+        await asyncio.sleep(latency.first_token_delay(prompt))
+
+        if stream:
+            # Emit partial chunks at the simulated throughput, then the full text
+            chunks = [
+                completion[start : start + STREAM_CHUNK_CHARS]
+                for start in range(0, len(completion), STREAM_CHUNK_CHARS)
+            ]
+            for chunk in chunks:
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+                await asyncio.sleep(
+                    latency.generation_delay(estimate_tokens(chunk), prompt)
+                )
+        else:
+            await asyncio.sleep(
+                latency.generation_delay(usage["completion_tokens"], prompt)
+            )
+
+        max_output_tokens = (
+            llm_request.config.max_output_tokens if llm_request.config else None
+        )
+        truncated = bool(max_output_tokens) and (
+            usage["completion_tokens"] > max_output_tokens
+        )
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=completion)]),
+            finish_reason=(
+                types.FinishReason.MAX_TOKENS if truncated else types.FinishReason.STOP
+            ),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=usage["prompt_tokens"],
+                candidates_token_count=usage["completion_tokens"],
+                cached_content_token_count=cached_tokens,
+                total_token_count=usage["prompt_tokens"] + usage["completion_tokens"],
+            ),
+            turn_complete=True,
+        )
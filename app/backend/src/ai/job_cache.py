@@ -0,0 +1,141 @@
+"""In-memory cache of job search results.
+
+Results are keyed by the normalized search parameters and hashes of the
+resume skills and text (jobs are ranked against the full resume), so
+repeating a search (or the same search with differently spelled title,
+location or site list) is served without scraping the job boards or
+cleaning descriptions again. Entries expire after a TTL and the
+least recently used entry is evicted when the cache is full. Only searches
+in which every site succeeded are cached, so a site that failed or timed out
+is retried on the next search.
+
+Environment:
+    JOB_SEARCH_CACHE_TTL_SECONDS: Age after which an entry is stale (default 900)
+    JOB_SEARCH_CACHE_MAX_ENTRIES: Entries kept before LRU eviction (default 64)
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .jobs import SearchParams, SearchResult
+
+
+def _normalize_text(value: str) -> str:
+    return re.sub(r"\s+", " ", (value or "").strip().lower())
+
+
+def skills_hash(skills: Iterable[str]) -> str:
+    """Order-insensitive hash of the resume skills."""
+    normalized = sorted({_normalize_text(skill) for skill in skills if skill})
+    return hashlib.sha256("\n".join(normalized).encode("utf-8")).hexdigest()
+
+
+def search_cache_key(
+    params: "SearchParams", skills: Iterable[str], resume_text: str = ""
+) -> str:
+    """Cache key for a search: normalized parameters plus skills and resume hashes."""
+    normalized = {
+        "job_title": _normalize_text(params.job_title),
+        "location": _normalize_text(params.location),
+        "sites": sorted({_normalize_text(site) for site in params.sites}),
+        "max_results": params.max_results,
+        "hours_old": params.hours_old,
+        "country": _normalize_text(params.country),
+        "skills": skills_hash(skills),
+        "resume": hashlib.sha256(resume_text.encode("utf-8")).hexdigest(),
+    }
+    return hashlib.sha256(
+        json.dumps(normalized, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+class JobSearchCache:
+    """
+    Thread-safe TTL + LRU cache of `SearchResult`s.
+
+    Example:
+        >>> cache = get_job_search_cache()
+        >>> key = search_cache_key(params, matcher.skills, matcher.text)
+        >>> result = cache.get(key) or cache.put(key, run_search())
+    """
+
+    def __init__(self, ttl_seconds: float = 900, max_entries: int = 64):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, SearchResult]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional["SearchResult"]:
+        """A copy of the cached result for `key`, or None if absent or stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        # Callers may annotate or reorder jobs; keep the cached copy intact
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: "SearchResult") -> "SearchResult":
+        """Cache `result` if every site succeeded; returns `result` unchanged."""
+        if not result.success or result.error:
+            return result
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return result
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_job_search_cache: Optional[JobSearchCache] = None
+_job_search_cache_lock = threading.Lock()
+
+
+def get_job_search_cache() -> JobSearchCache:
+    """Get or create the process-wide job search cache configured from the environment."""
+    global _job_search_cache
+
+    if _job_search_cache is None:
+        with _job_search_cache_lock:
+            if _job_search_cache is None:  # Double-check pattern
+                _job_search_cache = JobSearchCache(
+                    ttl_seconds=float(os.getenv("JOB_SEARCH_CACHE_TTL_SECONDS", "900")),
+                    max_entries=int(os.getenv("JOB_SEARCH_CACHE_MAX_ENTRIES", "64")),
+                )
+
+    return _job_search_cache
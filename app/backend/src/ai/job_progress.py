@@ -0,0 +1,52 @@
+"""Per-site job search results waiting to be streamed to the client.
+
+The job search task runs in the worker thread and publishes each site's
+results as soon as that site finishes; the SSE endpoint drains them on its
+next poll, so the first jobs reach the page without waiting for the slowest
+site. Events are kept per task id until drained or discarded.
+
+Example:
+    >>> get_job_progress().publish(task_id, site_result.dict())
+    >>> events = get_job_progress().drain(task_id)
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+
+class JobSearchProgress:
+    """Thread-safe queue of site results per job search task."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    def publish(self, task_id: str, event: Dict[str, Any]):
+        with self._lock:
+            self._events[task_id].append(event)
+
+    def drain(self, task_id: str) -> List[Dict[str, Any]]:
+        """Events published for `task_id` since the last drain, oldest first."""
+        with self._lock:
+            return self._events.pop(task_id, [])
+
+    def discard(self, task_id: str):
+        with self._lock:
+            self._events.pop(task_id, None)
+
+
+_job_progress: Optional[JobSearchProgress] = None
+_job_progress_lock = threading.Lock()
+
+
+def get_job_progress() -> JobSearchProgress:
+    """Get or create the process-wide job search progress store."""
+    global _job_progress
+
+    if _job_progress is None:
+        with _job_progress_lock:
+            if _job_progress is None:  # Double-check pattern
+                _job_progress = JobSearchProgress()
+
+    return _job_progress
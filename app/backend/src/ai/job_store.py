@@ -0,0 +1,228 @@
+"""Persistent store of job postings seen across searches.
+
+Every completed search upserts its postings, keyed by the board's job id
+(or the canonical job URL when a board gives none), so a posting returned by
+several searches is stored once with the time it was first and last seen.
+Searches are numbered, and each posting remembers the search that first
+found it, which makes "new since search N" a single indexed query instead
+of a comparison of full result sets.
+
+Environment:
+    JOB_STORE_PATH: SQLite database file (default assets/job_store/jobs.db)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    searched_at REAL NOT NULL,
+    params TEXT,
+    total_jobs INTEGER NOT NULL,
+    new_jobs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_key TEXT PRIMARY KEY,
+    site TEXT,
+    job_url TEXT,
+    title TEXT,
+    company TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    first_search_id INTEGER NOT NULL,
+    last_search_id INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_first_search ON jobs (first_search_id);
+"""
+
+
+def job_key(job: Dict[str, Any]) -> str:
+    """Identity of a posting: board job id, else canonical URL, else its headline."""
+    if job.get("id"):
+        return f"{job.get('site') or ''}:{job['id']}"
+    if job.get("job_url"):
+        return canonicalize_url(job["job_url"])
+    headline = "|".join(
+        str(job.get(field) or "").strip().lower()
+        for field in ("site", "title", "company", "location")
+    )
+    return hashlib.sha256(headline.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """
+    Thread-safe SQLite store of job postings.
+
+    Example:
+        >>> store = get_job_store()
+        >>> store.record_search(result.jobs, result.search_params)["new_jobs"]
+        >>> new_jobs = store.new_since(last_seen_search_id)["jobs"]
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def record_search(
+        self, jobs: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Upsert the postings of a completed search.
+
+        Returns:
+            Dict with the new search's id and how many postings it returned
+            and saw for the first time
+        """
+        now = time.time()
+        by_key = {job_key(job): job for job in jobs}
+        with self._lock, self._conn:
+            keys = list(by_key)
+            known = set()
+            # Stay under SQLite's bound-parameter limit on large result sets
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                known.update(
+                    row[0]
+                    for row in self._conn.execute(
+                        "SELECT job_key FROM jobs WHERE job_key IN "
+                        f"({','.join('?' * len(batch))})",
+                        batch,
+                    )
+                )
+            new_count = len(by_key) - len(known)
+
+            search_id = self._conn.execute(
+                "INSERT INTO searches (searched_at, params, total_jobs, new_jobs) "
+                "VALUES (?, ?, ?, ?)",
+                (now, json.dumps(params or {}), len(by_key), new_count),
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO jobs (job_key, site, job_url, title, company, "
+                "first_seen, last_seen, first_search_id, last_search_id, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_key) DO UPDATE SET "
+                "site = excluded.site, job_url = excluded.job_url, "
+                "title = excluded.title, company = excluded.company, "
+                "last_seen = excluded.last_seen, "
+                "last_search_id = excluded.last_search_id, data = excluded.data",
+                [
+                    (
+                        key,
+                        job.get("site"),
+                        job.get("job_url"),
+                        job.get("title"),
+                        job.get("company"),
+                        now,
+                        now,
+                        search_id,
+                        search_id,
+                        json.dumps(job, default=str),
+                    )
+                    for key, job in by_key.items()
+                ],
+            )
+
+        logger.info(f"Recorded search {search_id}: {len(by_key)} jobs, {new_count} new")
+        return {
+            "search_id": search_id,
+            "total_jobs": len(by_key),
+            "new_jobs": new_count,
+        }
+
+    def latest_search(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, searched_at, params, total_jobs, new_jobs "
+                "FROM searches ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "search_id": row[0],
+            "searched_at": row[1],
+            "search_params": json.loads(row[2] or "{}"),
+            "total_jobs": row[3],
+            "new_jobs": row[4],
+        }
+
+    def new_after_search(self, search_id: int) -> List[Dict[str, Any]]:
+        """Postings first seen after search `search_id`, with their keys and timestamps."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_key, data, first_seen, last_seen FROM jobs "
+                "WHERE first_search_id > ? ORDER BY first_search_id, rowid",
+                (search_id,),
+            ).fetchall()
+        return [
+            {
+                **json.loads(data),
+                "job_key": key,
+                "first_seen": first_seen,
+                "last_seen": last_seen,
+            }
+            for key, data, first_seen, last_seen in rows
+        ]
+
+    def new_since(self, since_search_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Postings that no search up to `since_search_id` had returned.
+
+        Args:
+            since_search_id: Last search the caller has seen; defaults to the
+                one before the latest search
+
+        Returns:
+            Dict with the latest search's summary and the new postings, or
+            with no search and no postings if nothing was searched yet
+        """
+        latest = self.latest_search()
+        if latest is None:
+            return {"search_id": None, "jobs": []}
+        if since_search_id is None:
+            since_search_id = latest["search_id"] - 1
+        return {**latest, "jobs": self.new_after_search(since_search_id)}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs")
+            self._conn.execute("DELETE FROM searches")
+
+
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Get or create the process-wide job store."""
+    global _job_store
+
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:  # Double-check pattern
+                _job_store = JobStore(
+                    Path(os.getenv("JOB_STORE_PATH", "assets/job_store/jobs.db"))
+                )
+
+    return _job_store
@@ -1,18 +1,38 @@
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Union, Any, Callable, Iterator
 from pathlib import Path
 from enum import Enum
 from datetime import date, datetime
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 from dataclasses import dataclass, field, asdict
 
+import numpy as np
 import pandas as pd
 import pypandoc
 import yake
 from jobspy import scrape_jobs
 
+from .job_cache import JobSearchCache, get_job_search_cache, search_cache_key
+from .ranking import BM25
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Weight of the extracted skills relative to the rest of the resume text
+SKILL_QUERY_WEIGHT = 3.0
+
+# Seconds one job site may take before its results are given up on
+DEFAULT_SITE_TIMEOUT_SECONDS = 60.0
+
+
+def site_timeout_seconds() -> float:
+    """Per-site scrape timeout (JOB_SITE_TIMEOUT_SECONDS, default 60)."""
+    return float(
+        os.getenv("JOB_SITE_TIMEOUT_SECONDS", str(DEFAULT_SITE_TIMEOUT_SECONDS))
+    )
+
 
 class JobSite(str, Enum):
     """Supported job sites."""
@@ -61,6 +81,9 @@ class SearchResult:
         search_params: Parameters used for search
         jobs: List of job postings
         error: Error message if search failed
+        site_status: Outcome per job site (success, total_jobs, error,
+            elapsed_seconds)
+        cached: Whether the result was served from the search cache
     """
 
     success: bool
@@ -69,6 +92,8 @@ class SearchResult:
     search_params: Dict[str, Any]
     jobs: List[Dict[str, Any]]
     error: Optional[str] = None
+    site_status: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    cached: bool = False
 
     def model_dump(self) -> Dict[str, Any]:
         """FastAPI v2 compatibility."""
@@ -79,6 +104,38 @@ class SearchResult:
         return asdict(self)
 
 
+@dataclass
+class SiteResult:
+    """
+    Jobs scraped from a single site.
+
+    Attributes:
+        site: Job site name
+        success: Whether the site returned results in time
+        jobs: Job postings from this site
+        error: Error message if the site failed or timed out
+        elapsed_seconds: Time until the site finished or was given up on
+    """
+
+    site: str
+    success: bool
+    jobs: List[Dict[str, Any]]
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    def status(self) -> Dict[str, Any]:
+        """Summary without the jobs themselves."""
+        return {
+            "success": self.success,
+            "total_jobs": len(self.jobs),
+            "error": self.error,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+        }
+
+    def dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
 class JobDescriptionCleaner:
     """Cleans job descriptions using keyword extraction to identify relevant content."""
 
@@ -395,6 +452,7 @@ class JobMatcher:
         resume_path: Union[str, Path],
         skill_extractor: Optional[SkillExtractor] = None,
         description_cleaner: Optional[JobDescriptionCleaner] = None,
+        search_cache: Optional[JobSearchCache] = None,
     ):
         """
         Initialize JobMatcher.
@@ -403,6 +461,7 @@ class JobMatcher:
             resume_path: Path to resume file (.tex, .pdf, .docx)
             skill_extractor: Custom skill extractor (optional)
             description_cleaner: Custom description cleaner (optional)
+            search_cache: Search result cache (defaults to the process-wide one)
 
         Raises:
             ResumeParseError: If resume cannot be parsed
@@ -412,6 +471,7 @@ class JobMatcher:
         self._extractor = skill_extractor or SkillExtractor()
         self._skills = self._extractor.extract(self._text)
         self._desc_cleaner = description_cleaner or JobDescriptionCleaner()
+        self._search_cache = search_cache or get_job_search_cache()
 
         logger.info(f"Initialized JobMatcher with {len(self._skills)} skills")
 
@@ -436,18 +496,18 @@ class JobMatcher:
             logger.error(f"Failed to parse resume: {e}")
             raise ResumeParseError(f"Failed to parse resume: {e}") from e
 
-    def _scrape_jobs(self, params: SearchParams) -> pd.DataFrame:
-        """Execute job scraping."""
+    def _scrape_site(self, site: str, params: SearchParams) -> pd.DataFrame:
+        """Execute job scraping on a single site."""
         search_term = f"{params.job_title}"
         skills_str = " ".join(self._skills[:5])
 
         logger.info(
-            f"Searching for: {search_term} with skills: {skills_str} "
+            f"Searching {site} for: {search_term} with skills: {skills_str} "
             f"in {params.location}"
         )
 
         kwargs = {
-            "site_name": params.sites,
+            "site_name": [site],
             "search_term": search_term,
             "google_search_term": f"{search_term} jobs {params.location} {skills_str}",
             "location": params.location,
@@ -460,6 +520,154 @@ class JobMatcher:
 
         return scrape_jobs(**kwargs)
 
+    def _to_records(self, jobs_df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Convert scraped jobs to JSON-serializable records with cleaned descriptions."""
+        jobs_list = []
+        for record in jobs_df.to_dict("records"):
+            cleaned_record = {}
+            for key, value in record.items():
+                if pd.isna(value):
+                    cleaned_record[key] = None
+                elif isinstance(value, (date, datetime)):
+                    cleaned_record[key] = value.isoformat()
+                else:
+                    cleaned_record[key] = value
+
+            # Clean job description if present
+            if cleaned_record.get("description"):
+                original_desc = cleaned_record["description"]
+                cleaned_record["description_full"] = original_desc
+                cleaned_record["description"] = self._desc_cleaner.clean(original_desc)
+                logger.debug(
+                    f"Cleaned description from {len(original_desc)} to {len(cleaned_record['description'])} chars"
+                )
+
+            jobs_list.append(cleaned_record)
+        return jobs_list
+
+    @staticmethod
+    def _job_document(job: Dict[str, Any]) -> str:
+        """Text a posting is ranked on; the title counts twice."""
+        skills = job.get("skills")
+        if isinstance(skills, (list, tuple)):
+            skills = " ".join(str(skill) for skill in skills)
+        return " ".join(
+            str(part)
+            for part in (
+                job.get("title"),
+                job.get("title"),
+                skills,
+                job.get("description_full") or job.get("description"),
+            )
+            if part
+        )
+
+    def rank(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sort jobs by BM25 relevance to the resume, best match first.
+
+        All postings are indexed at once and scored with one matrix-vector
+        product against the resume terms, with the extracted skills weighted
+        above the rest of the text.
+
+        Returns:
+            The jobs, each with `match_score` (0-100, relative to the best
+            match in `jobs`) and `matched_terms` (resume skills it mentions)
+        """
+        if not jobs:
+            return jobs
+
+        index = BM25([self._job_document(job) for job in jobs])
+        query = SKILL_QUERY_WEIGHT * index.query_vector(
+            " ".join(self._skills)
+        ) + index.query_vector(self._text)
+        scores = index.weights @ query
+        matches = index.phrase_matches(self._skills)
+
+        best = float(scores.max())
+        for row, job in enumerate(jobs):
+            job["match_score"] = (
+                int(round(100 * float(scores[row]) / best)) if best > 0 else 0
+            )
+            job["matched_terms"] = [
+                skill for skill, hit in zip(self._skills, matches[row]) if hit
+            ]
+
+        # Stable sort: equal scores keep the boards' order
+        order = np.argsort(-scores, kind="stable")
+        return [jobs[i] for i in order]
+
+    def _search_site(
+        self, site: str, params: SearchParams, started: float
+    ) -> SiteResult:
+        """Scrape one site, turning any failure into an unsuccessful SiteResult."""
+        try:
+            jobs_list = self._to_records(self._scrape_site(site, params))
+        except Exception as e:
+            logger.error(f"Job search on {site} failed: {e}", exc_info=True)
+            return SiteResult(
+                site=site,
+                success=False,
+                jobs=[],
+                error=str(e),
+                elapsed_seconds=time.monotonic() - started,
+            )
+        logger.info(f"Found {len(jobs_list)} jobs on {site}")
+        return SiteResult(
+            site=site,
+            success=True,
+            jobs=jobs_list,
+            elapsed_seconds=time.monotonic() - started,
+        )
+
+    def iter_sites(
+        self, params: SearchParams, timeout: Optional[float] = None
+    ) -> Iterator[SiteResult]:
+        """
+        Scrape every site in `params` concurrently.
+
+        Args:
+            params: Search parameters
+            timeout: Seconds each site may take (defaults to site_timeout_seconds())
+
+        Yields:
+            One SiteResult per site, in the order the sites finish; sites still
+            running at the timeout are yielded as failed
+        """
+        timeout = site_timeout_seconds() if timeout is None else timeout
+        sites = list(dict.fromkeys(params.sites))
+        if not sites:
+            return
+
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(
+            max_workers=len(sites), thread_name_prefix="job-site"
+        )
+        futures = {
+            executor.submit(self._search_site, site, params, started): site
+            for site in sites
+        }
+        pending = set(sites)
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                pending.discard(futures[future])
+                yield future.result()
+        except TimeoutError:
+            for site in sites:
+                if site in pending:
+                    logger.warning(f"Job search on {site} timed out after {timeout}s")
+                    yield SiteResult(
+                        site=site,
+                        success=False,
+                        jobs=[],
+                        error=f"Timed out after {timeout:g}s",
+                        elapsed_seconds=time.monotonic() - started,
+                    )
+        finally:
+            # Scrapes that timed out keep their thread until they return, but
+            # their results are dropped and nothing waits on them
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def search(
         self,
         location: str = "United States",
@@ -467,16 +675,28 @@ class JobMatcher:
         job_title: str = "software engineer",
         sites: Optional[List[str]] = None,
         hours_old: Optional[int] = None,
+        on_site_result: Optional[Callable[[SiteResult], None]] = None,
+        site_timeout: Optional[float] = None,
+        refresh: bool = False,
     ) -> SearchResult:
         """
         Search for jobs matching the resume.
 
+        Sites are scraped concurrently; a site that fails or times out is
+        reported in `site_status` without failing the others. Jobs are
+        returned best match first (see `rank`). A repeat of a recent search
+        with the same skills is served from the search cache.
+
         Args:
             location: Job location
             max_results: Maximum number of results
             job_title: Base job title to search for
             sites: List of job sites to search
             hours_old: Only jobs posted within this many hours
+            on_site_result: Called with each site's results as soon as it finishes
+            site_timeout: Seconds each site may take (defaults to
+                JOB_SITE_TIMEOUT_SECONDS)
+            refresh: Scrape again even if a cached result exists
 
         Returns:
             SearchResult compatible with FastAPI response models
@@ -489,38 +709,42 @@ class JobMatcher:
             hours_old=hours_old,
         )
 
-        try:
-            jobs_df = self._scrape_jobs(params)
+        # Cached jobs are already ranked against this resume's text
+        cache_key = search_cache_key(params, self._skills, self._text)
+        if not refresh:
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Serving {cached.total_jobs} jobs from the search cache")
+                cached.cached = True
+                return cached
 
-            # Convert to JSON-serializable format - handle date objects and clean descriptions
+        try:
             jobs_list = []
-            for record in jobs_df.to_dict("records"):
-                cleaned_record = {}
-                for key, value in record.items():
-                    if pd.isna(value):
-                        cleaned_record[key] = None
-                    elif isinstance(value, (date, datetime)):
-                        cleaned_record[key] = value.isoformat()
-                    else:
-                        cleaned_record[key] = value
-
-                # Clean job description if present
-                if cleaned_record.get("description"):
-                    original_desc = cleaned_record["description"]
-                    cleaned_record["description_full"] = original_desc
-                    cleaned_record["description"] = self._desc_cleaner.clean(
-                        original_desc
-                    )
-                    logger.debug(
-                        f"Cleaned description from {len(original_desc)} to {len(cleaned_record['description'])} chars"
-                    )
-
-                jobs_list.append(cleaned_record)
-
-            logger.info(f"Successfully found {len(jobs_list)} jobs")
+            site_status = {}
+            for site_result in self.iter_sites(params, site_timeout):
+                jobs_list.extend(site_result.jobs)
+                site_status[site_result.site] = site_result.status()
+                if on_site_result is not None:
+                    try:
+                        on_site_result(site_result)
+                    except Exception as e:
+                        logger.warning(f"Site result callback failed: {e}")
+
+            failed = {
+                site: status["error"]
+                for site, status in site_status.items()
+                if not status["success"]
+            }
+            success = len(failed) < len(site_status)
+            jobs_list = self.rank(jobs_list)
+            logger.info(
+                f"Successfully found {len(jobs_list)} jobs"
+                if success
+                else "Job search failed on every site"
+            )
 
-            return SearchResult(
-                success=True,
+            result = SearchResult(
+                success=success,
                 total_jobs=len(jobs_list),
                 skills_used=self._skills[:5],
                 search_params={
@@ -530,7 +754,14 @@ class JobMatcher:
                     "sites": params.sites,
                 },
                 jobs=jobs_list,
+                error=(
+                    "; ".join(f"{site}: {error}" for site, error in failed.items())
+                    if failed
+                    else None
+                ),
+                site_status=site_status,
             )
+            return self._search_cache.put(cache_key, result)
 
         except Exception as e:
             logger.error(f"Job search failed: {e}", exc_info=True)
@@ -0,0 +1,268 @@
+"""Process-wide rate limiter, retry policy and concurrency governor for Gemini calls.
+
+LLM calls are made from several event loops (the FastAPI loop and the loops
+created by synchronous taskiq tasks in worker threads), so all shared state is
+guarded by a threading lock and waiting is done with asyncio.sleep instead of
+loop-bound asyncio primitives.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes worth retrying (quota, overload and transient server errors)
+RETRYABLE_STATUS_CODES = frozenset([408, 429, 500, 502, 503, 504])
+# Status codes quoted in error messages of clients without a status attribute
+RETRYABLE_STATUS_PATTERN = re.compile(r"\b(?:429|503)\b")
+RETRYABLE_MARKERS = (
+    "RESOURCE_EXHAUSTED",
+    "UNAVAILABLE",
+    "DEADLINE_EXCEEDED",
+    "rate limit",
+    "quota",
+    "overloaded",
+)
+
+# Poll interval while waiting for a free in-flight slot
+_SLOT_POLL_SECONDS = 0.05
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate_per_minute`.
+
+    Reservations may overdraw the bucket; the caller then waits for the debt
+    to be repaid, which keeps waiters roughly first-come first-served.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` tokens and return how many seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate_per_second
+            )
+            self._last = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff settings."""
+
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an exception from the model client looks transient."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+
+    for attr in ("code", "status_code", "status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int) and value in RETRYABLE_STATUS_CODES:
+            return True
+
+    message = str(error)
+    if RETRYABLE_STATUS_PATTERN.search(message):
+        return True
+    lowered = message.lower()
+    return any(marker.lower() in lowered for marker in RETRYABLE_MARKERS)
+
+
+class LLMRateLimiter:
+    """
+    Governs model calls with request/token buckets, an in-flight cap and retries.
+
+    The call itself is any coroutine factory, so the limiter can be exercised
+    against a local fake model endpoint as well as the real Gemini API.
+
+    Example:
+        >>> limiter = get_limiter()
+        >>> text = await limiter.call(lambda: ask_model(prompt), estimated_tokens=800)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 30,
+        tokens_per_minute: float = 1_000_000,
+        max_in_flight: int = 4,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_in_flight = max_in_flight
+        self.retry_policy = retry_policy or RetryPolicy()
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {
+            "calls": 0,
+            "retries": 0,
+            "failures": 0,
+            "queued": 0,
+        }
+        self._queue_waits = deque(maxlen=500)
+
+    async def _take_slot(self):
+        while True:
+            with self._lock:
+                if self._in_flight < self.max_in_flight:
+                    self._in_flight += 1
+                    return
+            await asyncio.sleep(_SLOT_POLL_SECONDS)
+
+    def _release_slot(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int = 0, requests: int = 1):
+        """
+        Wait for rate budget and an in-flight slot, holding the slot while inside.
+
+        Args:
+            estimated_tokens: Expected input + output tokens for the call(s)
+            requests: Number of model requests the caller will make
+        """
+        start = time.monotonic()
+        with self._lock:
+            self._stats["queued"] += 1
+
+        try:
+            wait = max(
+                self.requests.reserve(requests),
+                self.tokens.reserve(estimated_tokens),
+            )
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self._take_slot()
+        finally:
+            with self._lock:
+                self._stats["queued"] -= 1
+
+        with self._lock:
+            self._queue_waits.append(time.monotonic() - start)
+
+        try:
+            yield
+        finally:
+            self._release_slot()
+
+    async def call(
+        self,
+        func: Callable[[], Awaitable[Any]],
+        estimated_tokens: int = 0,
+        call_site: str = "default",
+        on_retry: Optional[Callable[[BaseException], None]] = None,
+    ) -> Any:
+        """
+        Run `func()` under the limiter, retrying transient errors with backoff.
+
+        Args:
+            func: Zero-argument coroutine factory; called again on each retry
+            estimated_tokens: Expected tokens per attempt
+            call_site: Label used in log messages
+            on_retry: Called with the error before each retry
+        """
+        policy = self.retry_policy
+        attempt = 1
+        with self._lock:
+            self._stats["calls"] += 1
+
+        while True:
+            try:
+                async with self.acquire(estimated_tokens):
+                    return await func()
+            except Exception as e:
+                if attempt >= policy.max_attempts or not is_retryable(e):
+                    with self._lock:
+                        self._stats["failures"] += 1
+                    raise
+
+                delay = policy.delay(attempt)
+                with self._lock:
+                    self._stats["retries"] += 1
+                logger.warning(
+                    f"[{call_site}] Retryable LLM error (attempt {attempt}/"
+                    f"{policy.max_attempts}), retrying in {delay:.2f}s: {e}"
+                )
+                if on_retry is not None:
+                    on_retry(e)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of counters and queue-wait statistics (seconds)."""
+        with self._lock:
+            waits = sorted(self._queue_waits)
+            stats = dict(self._stats)
+            in_flight = self._in_flight
+
+        def percentile(p):
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 4)
+
+        return {
+            **stats,
+            "in_flight": in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_wait": {
+                "samples": len(waits),
+                "avg": round(sum(waits) / len(waits), 4) if waits else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(waits[-1], 4) if waits else 0.0,
+            },
+        }
+
+
+_limiter: Optional[LLMRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> LLMRateLimiter:
+    """Get or create the process-wide limiter configured from the environment."""
+    global _limiter
+
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:  # Double-check pattern
+                _limiter = LLMRateLimiter(
+                    requests_per_minute=float(os.getenv("GEMINI_RPM", "30")),
+                    tokens_per_minute=float(os.getenv("GEMINI_TPM", "1000000")),
+                    max_in_flight=int(os.getenv("GEMINI_MAX_IN_FLIGHT", "4")),
+                    retry_policy=RetryPolicy(
+                        max_attempts=int(os.getenv("GEMINI_MAX_ATTEMPTS", "5"))
+                    ),
+                )
+
+    return _limiter
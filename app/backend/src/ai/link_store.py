@@ -0,0 +1,168 @@
+"""Indexed store of links already applied to the resume.
+
+Links are keyed by their canonical URL, so spellings that differ only in
+scheme, ``www.``, trailing slashes, fragments or tracking parameters are
+recognized as the same link and not crawled again. Each entry records when
+the link was applied and the extracted text with its hash.
+
+Environment:
+    LINK_STORE_PATH: SQLite database file (default assets/link_store/links.db)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Plain-text list of applied links used before this store existed
+LEGACY_LINK_CACHE = Path("assets/link_cache.txt")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    canonical_url TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    crawled_at REAL NOT NULL,
+    content_sha256 TEXT,
+    extracted TEXT
+)
+"""
+
+
+@dataclass
+class StoredLink:
+    """One applied link."""
+
+    canonical_url: str
+    url: str
+    crawled_at: float
+    content_sha256: Optional[str]
+    extracted: Optional[str]
+
+
+class LinkStore:
+    """
+    Thread-safe SQLite store of applied links.
+
+    Example:
+        >>> store = get_link_store()
+        >>> links = store.new_links(["https://github.com/octocat/"])
+        >>> store.record({"https://github.com/octocat": extracted_text})
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+        self._import_legacy()
+
+    def _import_legacy(self):
+        """Carry links over from the old text file once, then remove it."""
+        if not LEGACY_LINK_CACHE.exists():
+            return
+        urls = [
+            line.strip()
+            for line in LEGACY_LINK_CACHE.read_text(encoding="utf-8").splitlines()
+        ]
+        self.record({url: None for url in urls if url})
+        LEGACY_LINK_CACHE.unlink()
+        logger.info(f"Imported {len(urls)} links from {LEGACY_LINK_CACHE}")
+
+    def get(self, url: str) -> Optional[StoredLink]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT canonical_url, url, crawled_at, content_sha256, extracted "
+                "FROM links WHERE canonical_url = ?",
+                (canonicalize_url(url),),
+            ).fetchone()
+        return StoredLink(*row) if row else None
+
+    def new_links(self, urls: Iterable[str]) -> List[str]:
+        """
+        Links in `urls` not applied yet, one spelling per canonical URL.
+
+        Returns:
+            The first spelling of each new canonical URL, in request order
+        """
+        by_canonical: Dict[str, str] = {}
+        for url in urls:
+            url = url.strip()
+            if url:
+                by_canonical.setdefault(canonicalize_url(url), url)
+        if not by_canonical:
+            return []
+
+        keys = list(by_canonical)
+        with self._lock:
+            known = {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT canonical_url FROM links WHERE canonical_url IN "
+                    f"({','.join('?' * len(keys))})",
+                    keys,
+                )
+            }
+        return [url for key, url in by_canonical.items() if key not in known]
+
+    def record(self, extracted: Dict[str, Optional[str]]):
+        """Mark links as applied, storing each link's extracted text if given."""
+        now = time.time()
+        rows = [
+            (
+                canonicalize_url(url),
+                url,
+                now,
+                hashlib.sha256(text.encode("utf-8")).hexdigest() if text else None,
+                text,
+            )
+            for url, text in extracted.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO links "
+                "(canonical_url, url, crawled_at, content_sha256, extracted) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(canonical_url) DO UPDATE SET "
+                "url = excluded.url, crawled_at = excluded.crawled_at, "
+                "content_sha256 = COALESCE(excluded.content_sha256, content_sha256), "
+                "extracted = COALESCE(excluded.extracted, extracted)",
+                rows,
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM links")
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+
+_link_store: Optional[LinkStore] = None
+_link_store_lock = threading.Lock()
+
+
+def get_link_store() -> LinkStore:
+    """Get or create the process-wide link store."""
+    global _link_store
+
+    if _link_store is None:
+        with _link_store_lock:
+            if _link_store is None:  # Double-check pattern
+                _link_store = LinkStore(
+                    Path(os.getenv("LINK_STORE_PATH", "assets/link_store/links.db"))
+                )
+
+    return _link_store
@@ -0,0 +1,189 @@
+"""Shared helper for sending a prompt through an ADK runner.
+
+Every model call in the backend goes through `run_prompt` so rate limiting,
+retries and telemetry are applied in one place.
+"""
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.planners.built_in_planner import BuiltInPlanner
+from google.adk.runners import Runner
+from google.genai import types
+
+from .fake_llm import FakeLlm, use_fake_backend
+from .limiter import get_limiter
+from .profiles import get_call_site_config
+from .prompt_cache import StaticInstruction
+from .telemetry import CallTimer, get_telemetry
+from .utils import estimate_tokens
+
+# Output budget assumed when reserving tokens for a call
+DEFAULT_OUTPUT_TOKENS = 2000
+
+# Responses are streamed so the first chunk gives the time to first token
+STREAMING_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+
+class TruncatedResponseError(RuntimeError):
+    """The model stopped at its output token cap, so the response is incomplete."""
+
+
+def get_model(name: str):
+    """Model for an agent: the Gemini model name, or `FakeLlm` when the fake backend is selected."""
+    if use_fake_backend():
+        return FakeLlm(model=f"fake-{name}")
+    return name
+
+
+def agent_options(call_site: str, profile: str = None, instruction: str = None) -> dict:
+    """
+    LlmAgent keyword arguments (model, planner, generation config) for a call site.
+
+    Args:
+        call_site: One of the call sites defined in ai.profiles
+        profile: Latency profile name; the configured default if omitted
+        instruction: Static instruction block sent as the system instruction,
+            forming a stable prefix for every request of the agent
+    """
+    config = get_call_site_config(call_site, profile)
+    options = {
+        "model": get_model(config.model),
+        "planner": BuiltInPlanner(
+            thinking_config=types.ThinkingConfig(thinking_budget=config.thinking_budget)
+        ),
+    }
+    if config.max_output_tokens:
+        options["generate_content_config"] = types.GenerateContentConfig(
+            max_output_tokens=config.max_output_tokens
+        )
+    if instruction:
+        options["instruction"] = StaticInstruction(instruction)
+    return options
+
+
+async def run_prompt(
+    runner: Runner,
+    prompt: str,
+    user_id: str,
+    session_id: str,
+    call_site: str = "default",
+    expected_output_tokens: int = DEFAULT_OUTPUT_TOKENS,
+) -> str:
+    """
+    Send `prompt` to the runner's agent and return the final response text.
+
+    Args:
+        runner: ADK runner for the agent
+        prompt: User message text
+        user_id: Session user id
+        session_id: Session id for the first attempt (must already exist in the
+            runner's session service); retries run in fresh sessions
+        call_site: Label for logs and metrics
+        expected_output_tokens: Output size reserved against the token budget
+
+    Returns:
+        Text of the final response, or an empty string if none was produced
+
+    Raises:
+        TruncatedResponseError: If the model hit `max_output_tokens`
+    """
+    user_message = types.Content(role="user", parts=[types.Part(text=prompt)])
+    timer = CallTimer(call_site)
+
+    instruction = getattr(runner.agent, "instruction", None)
+    instruction_tokens = (
+        estimate_tokens(instruction.text)
+        if isinstance(instruction, StaticInstruction)
+        else 0
+    )
+
+    attempts = 0
+
+    async def _call():
+        nonlocal attempts
+        attempts += 1
+        timer.new_attempt()
+        attempt_session_id = session_id
+        if attempts > 1:
+            # The failed attempt already appended the prompt to the caller's
+            # session; retrying there would send it twice
+            session = await runner.session_service.create_session(
+                app_name=runner.app_name, user_id=user_id
+            )
+            attempt_session_id = session.id
+        try:
+            return await _run(attempt_session_id)
+        finally:
+            if attempt_session_id != session_id:
+                await runner.session_service.delete_session(
+                    app_name=runner.app_name,
+                    user_id=user_id,
+                    session_id=attempt_session_id,
+                )
+
+    async def _run(attempt_session_id):
+        text = ""
+        truncated = False
+        usage_event = None
+        # Drain the whole stream; closing the generator early breaks ADK tracing
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=attempt_session_id,
+            new_message=user_message,
+            run_config=STREAMING_RUN_CONFIG,
+        ):
+            if event.partial:
+                timer.first_token()
+            elif event.usage_metadata is not None:
+                # Usage is cumulative over the stream; chunks would double count
+                usage_event = event
+            if event.is_final_response() and event.content and event.content.parts:
+                text = text or _response_text(event.content)
+            if types.FinishReason.MAX_TOKENS in (event.finish_reason, event.error_code):
+                truncated = True
+        if usage_event is not None:
+            _record_usage(timer, usage_event)
+        if truncated:
+            # Thinking tokens count towards the cap; partial LaTeX would not compile
+            raise TruncatedResponseError(
+                f"{call_site} response hit the output token limit"
+            )
+        return text
+
+    def _on_retry(error):
+        timer.retries += 1
+        timer.requests += 1
+
+    try:
+        response = await get_limiter().call(
+            _call,
+            estimated_tokens=estimate_tokens(prompt)
+            + instruction_tokens
+            + expected_output_tokens,
+            call_site=call_site,
+            on_retry=_on_retry,
+        )
+    except Exception as e:
+        get_telemetry().record(timer.finish(success=False, error=str(e)))
+        raise
+
+    get_telemetry().record(timer.finish())
+    return response
+
+
+def _response_text(content: types.Content) -> str:
+    """Answer text of a response, without any thought parts."""
+    return "".join(
+        part.text for part in content.parts if part.text and not part.thought
+    )
+
+
+def _record_usage(timer: CallTimer, event):
+    """Add token counts from an ADK event's usage metadata, if present."""
+    usage = getattr(event, "usage_metadata", None)
+    if usage is None:
+        return
+    timer.add_usage(
+        input_tokens=getattr(usage, "prompt_token_count", None),
+        output_tokens=getattr(usage, "candidates_token_count", None),
+        cached_tokens=getattr(usage, "cached_content_token_count", None) or 0,
+    )
@@ -1,81 +1,93 @@
 """Optimized LaTeX agent with performance improvements."""
 
 import os
+import re
 import asyncio
+import logging
 from functools import lru_cache
 
 from .prompts import *
 from .utils import read_file, write_file, compile_tex, clean_latex_block
+from .llm import agent_options, run_prompt
+from .profiles import LATEX_CODER, LATEX_SECTION, resolve_profile
+from .telemetry import get_telemetry
 
 from google.adk.agents import LlmAgent
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
-from google.genai import types
 
-from google.adk.planners.built_in_planner import BuiltInPlanner
+logger = logging.getLogger(__name__)
 
 APP_NAME = "latex_agent_app"
 USER_ID = "user_001"
 SESSION_ID = "session_001"
 
-# Global runner instance to avoid repeated setup
-_runner_instance = None
+# Global runner instances (one per latency profile) to avoid repeated setup
+_runner_instances = {}
 _runner_lock = asyncio.Lock()
 
+# Resumes longer than this are edited section by section
+SECTIONWISE_MIN_LINES = 150
+# Cap on concurrent per-section LLM requests
+SECTIONWISE_MAX_CONCURRENCY = 4
 
-class LatexCoderAgent(LlmAgent):
-    def __init__(self):
-        self._model_args = types.ThinkingConfig(
-            thinking_budget=-1
-        )  # Enable dynamic thinking.
+# Matches the start of a top-level section (\section{..} or \section*{..})
+SECTION_PATTERN = re.compile(r"^[ \t]*\\section\*?\{", re.MULTILINE)
+END_DOCUMENT = r"\end{document}"
+
+# Whole-document prompt used for each section prompt flavour when the caller
+# passes no prompt of its own
+WHOLE_DOCUMENT_PROMPTS = {
+    "generic": build_generic_prompt,
+    "edit": build_editing_prompt,
+    "job": build_job_optimize_prompt,
+}
 
-        self._planner = BuiltInPlanner(thinking_config=self._model_args)
 
+class LatexCoderAgent(LlmAgent):
+    def __init__(self, profile=None):
+        # Model, thinking budget and output cap come from the latency profile;
+        # the shared resume rules form the cacheable system instruction
         super().__init__(
             name="latex_coder_agent",
             description="Updates the LaTeX code for a resume with additional information",
-            model="gemini-3-flash-preview",
-            planner=self._planner,
+            **agent_options(LATEX_CODER, profile, instruction=LATEX_SYSTEM_INSTRUCTION),
         )
 
 
-async def get_runner():
-    """Get or create a singleton runner instance."""
-    global _runner_instance
+async def get_runner(profile=None):
+    """Get or create the singleton runner instance for a latency profile."""
+    profile = resolve_profile(profile)
 
-    if _runner_instance is None:
+    if profile not in _runner_instances:
         async with _runner_lock:
-            if _runner_instance is None:  # Double-check pattern
+            if profile not in _runner_instances:  # Double-check pattern
                 session_service = InMemorySessionService()
                 await session_service.create_session(
                     app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
                 )
-                coder_agent = LatexCoderAgent()
-                _runner_instance = Runner(
+                coder_agent = LatexCoderAgent(profile)
+                _runner_instances[profile] = Runner(
                     agent=coder_agent,
                     session_service=session_service,
                     app_name=APP_NAME,
                 )
 
-    return _runner_instance
+    return _runner_instances[profile]
 
 
-async def get_llm_response(prompt: str, runner: Runner) -> str:
+async def get_llm_response(
+    prompt: str, runner: Runner, session_id: str = SESSION_ID, call_site="latex_coder"
+) -> str:
     """Get LLM response with improved error handling."""
-    user_message = types.Content(role="user", parts=[types.Part(text=prompt)])
-
     try:
-        async for event in runner.run_async(
-            user_id=USER_ID, session_id=SESSION_ID, new_message=user_message
-        ):
-            if event.is_final_response() and event.content and event.content.parts:
-                return event.content.parts[0].text
+        return await run_prompt(
+            runner, prompt, USER_ID, session_id, call_site=call_site
+        )
     except Exception as e:
         print(f"Error getting LLM response: {e}")
         raise
 
-    return ""
-
 
 @lru_cache(maxsize=1)
 def validate_assets_directory():
@@ -84,24 +96,144 @@ def validate_assets_directory():
         raise FileNotFoundError("The 'assets' directory is missing.")
 
 
-async def append_and_compile(info, file_path, output_dir, prompt=None):
-    """Append new content to the LaTeX file and compile it. Handles status updates internally."""
+def split_sections(code: str):
+    """
+    Split LaTeX source into preamble, top-level sections and postamble.
+
+    Joining the three parts back together reproduces the input exactly.
+
+    Returns:
+        Tuple of (preamble, list of section sources, postamble)
+    """
+    end_pos = code.rfind(END_DOCUMENT)
+    if end_pos == -1:
+        end_pos = len(code)
+
+    body, postamble = code[:end_pos], code[end_pos:]
+    starts = [m.start() for m in SECTION_PATTERN.finditer(body)]
+    if not starts:
+        return body, [], postamble
+
+    bounds = starts + [len(body)]
+    sections = [body[bounds[i] : bounds[i + 1]] for i in range(len(starts))]
+    return body[: starts[0]], sections, postamble
+
+
+async def _edit_section(section, info, kind, runner, semaphore):
+    """
+    Rewrite a single section, keeping the original on failure.
+
+    Returns:
+        Tuple of (section source, whether the edit was applied)
+    """
+    async with semaphore:
+        session = None
+        try:
+            # Each section gets its own session so concurrent calls don't share history
+            session = await runner.session_service.create_session(
+                app_name=APP_NAME, user_id=USER_ID
+            )
+            prompt = build_section_prompt(info, section, kind=kind)
+            response = clean_latex_block(
+                await get_llm_response(
+                    prompt, runner, session_id=session.id, call_site=LATEX_SECTION
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Section edit failed, keeping original: {e}")
+            get_telemetry().record_fallback(LATEX_SECTION, f"error: {e}")
+            return section, False
+        finally:
+            if session is not None:
+                await runner.session_service.delete_session(
+                    app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+                )
+
+    if not SECTION_PATTERN.search(response):
+        logger.warning("Section edit returned no \\section, keeping original")
+        get_telemetry().record_fallback(LATEX_SECTION, "no section in response")
+        return section, False
+
+    # Keep the blank-line layout between sections stable
+    trailing = section[len(section.rstrip()) :]
+    return response.rstrip() + (trailing or "\n"), True
+
+
+async def edit_sections(
+    current_code, info, runner, kind="generic", max_concurrency=None
+):
+    """
+    Edit each top-level section with its own concurrent LLM request.
+
+    Results are merged back in document order, so the output only depends on
+    the per-section responses and not on which request finished first.
+    """
+    preamble, sections, postamble = split_sections(current_code)
+    if not sections:
+        return None
+
+    semaphore = asyncio.Semaphore(max_concurrency or SECTIONWISE_MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_edit_section(s, info, kind, runner, semaphore) for s in sections)
+    )
+    kept = sum(1 for _, applied in results if not applied)
+    if kept:
+        logger.warning(f"{kept} of {len(sections)} sections kept their original text")
+    return preamble + "".join(text for text, _ in results) + postamble
+
+
+async def append_and_compile(
+    info,
+    file_path,
+    output_dir,
+    prompt=None,
+    sectionwise=None,
+    kind="generic",
+    profile=None,
+):
+    """Append new content to the LaTeX file and compile it. Handles status updates internally.
+
+    Args:
+        info: Additional information, feedback or job description for the update
+        file_path: LaTeX file to update in place
+        output_dir: Directory for the compiled PDF
+        prompt: Prompt for the whole-document update (built from `info` and
+            `kind` if omitted)
+        sectionwise: Edit each section concurrently instead of the whole document
+            in one call. Defaults to on for resumes longer than
+            SECTIONWISE_MIN_LINES when no explicit prompt is given.
+        kind: Section prompt flavour ("generic", "edit", "job" or "combined")
+        profile: Latency profile name (see ai.profiles)
+    """
 
     # Start validation early (cached after first call)
     validate_assets_directory()
 
     # Concurrent file read and runner init
     current_code_task = asyncio.create_task(asyncio.to_thread(read_file, file_path))
-    runner_task = asyncio.create_task(get_runner())
+    runner_task = asyncio.create_task(get_runner(profile))
     current_code, runner = await asyncio.gather(current_code_task, runner_task)
 
-    # Prompt construction
-    if prompt is None:
-        prompt = build_generic_prompt(info, current_code)
+    # An explicit prompt carries instructions the section prompts don't know
+    # about, so it is only replaced by section-wise edits on request
+    if sectionwise is None:
+        sectionwise = prompt is None and len(current_code) > SECTIONWISE_MIN_LINES
+
+    cleaned_response = None
+    if sectionwise:
+        cleaned_response = await edit_sections(
+            "".join(current_code), info, runner, kind
+        )
+
+    if cleaned_response is None:
+        # Prompt construction
+        if prompt is None:
+            build_prompt = WHOLE_DOCUMENT_PROMPTS.get(kind, build_generic_prompt)
+            prompt = build_prompt(info, current_code)
 
-    # Get LLM response
-    llm_response = await get_llm_response(prompt, runner)
-    cleaned_response = clean_latex_block(llm_response)
+        # Get LLM response
+        llm_response = await get_llm_response(prompt, runner)
+        cleaned_response = clean_latex_block(llm_response)
 
     # Write and compile
     await asyncio.to_thread(write_file, file_path, cleaned_response)
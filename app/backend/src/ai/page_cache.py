@@ -0,0 +1,334 @@
+"""On-disk cache of crawled pages and their LLM extractions.
+
+Entries are keyed by the SHA-256 of the canonical URL and point at the
+fetched HTML, which is stored content-addressed by its own SHA-256.
+Extractions are stored per instruction mode and stay valid while the HTML
+is unchanged. Within the TTL an entry is served as-is. After the TTL it is
+revalidated with a conditional GET (If-None-Match / If-Modified-Since), and
+a 304 serves it again without opening a browser or calling the LLM.
+
+HTML a page no longer points at is deleted once no other entry shares it.
+Stores periodically prune entries not validated within the maximum age and
+the least recently validated ones beyond the entry cap, together with their
+HTML.
+
+Environment:
+    PAGE_CACHE_DIR: Cache directory (default assets/page_cache)
+    PAGE_CACHE_TTL_SECONDS: Age before revalidation (default 86400)
+    PAGE_CACHE_MAX_AGE_SECONDS: Age after which an entry is deleted (default 604800)
+    PAGE_CACHE_MAX_ENTRIES: Entries kept before the oldest are deleted (default 500)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from .urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+REVALIDATE_TIMEOUT_SECONDS = 5.0
+# Minimum time between prunes triggered by stores within the entry cap
+PRUNE_INTERVAL_SECONDS = 600
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedPage:
+    """Index entry for one canonical URL."""
+
+    url: str
+    canonical_url: str
+    fetched_at: float
+    validated_at: float
+    html_sha256: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Extracted JSON per instruction mode, valid for `html_sha256`
+    extracted: Dict[str, str] = field(default_factory=dict)
+
+
+class PageCache:
+    """
+    Thread-safe page cache under a local directory.
+
+    Example:
+        >>> cache = get_page_cache()
+        >>> hits = await cache.lookup_many(urls, mode="generic")
+        >>> cache.store(url, html, response_headers, "generic", extracted_json)
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        ttl_seconds: float = 86400,
+        max_age_seconds: float = 604800,
+        max_entries: int = 500,
+    ):
+        self.root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self._stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "stores": 0,
+            "pruned": 0,
+        }
+
+    def _entry_path(self, canonical_url: str) -> Path:
+        return self.root / "entries" / f"{_sha256(canonical_url)}.json"
+
+    def _html_path(self, html_sha256: str) -> Path:
+        return self.root / "html" / f"{html_sha256}.html"
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f"{path.suffix}.{threading.get_ident()}.tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Index entry for `url`, or None."""
+        path = self._entry_path(canonicalize_url(url))
+        try:
+            return CachedPage(**json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable page cache entry {path}: {e}")
+            return None
+
+    def get_html(self, page: CachedPage) -> Optional[str]:
+        try:
+            return self._html_path(page.html_sha256).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return time.time() - page.validated_at <= self.ttl_seconds
+
+    def _save(self, page: CachedPage):
+        with self._lock:
+            self._write_atomic(
+                self._entry_path(page.canonical_url), json.dumps(asdict(page))
+            )
+
+    def _read_entries(self) -> List[Tuple[float, Path, str]]:
+        """(validated_at, path, html_sha256) of every entry; caller holds the lock."""
+        entries = []
+        for path in (self.root / "entries").glob("*.json"):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                entries.append((data["validated_at"], path, data["html_sha256"]))
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.warning(f"Removing unreadable page cache entry {path}: {e}")
+                path.unlink(missing_ok=True)
+        return entries
+
+    def _delete_html_if_unused(self, html_sha256: str):
+        """Delete an HTML blob no entry points at; caller holds the lock."""
+        if all(sha != html_sha256 for _, _, sha in self._read_entries()):
+            self._html_path(html_sha256).unlink(missing_ok=True)
+
+    def prune(self) -> int:
+        """
+        Delete expired entries and the oldest beyond the cap, then orphaned HTML.
+
+        Returns:
+            Number of entries deleted
+        """
+        now = time.time()
+        with self._lock:
+            self._last_prune = now
+            entries = sorted(self._read_entries(), reverse=True)
+            kept = [
+                entry for entry in entries if now - entry[0] <= self.max_age_seconds
+            ][: self.max_entries]
+            kept_paths = {path for _, path, _ in kept}
+            removed = 0
+            for _, path, _ in entries:
+                if path not in kept_paths:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+
+            referenced = {sha for _, _, sha in kept}
+            for blob in (self.root / "html").glob("*.html"):
+                if blob.stem not in referenced:
+                    blob.unlink(missing_ok=True)
+            self._stats["pruned"] += removed
+
+        if removed:
+            logger.info(f"Pruned {removed} page cache entries")
+        return removed
+
+    def _needs_prune(self) -> bool:
+        if time.time() - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+            return True
+        entries_dir = self.root / "entries"
+        if not entries_dir.exists():
+            return False
+        return sum(1 for _ in os.scandir(entries_dir)) > self.max_entries
+
+    def clear(self):
+        """Delete every entry and HTML blob."""
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def store(
+        self,
+        url: str,
+        html: str,
+        headers: Optional[Dict[str, str]],
+        mode: str,
+        extracted: str,
+    ):
+        """Record a fresh crawl of `url` and its extraction for `mode`."""
+        canonical = canonicalize_url(url)
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        html_sha256 = _sha256(html or "")
+        now = time.time()
+
+        previous = self.get(url)
+        # Extractions for other modes remain valid if the content is unchanged
+        extracted_by_mode = (
+            dict(previous.extracted)
+            if previous and previous.html_sha256 == html_sha256
+            else {}
+        )
+        extracted_by_mode[mode] = extracted
+
+        page = CachedPage(
+            url=url,
+            canonical_url=canonical,
+            fetched_at=now,
+            validated_at=now,
+            html_sha256=html_sha256,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            extracted=extracted_by_mode,
+        )
+        # Blob and entry are written together so a prune never sees the blob
+        # without the entry pointing at it
+        with self._lock:
+            html_path = self._html_path(html_sha256)
+            if not html_path.exists():
+                self._write_atomic(html_path, html or "")
+            self._write_atomic(self._entry_path(canonical), json.dumps(asdict(page)))
+            if previous and previous.html_sha256 != html_sha256:
+                self._delete_html_if_unused(previous.html_sha256)
+            self._stats["stores"] += 1
+
+        if self._needs_prune():
+            self.prune()
+
+    async def _revalidate(self, client: httpx.AsyncClient, page: CachedPage) -> bool:
+        """Conditional GET; True if the server confirms the page is unchanged."""
+        headers = {}
+        if page.etag:
+            headers["If-None-Match"] = page.etag
+        if page.last_modified:
+            headers["If-Modified-Since"] = page.last_modified
+
+        try:
+            # Streamed so a changed page's body is never downloaded here
+            async with client.stream("GET", page.url, headers=headers) as response:
+                if response.status_code != 304:
+                    return False
+                page.etag = response.headers.get("etag", page.etag)
+                page.last_modified = response.headers.get(
+                    "last-modified", page.last_modified
+                )
+        except httpx.HTTPError as e:
+            logger.info(f"Revalidation of {page.url} failed: {e}")
+            return False
+
+        page.validated_at = time.time()
+        await asyncio.to_thread(self._save, page)
+        return True
+
+    async def lookup_many(self, urls: Iterable[str], mode: str) -> Dict[str, str]:
+        """
+        Cached extractions for `urls` under `mode`.
+
+        Returns:
+            Extracted JSON keyed by URL, for fresh or successfully revalidated
+            entries only; everything else must be crawled
+        """
+        urls = list(dict.fromkeys(urls))
+        pages = await asyncio.to_thread(lambda: {url: self.get(url) for url in urls})
+
+        hits: Dict[str, str] = {}
+        stale = []
+        for url, page in pages.items():
+            if page is None or mode not in page.extracted:
+                continue
+            if self.is_fresh(page):
+                hits[url] = page.extracted[mode]
+            elif page.etag or page.last_modified:
+                stale.append((url, page))
+
+        revalidated = 0
+        if stale:
+            async with httpx.AsyncClient(
+                follow_redirects=True, timeout=REVALIDATE_TIMEOUT_SECONDS
+            ) as client:
+                confirmed = await asyncio.gather(
+                    *(self._revalidate(client, page) for _, page in stale)
+                )
+            for (url, page), unchanged in zip(stale, confirmed):
+                if unchanged:
+                    hits[url] = page.extracted[mode]
+                    revalidated += 1
+
+        with self._lock:
+            self._stats["hits"] += len(hits) - revalidated
+            self._stats["revalidated"] += revalidated
+            self._stats["misses"] += len(urls) - len(hits)
+        return hits
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+_page_cache: Optional[PageCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Get or create the process-wide page cache configured from the environment."""
+    global _page_cache
+
+    if _page_cache is None:
+        with _page_cache_lock:
+            if _page_cache is None:  # Double-check pattern
+                _page_cache = PageCache(
+                    root=Path(os.getenv("PAGE_CACHE_DIR", "assets/page_cache")),
+                    ttl_seconds=float(os.getenv("PAGE_CACHE_TTL_SECONDS", "86400")),
+                    max_age_seconds=float(
+                        os.getenv("PAGE_CACHE_MAX_AGE_SECONDS", "604800")
+                    ),
+                    max_entries=int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "500")),
+                )
+
+    return _page_cache
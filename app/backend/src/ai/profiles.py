@@ -0,0 +1,118 @@
+"""Latency profiles: model, thinking budget and output cap per LLM call site.
+
+A profile trades latency for quality. `fast` uses a lite model without
+thinking everywhere, `quality` uses dynamic thinking everywhere (the original
+behaviour), and `balanced` keeps deep reasoning only where the output is a
+full document rewrite.
+
+Thinking tokens count towards `max_output_tokens`, so call sites that think
+get a fixed thinking budget and an output cap that leaves room for a whole
+document after it.
+
+The default profile comes from AUTORESUME_LATENCY_PROFILE and can be
+overridden per request.
+
+Prompt token budgets are per call site and independent of the profile; they
+keep inputs below the size where prefill starts to dominate latency.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LATEX_CODER = "latex_coder"
+COVER_LETTER = "cover_letter"
+SKILL_EXTRACTION = "ats_skill_extraction"
+KEYWORD_INJECTION = "ats_keyword_injection"
+LATEX_SECTION = "latex_section"
+CRAWL_EXTRACTION = "crawl_extraction"
+
+DEFAULT_PROFILE = "balanced"
+
+_FLASH = "gemini-3-flash-preview"
+_FLASH_LITE = "gemini-2.5-flash-lite"
+_DYNAMIC_THINKING = -1
+
+# Input context window per model, in tokens
+CONTEXT_WINDOWS: Dict[str, int] = {
+    _FLASH: 1_048_576,
+    _FLASH_LITE: 1_048_576,
+}
+DEFAULT_CONTEXT_WINDOW = 128_000
+
+
+@dataclass(frozen=True)
+class CallSiteConfig:
+    """Model settings for one call site."""
+
+    model: str
+    thinking_budget: int
+    max_output_tokens: Optional[int] = None
+
+
+PROFILES: Dict[str, Dict[str, CallSiteConfig]] = {
+    "fast": {
+        LATEX_CODER: CallSiteConfig(_FLASH_LITE, 0, 8192),
+        COVER_LETTER: CallSiteConfig(_FLASH_LITE, 0, 1024),
+        SKILL_EXTRACTION: CallSiteConfig(_FLASH_LITE, 0, 256),
+        KEYWORD_INJECTION: CallSiteConfig(_FLASH_LITE, 0, 8192),
+    },
+    "balanced": {
+        LATEX_CODER: CallSiteConfig(_FLASH, 4096, 16384),
+        COVER_LETTER: CallSiteConfig(_FLASH, 1024, 2048),
+        SKILL_EXTRACTION: CallSiteConfig(_FLASH_LITE, 0, 256),
+        KEYWORD_INJECTION: CallSiteConfig(_FLASH, 1024, 12288),
+    },
+    "quality": {
+        LATEX_CODER: CallSiteConfig(_FLASH, _DYNAMIC_THINKING),
+        COVER_LETTER: CallSiteConfig(_FLASH, _DYNAMIC_THINKING),
+        SKILL_EXTRACTION: CallSiteConfig(_FLASH, _DYNAMIC_THINKING),
+        KEYWORD_INJECTION: CallSiteConfig(_FLASH, _DYNAMIC_THINKING),
+    },
+}
+
+
+# Estimated prompt tokens per call site (user message only; the static
+# system instruction is not counted)
+PROMPT_BUDGETS: Dict[str, int] = {
+    LATEX_CODER: 16000,
+    LATEX_SECTION: 6000,
+    COVER_LETTER: 1200,
+    SKILL_EXTRACTION: 1200,
+    # Per page chunk; crawl4ai adds its own instruction around it
+    CRAWL_EXTRACTION: 6000,
+}
+DEFAULT_PROMPT_BUDGET = 8000
+
+
+def get_prompt_budget(call_site: str) -> int:
+    """Prompt token budget for `call_site`."""
+    return PROMPT_BUDGETS.get(call_site, DEFAULT_PROMPT_BUDGET)
+
+
+def get_context_window(model: str) -> int:
+    """Input context window of `model` in tokens."""
+    return CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+
+
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """Validated profile name, falling back to the configured default."""
+    default = os.getenv("AUTORESUME_LATENCY_PROFILE", DEFAULT_PROFILE)
+    if default not in PROFILES:
+        logger.warning(f"Unknown default latency profile '{default}', using balanced")
+        default = DEFAULT_PROFILE
+
+    if not profile:
+        return default
+    if profile not in PROFILES:
+        logger.warning(f"Unknown latency profile '{profile}', using '{default}'")
+        return default
+    return profile
+
+
+def get_call_site_config(call_site: str, profile: Optional[str] = None):
+    """Settings for `call_site` under the given (or default) profile."""
+    return PROFILES[resolve_profile(profile)][call_site]
@@ -0,0 +1,158 @@
+"""Token-budget-aware prompt assembly.
+
+A prompt is a template with named slots. Each slot gets a priority; when the
+filled template exceeds the call site's token budget, the lowest-priority
+slots are trimmed first (at line or word boundaries) and required slots are
+never touched. The final size is recorded in telemetry.
+
+Example:
+    >>> prompt = (
+    ...     PromptBuilder(template, budget_tokens=1200, call_site="cover_letter")
+    ...     .add("resume", resume_text, priority=1)
+    ...     .add("job_description", job_description, priority=2)
+    ...     .build()
+    ... )
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .telemetry import get_telemetry
+from .utils import CHARS_PER_TOKEN, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_MARKER = " [...]"
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to roughly `max_tokens`, preferring a line or word boundary."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    limit = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+    cut = text[:limit]
+    boundary = cut.rfind("\n")
+    if boundary < limit // 2:
+        boundary = cut.rfind(" ")
+    if boundary >= limit // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+@dataclass
+class PromptPart:
+    """One named slot of a prompt template."""
+
+    name: str
+    text: str
+    priority: int = 0
+    required: bool = False
+    min_tokens: int = 0
+
+
+@dataclass
+class PromptSize:
+    """Measured size of an assembled prompt."""
+
+    call_site: str
+    tokens: int
+    budget_tokens: int
+    trimmed: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def tokens_trimmed(self) -> int:
+        return sum(self.trimmed.values())
+
+    @property
+    def over_budget(self) -> bool:
+        return self.tokens > self.budget_tokens
+
+
+class PromptBuilder:
+    """Fills a `str.format` template within a token budget."""
+
+    def __init__(self, template: str, budget_tokens: int, call_site: str = "default"):
+        """
+        Args:
+            template: Prompt text with ``{name}`` slots (literal braces doubled)
+            budget_tokens: Maximum estimated tokens for the whole prompt
+            call_site: Label under which the prompt size is recorded
+        """
+        self.template = template
+        self.budget_tokens = budget_tokens
+        self.call_site = call_site
+        self.parts: List[PromptPart] = []
+        self.size: Optional[PromptSize] = None
+
+    def add(
+        self,
+        name: str,
+        text,
+        priority: int = 0,
+        required: bool = False,
+        min_tokens: int = 0,
+    ) -> "PromptBuilder":
+        """
+        Fill slot `name`.
+
+        Args:
+            name: Slot name in the template
+            text: Slot content; a list of lines is joined
+            priority: Higher priorities are trimmed last
+            required: Never trim this slot (e.g. the code being edited)
+            min_tokens: Trimming keeps at least this many tokens of the slot
+        """
+        if isinstance(text, (list, tuple)):
+            text = "".join(text)
+        self.parts.append(
+            PromptPart(
+                name=name,
+                text=str(text or ""),
+                priority=priority,
+                required=required,
+                min_tokens=min_tokens,
+            )
+        )
+        return self
+
+    def build(self) -> str:
+        """Assemble the prompt, trimming low-priority slots to fit the budget."""
+        values = {part.name: part.text for part in self.parts}
+        overhead = estimate_tokens(self.template.format(**dict.fromkeys(values, "")))
+        excess = overhead + sum(estimate_tokens(t) for t in values.values())
+        excess -= self.budget_tokens
+
+        trimmed = {}
+        # Stable sort: equal priorities are trimmed in the order they were added
+        for part in sorted(self.parts, key=lambda p: p.priority):
+            if excess <= 0:
+                break
+            if part.required:
+                continue
+            current = estimate_tokens(part.text)
+            keep = max(part.min_tokens, current - excess)
+            if keep >= current:
+                continue
+            values[part.name] = truncate_to_tokens(part.text, keep)
+            removed = current - estimate_tokens(values[part.name])
+            trimmed[part.name] = removed
+            excess -= removed
+
+        prompt = self.template.format(**values)
+        self.size = PromptSize(
+            call_site=self.call_site,
+            tokens=estimate_tokens(prompt),
+            budget_tokens=self.budget_tokens,
+            trimmed=trimmed,
+        )
+        if self.size.over_budget:
+            logger.warning(
+                f"[{self.call_site}] Prompt is {self.size.tokens} tokens, over its "
+                f"{self.budget_tokens} token budget after trimming"
+            )
+        get_telemetry().record_prompt(self.size)
+        return prompt
@@ -0,0 +1,29 @@
+"""Static system instructions for ADK agents.
+
+Static instruction blocks (resume rules, cover letter guidelines, keyword
+injection rules) are sent as the agent's system instruction so every request
+to a call site starts with the same bytes; the variable part of each prompt
+follows in the user message. Gemini caches repeated request prefixes only
+above a minimum size (about 1024 tokens), which these blocks do not reach,
+so whether anything was cached is taken solely from the provider's
+``cached_content_token_count``.
+"""
+
+from typing import Any
+
+
+class StaticInstruction:
+    """
+    Agent instruction provider returning a fixed text.
+
+    ADK substitutes ``{name}`` placeholders in plain string instructions with
+    session state, which would break LaTeX such as ``\\begin{document}``.
+    Instruction providers are used verbatim, and the text stays available to
+    `run_prompt` for token estimates.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __call__(self, context: Any) -> str:
+        return self.text
@@ -1,14 +1,50 @@
-"""Prompts for various tasks."""
+"""Prompts for various tasks.
 
+Rules shared by every resume-editing request live in
+`LATEX_SYSTEM_INSTRUCTION`, which is sent once as the LaTeX agent's system
+instruction so each request starts with the same prefix. The
+builders below only produce the task-specific part and the variable inputs,
+fitted to the call site's token budget by `PromptBuilder`: the resume code is
+never trimmed, supporting inputs are trimmed lowest priority first.
+"""
 
-def build_generic_prompt(info, curr_code):
-    """Prompt not tied to any particular link."""
+from .profiles import LATEX_CODER, LATEX_SECTION, get_prompt_budget
+from .prompt_builder import PromptBuilder
 
-    """Resume tips taken from: https://careerservices.fas.harvard.edu/resources/create-a-strong-resume/#tips"""
+# Resume tips taken from: https://careerservices.fas.harvard.edu/resources/create-a-strong-resume/#tips
+LATEX_SYSTEM_INSTRUCTION = """
+You are an AI assistant specialized in generating LaTeX resumes.
 
-    prompt = f"""
-    You are an AI assistant specialized in generating LaTeX resumes.
+Rules for every request:
+- Maintain the document structure and formatting consistency.
+- Avoid duplication; enrich or update existing entries if appropriate.
+- Exclude irrelevant, redundant, or informal content.
+- Do not write any false or non-valid or hypothetical content.
+- Ensure the output is valid, compilable LaTeX code.
+- Avoid premature pagebreaks and use a latex page efficiently and in a clean way.
+- Return only the LaTeX code — no explanations or extra text.
 
+Resume language should be:
+- Specific rather than general
+- Active rather than passive
+- Written to express not impress
+- Articulate rather than “flowery”
+- Fact-based (quantify and qualify)
+- Written for people who scan quickly
+
+Resume writing DOs:
+- Be consistent in format and content
+- Make it easy to read and follow, balancing white space
+- Use consistent spacing, underlining, italics, bold, and capitalization for emphasis
+- List headings (such as Experience) in order of importance
+- Within headings, list information in reverse chronological order (most recent first)
+- Avoid information gaps such as a missing summer
+"""
+
+
+def build_generic_prompt(info, curr_code):
+    """Prompt not tied to any particular link."""
+    template = """
     Task:
     Update the LaTeX resume provided below by incorporating relevant and valuable details from the additional information.
 
@@ -16,31 +52,9 @@ def build_generic_prompt(info, curr_code):
     - Extract important content such as work experience, education, skills, certifications, interests,
     awards, hobbies and projects.
     - Integrate new information into existing sections wherever applicable.
-    - Maintain the document structure and formatting consistency.
-    - Avoid duplication; enrich or update existing entries if appropriate.
-    - Exclude irrelevant, redundant, or informal content.
-    - Ensure the output is valid, standalone, and compilable LaTeX code.
-    - Avoid premature pagebreaks and use a latex page efficiently and in a clean way.
-    - Return only the updated LaTeX code — no explanations or extra text.
-    - Maintain the existing formatting and structure of the resume.
     - Add the new information in the relevant sections only.
     - If some information doesn't match any section, create a new section.
-
-    Resume language should be:
-    - Specific rather than general
-    - Active rather than passive
-    - Written to express not impress
-    - Articulate rather than “flowery”
-    - Fact-based (quantify and qualify)
-    - Written for people who scan quickly
-
-    Resume writing DOs:
-    - Be consistent in format and content
-    - Make it easy to read and follow, balancing white space
-    - Use consistent spacing, underlining, italics, bold, and capitalization for emphasis
-    - List headings (such as Experience) in order of importance
-    - Within headings, list information in reverse chronological order (most recent first)
-    - Avoid information gaps such as a missing summer
+    - Return the complete, standalone LaTeX document.
 
     ### Additional Information:
     {info}
@@ -48,41 +62,23 @@ def build_generic_prompt(info, curr_code):
     ### Current LaTeX Resume:
     {curr_code}
     """
-    return prompt
+    return (
+        PromptBuilder(template, get_prompt_budget(LATEX_CODER), LATEX_CODER)
+        .add("curr_code", curr_code, required=True)
+        .add("info", info, priority=1)
+        .build()
+    )
 
 
 def build_editing_prompt(info, curr_code):
     """Prompt for simple direct editing of the latex file."""
-    prompt = f"""
-    You are an AI assistant specialized in generating LaTeX resumes.
-
+    template = """
     Task:
     Make changes to the LaTeX resume provided below as per the feedback given below.
 
     Instructions:
-    - Maintain the document structure and formatting consistency.
-    - Avoid duplication; enrich or update existing entries if appropriate.
-    - Exclude irrelevant, redundant, or informal content.
-    - Ensure the output is valid, standalone, and compilable LaTeX code.
-    - Avoid premature pagebreaks and use a latex page efficiently and in a clean way.
-    - Return only the updated LaTeX code — no explanations or extra text.
-    - Maintain the existing formatting and structure of the resume.
-
-    Resume language should be:
-    - Specific rather than general
-    - Active rather than passive
-    - Written to express not impress
-    - Articulate rather than “flowery”
-    - Fact-based (quantify and qualify)
-    - Written for people who scan quickly
-
-    Resume writing DOs:
-    - Be consistent in format and content
-    - Make it easy to read and follow, balancing white space
-    - Use consistent spacing, underlining, italics, bold, and capitalization for emphasis
-    - List headings (such as Experience) in order of importance
-    - Within headings, list information in reverse chronological order (most recent first)
-    - Avoid information gaps such as a missing summer
+    - Change only what the feedback asks for.
+    - Return the complete, standalone LaTeX document.
 
 
     ### Additional Information:
@@ -92,16 +88,19 @@ def build_editing_prompt(info, curr_code):
     ### Current LaTeX Resume Code:
     {curr_code}
     """
-    return prompt
+    return (
+        PromptBuilder(template, get_prompt_budget(LATEX_CODER), LATEX_CODER)
+        .add("curr_code", curr_code, required=True)
+        .add("info", info, priority=1)
+        .build()
+    )
 
 
 def build_job_optimize_prompt(job_description, curr_code):
     """Tips taken from:
     https://www.careereducation.columbia.edu/resources/optimizing-your-resume-applicant-tracking-systems
     """
-    prompt = f"""
-    You are an AI assistant specialized in generating LaTeX resume code.
-
+    template = """
     Task:
     Make changes to the LaTeX resume provided below to optimize the given resume
     for the given job description. Optimize such that the resume passes the
@@ -110,13 +109,7 @@ def build_job_optimize_prompt(job_description, curr_code):
     Instructions:
     - You are optimizing the resume for the job applicant based on their existing experience 
         only given in the current resume.
-    - Maintain the document structure and formatting consistency.
-    - Avoid duplication; enrich or update existing entries if appropriate.
-    - Exclude irrelevant, redundant, or informal content.
-    - Do not write any false or non-valid or hypothetical content.
-    - Ensure the output is valid, standalone, and compilable LaTeX code.
-    - Avoid premature pagebreaks and use a latex page efficiently and in a clean way.
-    - Return only the updated LaTeX code — no explanations or extra text.
+    - Return the complete, standalone LaTeX document.
 
     Some tips:
     - Use common names for your section headers (Education, Work Experience, Leadership, Skills).
@@ -133,7 +126,111 @@ def build_job_optimize_prompt(job_description, curr_code):
     ### Current LaTeX Resume:
     {curr_code}
     """
-    return prompt
+    return (
+        PromptBuilder(template, get_prompt_budget(LATEX_CODER), LATEX_CODER)
+        .add("curr_code", curr_code, required=True)
+        .add("job_description", job_description, priority=1)
+        .build()
+    )
+
+
+def build_combined_prompt(info, feedback, job_description, curr_code):
+    """Single prompt covering new link information, user feedback and a target job."""
+    parts = []
+    steps = []
+    # (slot, text, priority): explicit feedback outranks the job description,
+    # which outranks scraped link information when the prompt is trimmed
+    slots = []
+    if info:
+        steps.append(
+            "Incorporate relevant and valuable details from the additional information "
+            "into existing sections, creating a new section only if nothing fits."
+        )
+        parts.append("### Additional Information:\n    {info}")
+        slots.append(("info", info, 1))
+    if feedback:
+        steps.append("Make the changes requested in the user feedback.")
+        parts.append("### User Feedback:\n    {feedback}")
+        slots.append(("feedback", feedback, 3))
+    if job_description:
+        steps.append(
+            "Optimize the result for the job description so it passes the Applicant "
+            "Tracking System, using only experience present in the resume."
+        )
+        parts.append("### Job Description:\n    {job_description}")
+        slots.append(("job_description", job_description, 2))
+
+    numbered_steps = "\n    ".join(f"{i}. {step}" for i, step in enumerate(steps, 1))
+    inputs = "\n\n    ".join(parts)
+
+    template = f"""
+    Task:
+    Update the LaTeX resume provided below in a single pass:
+    {numbered_steps}
+
+    Instructions:
+    - Use common names for section headers (Education, Work Experience, Skills).
+    - Return the complete, standalone LaTeX document.
+
+    {inputs}
+
+    ### Current LaTeX Resume:
+    {{curr_code}}
+    """
+    builder = PromptBuilder(template, get_prompt_budget(LATEX_CODER), LATEX_CODER)
+    builder.add("curr_code", curr_code, required=True)
+    for name, text, priority in slots:
+        builder.add(name, text, priority=priority)
+    return builder.build()
+
+
+SECTION_TASKS = {
+    "generic": (
+        "Update this section by incorporating relevant and valuable details from the "
+        "additional information. Ignore information that belongs to other sections."
+    ),
+    "edit": (
+        "Apply the feedback given below to this section. If the feedback does not "
+        "concern this section, return it unchanged."
+    ),
+    "job": (
+        "Optimize this section for the given job description so the resume passes the "
+        "Applicant Tracking System. Use only content already present in the section."
+    ),
+    "combined": (
+        "Apply every input given below that concerns this section: incorporate new "
+        "information, make the requested changes and optimize for the job description "
+        "if one is given. Return the section unchanged if nothing applies."
+    ),
+}
+
+
+def build_section_prompt(info, section_code, kind="generic"):
+    """Prompt for rewriting a single top-level section of a long resume."""
+    task = SECTION_TASKS.get(kind, SECTION_TASKS["generic"])
+    template = f"""
+    Task:
+    You are given ONE section of a larger LaTeX resume. {task}
+
+    Instructions:
+    - Return only this section, starting with its \\section command.
+    - Do not add a preamble, \\begin{{{{document}}}} or \\end{{{{document}}}}.
+    - Keep the section title, formatting and custom commands exactly as they are used.
+    - The additional information covers the whole resume; use only the parts that
+      belong in this section and leave the rest to the other sections.
+
+    ### Additional Information:
+    {{info}}
+
+    ### Current Section:
+    {{section_code}}
+    """
+    return (
+        PromptBuilder(template, get_prompt_budget(LATEX_SECTION), LATEX_SECTION)
+        .add("section_code", section_code, required=True)
+        .add("info", info, priority=1)
+        .build()
+    )
 
 
 SCRAPER_LLM_INSTRUCTION_GENERIC = """
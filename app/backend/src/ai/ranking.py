@@ -0,0 +1,190 @@
+"""Fast local lexical relevance scoring (BM25) with NumPy.
+
+Used to pick the resume excerpts most relevant to a job description, so
+prompts carry the parts that matter instead of whatever comes first, and to
+rank job postings against the resume.
+"""
+
+import re
+from typing import Dict, List
+
+import numpy as np
+
+from .utils import estimate_tokens
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+    a about above after again all also am an and any are as at be because been
+    before being below between both but by can could did do does doing down
+    during each etc few for from further had has have having he her here hers
+    him his how i if in into is it its just me more most my no nor not now of
+    off on once only or other our ours out over own per same she should so some
+    such than that the their them then there these they this those through to
+    too under until up us very via was we were what when where which while who
+    whom why will with would you your yours
+    """.split())
+
+# Line prefixes that start a new bullet in pandoc's plain-text output
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*•–]|\d+[.)])\s+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms without stopwords or single characters."""
+    return [
+        term
+        for term in TOKEN_PATTERN.findall(text.lower())
+        if len(term) > 1 and term not in STOPWORDS
+    ]
+
+
+class BM25:
+    """
+    Okapi BM25 over a fixed set of documents.
+
+    Term weights for every document are precomputed into a dense matrix, so
+    scoring a query is a single matrix-vector product.
+
+    Example:
+        >>> index = BM25(["Built REST APIs in Python", "Led a team of 5"])
+        >>> index.scores("python backend engineer")
+        array([0.98, 0.  ], dtype=float32)
+    """
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        self.vocabulary: Dict[str, int] = {}
+        tokenized = [tokenize(doc) for doc in documents]
+        # Column of every term occurrence, assigning new terms as they appear
+        cols = np.fromiter(
+            (
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+                for terms in tokenized
+                for term in terms
+            ),
+            dtype=np.intp,
+        )
+        rows = np.repeat(np.arange(len(tokenized)), [len(terms) for terms in tokenized])
+
+        n_terms = len(self.vocabulary)
+        counts = (
+            np.bincount(rows * n_terms + cols, minlength=len(documents) * n_terms)
+            .reshape(len(documents), n_terms)
+            .astype(np.float32)
+        )
+
+        n_docs = max(len(documents), 1)
+        doc_freq = (counts > 0).sum(axis=0)
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+        doc_len = counts.sum(axis=1, keepdims=True)
+        avg_len = float(doc_len.mean()) if len(documents) else 0.0
+        norm = k1 * (1 - b + b * doc_len / max(avg_len, 1e-9))
+        # Only occurring terms get a weight; the matrix is mostly zeros
+        row, col = np.nonzero(counts)
+        tf = counts[row, col]
+        self.weights = np.zeros_like(counts)
+        self.weights[row, col] = tf * (k1 + 1) / (tf + norm[row, 0]) * self.idf[col]
+        self.counts = counts
+
+    def query_vector(self, query: str) -> np.ndarray:
+        """Query term counts over the index vocabulary (unknown terms ignored)."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term in tokenize(query):
+            index = self.vocabulary.get(term)
+            if index is not None:
+                vector[index] += 1
+        return vector
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for `query`."""
+        if not self.vocabulary:
+            return np.zeros(self.weights.shape[0], dtype=np.float32)
+        return self.weights @ self.query_vector(query)
+
+    def phrase_matches(self, phrases: List[str]) -> np.ndarray:
+        """
+        Which phrases occur in which documents.
+
+        A phrase matches a document when every one of its terms occurs in it
+        (in any order), so "machine learning" matches "learning machine"
+        but not "machine shop".
+
+        Returns:
+            Boolean matrix of shape (documents, phrases)
+        """
+        incidence = np.zeros((len(phrases), len(self.vocabulary)), dtype=np.float32)
+        needed = np.zeros(len(phrases), dtype=np.float32)
+        for row, phrase in enumerate(phrases):
+            terms = set(tokenize(phrase))
+            # Terms outside the vocabulary count as needed but never found
+            needed[row] = len(terms) or np.inf
+            for term in terms:
+                index = self.vocabulary.get(term)
+                if index is not None:
+                    incidence[row, index] = 1
+        present = (self.counts > 0).astype(np.float32)
+        return present @ incidence.T >= needed
+
+
+def split_excerpts(text: str) -> List[str]:
+    """
+    Split plain-text resume output into bullets and short paragraphs.
+
+    A bullet's wrapped continuation lines stay with it; blank lines and new
+    bullet markers start a new excerpt.
+    """
+    excerpts = []
+    current: List[str] = []
+
+    def flush():
+        if current:
+            excerpts.append(" ".join(current))
+            current.clear()
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            flush()
+            continue
+        if BULLET_PATTERN.match(line):
+            flush()
+            stripped = BULLET_PATTERN.sub("", line).strip()
+        current.append(stripped)
+    flush()
+
+    return [excerpt for excerpt in excerpts if tokenize(excerpt)]
+
+
+def select_excerpts(
+    text: str, query: str, budget_tokens: int, by_score: bool = False
+) -> str:
+    """
+    Most relevant excerpts of `text` for `query` that fit in `budget_tokens`.
+
+    Excerpts sharing terms with the query are chosen greedily by BM25 score
+    and returned one per line, in their original order or, with `by_score`,
+    best first (so trimming the end of the text drops the weakest ones).
+    """
+    excerpts = split_excerpts(text)
+    if not excerpts:
+        return ""
+
+    scores = BM25(excerpts).scores(query)
+    # Stable sort: equal scores keep document order
+    order = [i for i in np.argsort(-scores, kind="stable") if scores[i] > 0]
+    if not order:
+        # Nothing overlaps the query; fall back to the start of the document
+        order = range(len(excerpts))
+
+    chosen = []
+    used = 0
+    for index in order:
+        cost = estimate_tokens(excerpts[index])
+        if used + cost > budget_tokens:
+            continue
+        chosen.append(index)
+        used += cost
+
+    if not by_score:
+        chosen.sort()
+    return "\n".join(f"- {excerpts[i]}" for i in chosen)
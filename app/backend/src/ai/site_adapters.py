@@ -0,0 +1,357 @@
+"""Deterministic extractors for well-known page structures.
+
+The links users paste most often are GitHub profiles and repositories, whose
+markup is stable enough to parse directly. An adapter turns such a page into
+the same tagged blocks the LLM extraction produces, so these links need
+neither a browser nor an LLM call. Adapters are looked up by URL pattern;
+a page an adapter cannot parse falls back to the generic LLM path.
+
+Example:
+    >>> blocks = parse_with_adapters("https://github.com/octocat", html)
+"""
+
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Longest README excerpt kept, in characters
+README_MAX_CHARS = 1500
+MAX_PINNED_REPOS = 6
+
+# schema.org Person properties that carry resume content
+RESUME_FIELDS = (
+    "jobTitle",
+    "worksFor",
+    "alumniOf",
+    "knowsAbout",
+    "award",
+    "hasCredential",
+    "description",
+)
+
+# First path segments on github.com that are not user or organization names
+GITHUB_RESERVED = (
+    "about|features|pricing|topics|trending|explore|marketplace|sponsors|orgs|"
+    "settings|login|join|search|collections|events|issues|pulls|notifications|"
+    "enterprise|team|customer-stories|security|site|apps|organizations"
+)
+
+
+def _text(node) -> str:
+    return re.sub(r"\s+", " ", node.get_text(" ", strip=True)).strip() if node else ""
+
+
+def _texts(nodes: Iterable) -> List[str]:
+    return [text for text in (_text(node) for node in nodes) if text]
+
+
+def make_blocks(sections: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+    """Tagged blocks in crawl4ai's extraction format, skipping empty sections."""
+    blocks = []
+    for tag, content in sections.items():
+        content = [item for item in dict.fromkeys(content) if item]
+        if content:
+            blocks.append({"index": len(blocks), "tags": [tag], "content": content})
+    return blocks
+
+
+class SiteAdapter:
+    """
+    Parses pages whose URL matches `pattern` into tagged blocks.
+
+    Subclasses set `name` and `pattern` and implement `parse`, returning None
+    when the page does not have the expected structure.
+    """
+
+    name = "adapter"
+    pattern: re.Pattern = re.compile(r"(?!)")
+    # Extraction modes the adapter's output is suitable for
+    modes = ("generic",)
+    # Whether a matching URL is known to have this structure (as opposed to
+    # adapters that only recognize pages by their content)
+    claims_url = True
+
+    def matches(self, url: str, mode: str = "generic") -> bool:
+        return mode in self.modes and bool(self.pattern.match(url))
+
+    def parse(self, url: str, html: str) -> Optional[List[Dict[str, Any]]]:
+        raise NotImplementedError
+
+
+class GitHubProfileAdapter(SiteAdapter):
+    """GitHub user profile: bio, details, pinned repositories and profile README."""
+
+    name = "github_profile"
+    pattern = re.compile(
+        rf"^https?://(?:www\.)?github\.com/(?!(?:{GITHUB_RESERVED})(?:[/?#]|$))"
+        r"[A-Za-z0-9-]+/?(?:[?#].*)?$",
+        re.IGNORECASE,
+    )
+
+    def parse(self, url: str, html: str) -> Optional[List[Dict[str, Any]]]:
+        soup = BeautifulSoup(html, "html.parser")
+        login = _text(soup.select_one(".p-nickname"))
+        if not login:
+            return None
+
+        name = _text(soup.select_one(".p-name"))
+        profile = [f"GitHub: {name} (@{login})" if name else f"GitHub: @{login}"]
+        profile += _texts(soup.select(".p-note, .user-profile-bio"))
+        for label, selector in (
+            ("Company", '[itemprop="worksFor"]'),
+            ("Location", '[itemprop="homeLocation"]'),
+        ):
+            value = _text(soup.select_one(selector))
+            if value:
+                profile.append(f"{label}: {value}")
+        for label, suffix in (
+            ("Followers", "followers"),
+            ("Repositories", "repositories"),
+        ):
+            count = _text(
+                soup.select_one(
+                    f'a[href$="?tab={suffix}"] .text-bold, '
+                    f'a[href$="?tab={suffix}"] .Counter'
+                )
+            )
+            if count:
+                profile.append(f"{label}: {count}")
+
+        projects = []
+        for item in soup.select(".pinned-item-list-item")[:MAX_PINNED_REPOS]:
+            repo = _text(item.select_one(".repo"))
+            if not repo:
+                continue
+            details = [repo]
+            description = _text(item.select_one(".pinned-item-desc"))
+            if description:
+                details.append(description)
+            language = _text(item.select_one('[itemprop="programmingLanguage"]'))
+            if language:
+                details.append(f"language: {language}")
+            stars = _text(item.select_one('a[href$="/stargazers"]'))
+            if stars:
+                details.append(f"stars: {stars}")
+            projects.append(" - ".join(details))
+
+        links = [urljoin(url, f"/{login}")]
+        links += [
+            a["href"]
+            for a in soup.select(
+                '[itemprop="url"] a[href], [itemprop="social"] a[href]'
+            )
+        ]
+
+        readme = soup.select_one("article.markdown-body")
+        return make_blocks(
+            {
+                "profile": profile,
+                "intellectual hobbies": projects,
+                "summary": [_text(readme)[:README_MAX_CHARS]] if readme else [],
+                "relevant links": links,
+            }
+        )
+
+
+class GitHubRepoAdapter(SiteAdapter):
+    """GitHub repository: description, topics, languages, stars and README."""
+
+    name = "github_repo"
+    pattern = re.compile(
+        rf"^https?://(?:www\.)?github\.com/(?!(?:{GITHUB_RESERVED})/)"
+        r"[A-Za-z0-9-]+/[A-Za-z0-9._-]+/?(?:[?#].*)?$",
+        re.IGNORECASE,
+    )
+
+    @staticmethod
+    def _languages(soup) -> List[str]:
+        heading = soup.find(
+            lambda tag: tag.name in ("h2", "h3") and _text(tag) == "Languages"
+        )
+        if not heading:
+            return []
+        languages = []
+        for item in heading.find_parent().select("li"):
+            parts = _texts(item.select("span"))
+            if parts:
+                languages.append(" ".join(parts))
+        return languages
+
+    def parse(self, url: str, html: str) -> Optional[List[Dict[str, Any]]]:
+        soup = BeautifulSoup(html, "html.parser")
+        repo = _text(soup.select_one('strong[itemprop="name"] a'))
+        owner = _text(soup.select_one('[rel="author"]'))
+        if not repo or not owner:
+            return None
+
+        about = _text(soup.select_one(".BorderGrid p.f4"))
+        if not about:
+            meta = soup.select_one('meta[property="og:description"]')
+            about = meta.get("content", "").strip() if meta else ""
+
+        project = [f"Repository {owner}/{repo}"]
+        if about:
+            project.append(about)
+        for label, selector in (
+            ("Stars", "#repo-stars-counter-star"),
+            ("Forks", "#repo-network-counter"),
+        ):
+            node = soup.select_one(selector)
+            count = (node.get("title") or _text(node)) if node else ""
+            if count:
+                project.append(f"{label}: {count}")
+
+        skills = _texts(soup.select("a.topic-tag")) + self._languages(soup)
+
+        readme = soup.select_one("article.markdown-body")
+        readme_text = []
+        if readme:
+            readme_text = _texts(readme.select("h1, h2, h3, p"))
+            excerpt, used = [], 0
+            for text in readme_text:
+                if used + len(text) > README_MAX_CHARS:
+                    break
+                excerpt.append(text)
+                used += len(text)
+            readme_text = excerpt
+
+        return make_blocks(
+            {
+                "achievements": project,
+                "skills": skills,
+                "intellectual hobbies": readme_text,
+                "relevant links": [url],
+            }
+        )
+
+
+class JsonLdPersonAdapter(SiteAdapter):
+    """Any page embedding schema.org Person data (portfolios, some public profiles)."""
+
+    name = "jsonld_person"
+    pattern = re.compile(r"^https?://", re.IGNORECASE)
+    claims_url = False
+
+    @staticmethod
+    def _objects(soup) -> Iterable[Dict[str, Any]]:
+        """Top-level JSON-LD objects; nested ones (e.g. an article's author) are skipped."""
+        for script in soup.select('script[type="application/ld+json"]'):
+            try:
+                data = json.loads(script.string or "")
+            except ValueError:
+                continue
+            for item in data if isinstance(data, list) else [data]:
+                if isinstance(item, dict):
+                    yield item
+                    yield from (
+                        g for g in item.get("@graph", []) if isinstance(g, dict)
+                    )
+
+    @staticmethod
+    def _names(value) -> List[str]:
+        values = value if isinstance(value, list) else [value]
+        names = []
+        for item in values:
+            if isinstance(item, dict):
+                item = item.get("name") or item.get("@id")
+            if isinstance(item, str) and item.strip():
+                names.append(item.strip())
+        return names
+
+    def parse(self, url: str, html: str) -> Optional[List[Dict[str, Any]]]:
+        soup = BeautifulSoup(html, "html.parser")
+        person = next(
+            (
+                item
+                for item in self._objects(soup)
+                if "Person" in self._names(item.get("@type"))
+            ),
+            None,
+        )
+        if not person or not self._names(person.get("name")):
+            return None
+        # A bare name (e.g. a blog's author) says too little to skip the LLM
+        if sum(1 for field in RESUME_FIELDS if person.get(field)) < 2:
+            return None
+
+        profile = self._names(person.get("name"))
+        profile += self._names(person.get("jobTitle"))
+        profile += self._names(person.get("description"))
+        address = person.get("address")
+        if isinstance(address, dict):
+            profile += self._names(address.get("addressLocality"))
+
+        return make_blocks(
+            {
+                "profile": profile,
+                "work experience": self._names(person.get("worksFor")),
+                "education": self._names(person.get("alumniOf")),
+                "skills": self._names(person.get("knowsAbout"))
+                + self._names(person.get("knowsLanguage")),
+                "achievements": self._names(person.get("award")),
+                "certifications": self._names(person.get("hasCredential")),
+                "relevant links": self._names(person.get("url"))
+                + self._names(person.get("sameAs")),
+            }
+        )
+
+
+_adapters: List[SiteAdapter] = [
+    GitHubProfileAdapter(),
+    GitHubRepoAdapter(),
+    JsonLdPersonAdapter(),
+]
+_adapter_lock = threading.Lock()
+_adapter_stats: Counter = Counter()
+
+
+def register_adapter(adapter: SiteAdapter, first: bool = True):
+    """Add an adapter; by default it takes precedence over the built-in ones."""
+    with _adapter_lock:
+        if first:
+            _adapters.insert(0, adapter)
+        else:
+            _adapters.append(adapter)
+
+
+def find_adapters(url: str, mode: str = "generic") -> List[SiteAdapter]:
+    """Adapters whose URL pattern matches, most specific first."""
+    with _adapter_lock:
+        return [adapter for adapter in _adapters if adapter.matches(url, mode)]
+
+
+def claims_url(url: str, mode: str = "generic") -> bool:
+    """Whether a site-specific adapter expects to parse `url`."""
+    return any(adapter.claims_url for adapter in find_adapters(url, mode))
+
+
+def parse_with_adapters(
+    url: str, html: str, mode: str = "generic"
+) -> Optional[List[Dict[str, Any]]]:
+    """Blocks from the first matching adapter that recognizes the page, or None."""
+    for adapter in find_adapters(url, mode):
+        try:
+            blocks = adapter.parse(url, html)
+        except Exception as e:
+            logger.warning(f"{adapter.name} adapter failed on {url}: {e}")
+            blocks = None
+        if blocks:
+            with _adapter_lock:
+                _adapter_stats[adapter.name] += 1
+            logger.info(f"Parsed {url} with the {adapter.name} adapter")
+            return blocks
+    return None
+
+
+def adapter_stats() -> Dict[str, int]:
+    """Pages parsed per adapter in this process."""
+    with _adapter_lock:
+        return dict(_adapter_stats)
@@ -0,0 +1,197 @@
+"""Plain HTTP fetch fast path for pages that do not need a browser.
+
+Personal sites, docs and most blogs are server-rendered, so a single async
+GET plus HTML-to-markdown conversion yields the same text the browser would,
+in a fraction of the time. Pages that look script-rendered, blocked or empty
+are reported as escalations and crawled with the browser instead.
+
+Environment:
+    STATIC_FETCH_ENABLED: Set to 0 to always use the browser (default 1)
+"""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from bs4 import BeautifulSoup
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+from .crawl_scheduler import get_crawl_scheduler
+
+logger = logging.getLogger(__name__)
+
+FETCH_TIMEOUT_SECONDS = 8.0
+# Pages with less visible text than this are assumed to render client-side
+MIN_STATIC_WORDS = 80
+# Below this share of visible text per byte of HTML, script-heavy pages escalate
+MIN_TEXT_RATIO = 0.02
+MIN_SCRIPTS_FOR_RATIO_CHECK = 5
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Sites that only serve useful content to a real browser session
+BROWSER_ONLY_DOMAINS = frozenset(["linkedin.com", "x.com", "twitter.com"])
+
+# Empty app shells used by client-side frameworks
+APP_SHELL_PATTERN = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt)["\'][^>]*>\s*</div>', re.IGNORECASE
+)
+NOSCRIPT_JS_PATTERN = re.compile(r"enable javascript|requires javascript", re.I)
+
+# Elements that never carry resume-relevant text
+STRIP_TAGS = ("script", "style", "noscript", "svg", "iframe", "nav", "footer", "form")
+
+
+@dataclass
+class StaticPage:
+    """A page fetched without a browser, converted to markdown."""
+
+    url: str
+    html: str
+    markdown: str
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def _is_browser_only(url: str) -> bool:
+    host = (urlsplit(url).hostname or "").lower()
+    return any(host == d or host.endswith(f".{d}") for d in BROWSER_ONLY_DOMAINS)
+
+
+def escalation_reason(html: str, text: str) -> Optional[str]:
+    """Why a fetched page needs the browser, or None if the static HTML suffices."""
+    words = len(text.split())
+    if APP_SHELL_PATTERN.search(html) and words < MIN_STATIC_WORDS * 3:
+        return "app_shell"
+    if words < MIN_STATIC_WORDS:
+        return "too_little_text"
+
+    lowered = html.lower()
+    if lowered.count("<script") >= MIN_SCRIPTS_FOR_RATIO_CHECK:
+        if len(text) / max(len(html), 1) < MIN_TEXT_RATIO:
+            return "script_heavy"
+    if NOSCRIPT_JS_PATTERN.search(text):
+        return "requires_javascript"
+    return None
+
+
+def html_to_markdown(html: str, base_url: str = "") -> str:
+    """Markdown for the readable part of `html`, as crawl4ai would produce it."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(STRIP_TAGS):
+        tag.decompose()
+    result = DefaultMarkdownGenerator().generate_markdown(
+        str(soup), base_url=base_url, citations=False
+    )
+    return result.raw_markdown
+
+
+class StaticFetcher:
+    """Fetches pages over plain HTTP and decides when to escalate to the browser."""
+
+    def __init__(self, timeout: float = FETCH_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._served = 0
+        self._escalations: Counter = Counter()
+
+    def _escalate(self, url: str, reason: str) -> None:
+        logger.info(f"Escalating {url} to the browser ({reason})")
+        with self._lock:
+            self._escalations[reason] += 1
+
+    async def fetch(
+        self, client: httpx.AsyncClient, url: str, keep: bool = False
+    ) -> Optional[StaticPage]:
+        """
+        Fetch one page; None means the browser should crawl it.
+
+        With `keep`, a successfully fetched HTML page is returned even if it
+        looks script-rendered (for pages parsed from their markup).
+        """
+        if _is_browser_only(url) and not keep:
+            self._escalate(url, "browser_only_domain")
+            return None
+
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError as e:
+            self._escalate(url, f"fetch_error:{type(e).__name__}")
+            return None
+
+        if response.status_code != 200:
+            self._escalate(url, f"status_{response.status_code}")
+            return None
+        if "html" not in response.headers.get("content-type", "html"):
+            self._escalate(url, "not_html")
+            return None
+
+        html = response.text
+        # Parsing and markdown conversion are CPU-bound
+        markdown = await asyncio.to_thread(html_to_markdown, html, str(response.url))
+        reason = escalation_reason(html, markdown)
+        if reason and not keep:
+            self._escalate(url, reason)
+            return None
+
+        with self._lock:
+            self._served += 1
+        return StaticPage(
+            url=url,
+            html=html,
+            markdown=markdown,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+        )
+
+    async def stream_many(
+        self, urls: List[str], keep: Optional[Set[str]] = None
+    ) -> AsyncIterator[Tuple[str, Optional[StaticPage]]]:
+        """
+        Yield (url, page or None if it needs the browser) as each fetch completes.
+
+        URLs in `keep` are never escalated for looking script-rendered.
+        """
+        keep = keep or set()
+        if not urls:
+            return
+        async with httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=self.timeout,
+            headers={"User-Agent": USER_AGENT},
+        ) as client:
+            # Per-host politeness also applies to plain HTTP fetches
+            async for index, page in get_crawl_scheduler().stream(
+                urls, lambda url: self.fetch(client, url, keep=url in keep)
+            ):
+                yield urls[index], page
+
+    async def fetch_many(self, urls: List[str]) -> Dict[str, StaticPage]:
+        """Pages that were served statically, keyed by URL."""
+        return {url: page async for url, page in self.stream_many(urls) if page}
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {"served": self._served, "escalations": dict(self._escalations)}
+
+
+def static_fetch_enabled() -> bool:
+    return os.getenv("STATIC_FETCH_ENABLED", "1") == "1"
+
+
+_static_fetcher = StaticFetcher()
+
+
+def get_static_fetcher() -> StaticFetcher:
+    """Process-wide static fetcher."""
+    return _static_fetcher
@@ -0,0 +1,246 @@
+"""Per-call-site LLM telemetry: latency, tokens, retries and provider cache status.
+
+Every model call produces an `LLMCallRecord` which is aggregated per call site
+for the metrics endpoint and emitted as a single-line JSON structured log on
+the "autoresume.llm" logger. Responses are streamed, so time to first token
+is the delay until the first partial chunk rather than the whole response.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+structured_logger = logging.getLogger("autoresume.llm")
+
+# Number of recent latency samples kept per call site for percentiles
+_SAMPLES_PER_SITE = 200
+
+
+@dataclass
+class LLMCallRecord:
+    """Measurements for one model call (including its retries)."""
+
+    call_site: str
+    started_at: float
+    wall_ms: float
+    ttft_ms: Optional[float] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    retries: int = 0
+    requests: int = 1
+    success: bool = True
+    error: Optional[str] = None
+
+    @property
+    def cache_status(self) -> str:
+        """Whether the provider served part of the prompt from its cache."""
+        if self.cached_tokens is None:
+            return "unknown"
+        return "hit" if self.cached_tokens > 0 else "miss"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["cache_status"] = self.cache_status
+        return data
+
+
+class _SiteStats:
+    """Running aggregates for one call site."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.requests = 0
+        self.retries = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cached_tokens = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.wall_ms = deque(maxlen=_SAMPLES_PER_SITE)
+        self.ttft_ms = deque(maxlen=_SAMPLES_PER_SITE)
+        self.prompts_built = 0
+        self.prompts_trimmed = 0
+        self.prompt_tokens_trimmed = 0
+        self.prompt_tokens = deque(maxlen=_SAMPLES_PER_SITE)
+        self.fallbacks = 0
+
+    def add(self, record: LLMCallRecord):
+        self.calls += 1
+        self.errors += 0 if record.success else 1
+        self.requests += record.requests
+        self.retries += record.retries
+        self.input_tokens += record.input_tokens or 0
+        self.output_tokens += record.output_tokens or 0
+        self.cached_tokens += record.cached_tokens or 0
+        if record.cache_status == "hit":
+            self.cache_hits += 1
+        elif record.cache_status == "miss":
+            self.cache_misses += 1
+        self.wall_ms.append(record.wall_ms)
+        if record.ttft_ms is not None:
+            self.ttft_ms.append(record.ttft_ms)
+
+    def add_prompt(self, size):
+        self.prompts_built += 1
+        if size.trimmed:
+            self.prompts_trimmed += 1
+            self.prompt_tokens_trimmed += size.tokens_trimmed
+        self.prompt_tokens.append(size.tokens)
+
+    @staticmethod
+    def _summary(samples) -> Dict[str, float]:
+        if not samples:
+            return {"avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+
+        def pick(p):
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2)
+
+        return {
+            "avg": round(sum(ordered) / len(ordered), 2),
+            "p50": pick(0.5),
+            "p95": pick(0.95),
+            "max": round(ordered[-1], 2),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "requests": self.requests,
+            "retries": self.retries,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "wall_ms": self._summary(self.wall_ms),
+            "ttft_ms": self._summary(self.ttft_ms),
+            "fallbacks": self.fallbacks,
+            "prompts": {
+                "built": self.prompts_built,
+                "trimmed": self.prompts_trimmed,
+                "tokens_trimmed": self.prompt_tokens_trimmed,
+                "tokens": self._summary(self.prompt_tokens),
+            },
+        }
+
+
+class Telemetry:
+    """Thread-safe registry of LLM call records grouped by call site."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sites: Dict[str, _SiteStats] = defaultdict(_SiteStats)
+
+    def record(self, record: LLMCallRecord):
+        """Aggregate a finished call and emit it as a structured log line."""
+        with self._lock:
+            self._sites[record.call_site].add(record)
+        structured_logger.info(json.dumps({"event": "llm_call", **record.to_dict()}))
+
+    def record_prompt(self, size):
+        """Aggregate the measured size of an assembled prompt (see ai.prompt_builder)."""
+        with self._lock:
+            self._sites[size.call_site].add_prompt(size)
+        structured_logger.info(
+            json.dumps(
+                {
+                    "event": "prompt_built",
+                    "call_site": size.call_site,
+                    "tokens": size.tokens,
+                    "budget_tokens": size.budget_tokens,
+                    "trimmed": size.trimmed,
+                }
+            )
+        )
+
+    def record_fallback(self, call_site: str, reason: str):
+        """Count a response that was discarded in favour of the original input."""
+        with self._lock:
+            self._sites[call_site].fallbacks += 1
+        structured_logger.info(
+            json.dumps(
+                {"event": "llm_fallback", "call_site": call_site, "reason": reason}
+            )
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Aggregated metrics for every call site seen so far."""
+        with self._lock:
+            return {site: stats.snapshot() for site, stats in self._sites.items()}
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+
+
+class CallTimer:
+    """
+    Collects measurements while a call is in progress.
+
+    Example:
+        >>> timer = CallTimer("cover_letter")
+        >>> ...  # timer.first_token() when the first partial event arrives
+        >>> get_telemetry().record(timer.finish(success=True))
+    """
+
+    def __init__(self, call_site: str):
+        self.call_site = call_site
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._attempt_start = self._start
+        self.ttft_ms: Optional[float] = None
+        self.input_tokens: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+        self.cached_tokens: Optional[int] = None
+        self.retries = 0
+        self.requests = 1
+
+    def new_attempt(self):
+        """Restart the time-to-first-token clock for a retry."""
+        self._attempt_start = time.perf_counter()
+        self.ttft_ms = None
+
+    def first_token(self):
+        if self.ttft_ms is None:
+            self.ttft_ms = round((time.perf_counter() - self._attempt_start) * 1000, 2)
+
+    def add_usage(self, input_tokens=None, output_tokens=None, cached_tokens=None):
+        """Accumulate token counts reported by the provider."""
+        for name, value in (
+            ("input_tokens", input_tokens),
+            ("output_tokens", output_tokens),
+            ("cached_tokens", cached_tokens),
+        ):
+            if value is not None:
+                setattr(self, name, (getattr(self, name) or 0) + value)
+
+    def finish(self, success: bool = True, error: Optional[str] = None):
+        return LLMCallRecord(
+            call_site=self.call_site,
+            started_at=self.started_at,
+            wall_ms=round((time.perf_counter() - self._start) * 1000, 2),
+            ttft_ms=self.ttft_ms,
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            cached_tokens=self.cached_tokens,
+            retries=self.retries,
+            requests=self.requests,
+            success=success,
+            error=error,
+        )
+
+
+_telemetry = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    """Process-wide telemetry registry."""
+    return _telemetry
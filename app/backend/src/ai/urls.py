@@ -0,0 +1,69 @@
+"""URL canonicalization shared by the page cache and the link store."""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Click identifiers ad, social and mail platforms append to links. Generic
+# names like ``ref`` are kept: on some sites (GitHub's ``?ref=branch``) they
+# select the content.
+TRACKING_PARAMS = frozenset(
+    [
+        "dclid",
+        "fbclid",
+        "gbraid",
+        "gclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "msclkid",
+        "ttclid",
+        "twclid",
+        "wbraid",
+        "yclid",
+    ]
+)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings share one identity.
+
+    Treats http and https as the same and a missing scheme as https,
+    lowercases the host, drops ``www.``, default ports, fragments, ``utm_*``
+    parameters, click identifiers and trailing slashes, and sorts the query
+    string.
+
+    Example:
+        >>> canonicalize_url("http://www.GitHub.com/octocat/?utm_source=x#top")
+        'https://github.com/octocat'
+        >>> canonicalize_url("github.com/octocat")
+        'https://github.com/octocat'
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    if not parts.netloc:
+        # Pasted links often omit the scheme
+        parts = urlsplit(f"https://{url}")
+    scheme = (parts.scheme or "https").lower()
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if scheme == "http":
+        scheme = "https"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
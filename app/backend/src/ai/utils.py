@@ -43,3 +43,14 @@ LATEX_BLOCK_PATTERN = re.compile(r"^```(?:\w+)?\s*|```$", re.MULTILINE)
 def clean_latex_block(text: str) -> str:
     """Optimized LaTeX block cleaning with compiled regex."""
     return LATEX_BLOCK_PATTERN.sub("", text.strip()).strip()
+
+
+# Rough characters-per-token ratio for Gemini tokenizers on English/LaTeX text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text) -> int:
+    """Cheap local token estimate (no API round-trip)."""
+    if isinstance(text, list):
+        text = "".join(text)
+    return len(text) // CHARS_PER_TOKEN + 1
@@ -9,11 +9,15 @@ from routes import (
     clear_resume_router,
     save_settings_router,
     cover_letter_router,
+    metrics_router,
 )
 from routes.sse import sse_router
 from routes.questionnaire import questionnaire_router
 from routes.job_search import job_search_router
 from routes.ats_resume import ats_resume_router
+from routes.fake_llm import fake_llm_router
+from ai.fake_llm import use_fake_backend
+from ai.browser_pool import get_browser_pool
 
 
 from utils import initialise_pdf
@@ -24,7 +28,11 @@ from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Launch crawl browsers in the background so the first link skips cold start
+    if os.getenv("BROWSER_POOL_WARM_ON_START", "1") == "1":
+        get_browser_pool().warm_up()
     yield
+    await get_browser_pool().shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -55,6 +63,10 @@ app.include_router(questionnaire_router)
 app.include_router(job_search_router)
 app.include_router(cover_letter_router)
 app.include_router(ats_resume_router)
+app.include_router(metrics_router)
+
+if use_fake_backend():
+    app.include_router(fake_llm_router)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000)
@@ -5,6 +5,7 @@ from routes.update import update_resume_router
 from routes.clear import clear_resume_router
 from routes.settings import save_settings_router
 from routes.cover_letter import cover_letter_router
+from routes.metrics import metrics_router
 
 __all__ = [
     "serve_pdf_router",
@@ -12,4 +13,5 @@ __all__ = [
     "clear_resume_router",
     "save_settings_router",
     "cover_letter_router",
+    "metrics_router",
 ]
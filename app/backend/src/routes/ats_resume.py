@@ -3,7 +3,7 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse, FileResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import logging
 from pathlib import Path
 
@@ -24,6 +24,15 @@ class ATSResumeRequest(BaseModel):
     company: str
     title: str
     job_url: Optional[str] = None
+    profile: Optional[str] = None
+    keywords: Optional[List[str]] = None
+
+
+class KeywordBatchRequest(BaseModel):
+    """Batched keyword extraction request model."""
+
+    descriptions: List[str]
+    profile: Optional[str] = None
 
 
 class ATSResumeUpdateRequest(BaseModel):
@@ -50,7 +59,11 @@ async def generate_ats_resume(request: ATSResumeRequest):
 
         # Submit task to queue
         message = await generate_ats_resume_task.kiq(
-            request.job_description, request.company, request.title
+            request.job_description,
+            request.company,
+            request.title,
+            request.profile,
+            request.keywords,
         )
 
         # Track task
@@ -80,6 +93,35 @@ async def generate_ats_resume(request: ATSResumeRequest):
         )
 
 
+@ats_resume_router.post("/api/ats-resume/keywords")
+async def extract_keywords_batch(request: KeywordBatchRequest):
+    """
+    Extract ATS keywords for several job descriptions in one batched LLM call.
+
+    The returned lists can be passed back as `keywords` to
+    /api/ats-resume/generate so each job skips its own extraction call.
+
+    Args:
+        request: Job descriptions to analyse
+
+    Returns:
+        JSON with one keyword list per description, in request order
+    """
+    try:
+        from ai.ats_optimizer import ResumeATSOptimizer
+
+        optimizer = ResumeATSOptimizer(top_keywords=20, profile=request.profile)
+        keywords = await optimizer.extract_job_keywords_batch(request.descriptions)
+
+        return JSONResponse({"success": True, "keywords": keywords})
+
+    except Exception as e:
+        logger.error(f"Error extracting keywords: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to extract keywords: {str(e)}"
+        )
+
+
 @ats_resume_router.post("/api/ats-resume/update")
 async def update_ats_resume(request: ATSResumeUpdateRequest):
     """
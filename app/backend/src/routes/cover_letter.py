@@ -24,6 +24,7 @@ class CoverLetterRequest(BaseModel):
     company: str
     title: str
     job_url: Optional[str] = None
+    profile: Optional[str] = None
 
 
 class CoverLetterUpdateRequest(BaseModel):
@@ -50,7 +51,7 @@ async def generate_cover_letter(request: CoverLetterRequest):
 
         # Submit task to queue
         message = await generate_cover_letter_task.kiq(
-            request.job_description, request.company, request.title
+            request.job_description, request.company, request.title, request.profile
         )
 
         # Track task
@@ -0,0 +1,69 @@
+"""OpenAI-compatible chat-completions endpoint backed by the offline fake LLM.
+
+Only mounted when AUTORESUME_LLM_BACKEND=fake; crawl4ai's LLMExtractionStrategy
+is pointed here so crawling can be benchmarked without a Gemini key.
+"""
+
+import asyncio
+import time
+import uuid
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+from ai.fake_llm import LatencyModel, fake_completion, fake_usage
+
+fake_llm_router = APIRouter()
+
+
+class ChatCompletionRequest(BaseModel):
+    """Subset of the OpenAI chat-completions request body."""
+
+    model: str
+    messages: List[Dict[str, Any]]
+    max_tokens: Optional[int] = None
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content)
+    return content
+
+
+@fake_llm_router.post("/fake-llm/v1/chat/completions")
+async def chat_completions(request: ChatCompletionRequest):
+    """
+    Answer a chat completion with a deterministic, prompt-derived response.
+
+    Returns:
+        OpenAI-style completion JSON including token usage
+    """
+    prompt = "\n".join(_message_text(m) for m in request.messages)
+    completion = fake_completion(prompt)
+    usage = fake_usage(prompt, completion)
+
+    latency = LatencyModel.from_env()
+    await asyncio.sleep(
+        latency.first_token_delay(prompt)
+        + latency.generation_delay(usage["completion_tokens"], prompt)
+    )
+
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": completion},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            **usage,
+            "total_tokens": usage["prompt_tokens"] + usage["completion_tokens"],
+        },
+    }
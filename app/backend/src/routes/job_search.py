@@ -4,10 +4,13 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
 import logging
 from pathlib import Path
+from uuid import uuid4
 
 from ai.jobs import JobMatcher, JobMatcherError, ResumeParseError
+from ai.job_store import get_job_store
 from task_queue import job_search_task
 
 logger = logging.getLogger(__name__)
@@ -27,6 +30,8 @@ class JobSearchRequest(BaseModel):
     job_title: str = "software engineer"
     max_results: int = 50
     sites: List[str] = ["indeed", "linkedin", "zip_recruiter", "google"]
+    # Bypass cached results for the same search
+    refresh: bool = False
 
 
 @job_search_router.get("/api/jobs/skills")
@@ -88,12 +93,20 @@ async def search_jobs(request: JobSearchRequest):
             f"location={request.location}, max_results={request.max_results}"
         )
 
-        message = await job_search_task.kiq(
-            resume_path=str(resume_path),
-            location=request.location,
-            job_title=request.job_title,
-            max_results=request.max_results,
-            sites=request.sites,
+        # The task id doubles as the key its per-site results are published under
+        search_id = uuid4().hex
+        message = await (
+            job_search_task.kicker()
+            .with_task_id(search_id)
+            .kiq(
+                resume_path=str(resume_path),
+                location=request.location,
+                job_title=request.job_title,
+                max_results=request.max_results,
+                sites=request.sites,
+                search_id=search_id,
+                refresh=request.refresh,
+            )
         )
 
         active_job_search_tasks.append(message.task_id)
@@ -113,3 +126,24 @@ async def search_jobs(request: JobSearchRequest):
         raise HTTPException(
             status_code=500, detail=f"Job search failed to start: {str(e)}"
         )
+
+
+@job_search_router.get("/api/jobs/new")
+async def get_new_jobs(since_search_id: Optional[int] = None):
+    """
+    Postings that no search up to `since_search_id` had returned.
+
+    Args:
+        since_search_id: Last search the client has seen (the `store_search_id`
+            of its previous job_update); defaults to the one before the latest
+
+    Returns:
+        JSON with the latest search's id, time and totals, and the new postings
+    """
+    try:
+        latest = await asyncio.to_thread(get_job_store().new_since, since_search_id)
+    except Exception as e:
+        logger.error(f"Error reading new jobs: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to read jobs: {str(e)}")
+
+    return JSONResponse(content={"success": True, **latest})
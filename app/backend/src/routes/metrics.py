@@ -0,0 +1,73 @@
+"""Metrics endpoints for LLM call governance and telemetry."""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from ai.browser_pool import get_browser_pool
+from ai.crawl_scheduler import get_crawl_scheduler
+from ai.job_cache import get_job_search_cache
+from ai.job_store import get_job_store
+from ai.limiter import get_limiter
+from ai.page_cache import get_page_cache
+from ai.site_adapters import adapter_stats
+from ai.static_fetch import get_static_fetcher
+from ai.telemetry import get_telemetry
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/api/metrics/llm")
+async def llm_metrics():
+    """
+    Report limiter state and per-call-site telemetry for this process.
+
+    Returns:
+        JSON with limiter counters and queue-wait stats, plus latency,
+        time-to-first-token, token, retry and cache figures per call site
+    """
+    return JSONResponse(
+        content={
+            "limiter": get_limiter().metrics(),
+            "call_sites": get_telemetry().snapshot(),
+        }
+    )
+
+
+@metrics_router.get("/api/metrics/crawl")
+async def crawl_metrics():
+    """
+    Report browser pool, page cache, static fetch and scheduler usage for this process.
+
+    Returns:
+        JSON with browser launches, recycles, navigations and pages in flight,
+        page cache hits, revalidations and misses, pages served without a
+        browser with escalation reasons, pages parsed by each site adapter,
+        and crawl scheduler dispatch and wait counts with requests in flight
+        per host
+    """
+    return JSONResponse(
+        content={
+            "browser_pool": get_browser_pool().metrics(),
+            "page_cache": get_page_cache().stats(),
+            "static_fetch": get_static_fetcher().stats(),
+            "site_adapters": adapter_stats(),
+            "scheduler": get_crawl_scheduler().metrics(),
+        }
+    )
+
+
+@metrics_router.get("/api/metrics/jobs")
+async def job_metrics():
+    """
+    Report job search cache usage for this process and the stored postings.
+
+    Returns:
+        JSON with search cache hits, misses, expirations, evictions and size,
+        and the number of postings in the job store
+    """
+    return JSONResponse(
+        content={
+            "search_cache": get_job_search_cache().stats(),
+            "stored_jobs": get_job_store().count(),
+        }
+    )
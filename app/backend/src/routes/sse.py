@@ -4,6 +4,7 @@ import asyncio
 import logging
 import json
 from task_queue import broker
+from ai.job_progress import get_job_progress
 from .update import active_tasks
 from .cover_letter import active_cover_letter_tasks
 from .ats_resume import active_ats_tasks
@@ -35,6 +36,14 @@ async def sse_endpoint():
                 try:
                     logger.info(f"[JOB SEARCH SSE] Checking task {task_id}")
 
+                    # Stream sites that finished since the last poll
+                    for site_event in get_job_progress().drain(task_id):
+                        logger.info(
+                            f"[JOB SEARCH SSE] Emitting job_site_update for "
+                            f"{site_event['site']}"
+                        )
+                        yield f"event: job_site_update\ndata: {json.dumps(site_event)}\n\n"
+
                     try:
                         result = await broker.result_backend.get_result(task_id)
                         logger.info(
@@ -56,6 +65,10 @@ async def sse_endpoint():
                         # Job search completed, remove from active list and emit event
                         active_job_search_tasks.remove(task_id)
 
+                        # Sites that finished right before the task did
+                        for site_event in get_job_progress().drain(task_id):
+                            yield f"event: job_site_update\ndata: {json.dumps(site_event)}\n\n"
+
                         if hasattr(result, "is_err") and result.is_err:
                             logger.error(
                                 f"Job search task {task_id} failed: {result.error}"
@@ -80,6 +93,7 @@ async def sse_endpoint():
                     logger.error(f"[JOB SEARCH SSE] Error: {e}", exc_info=True)
                     if task_id in active_job_search_tasks:
                         active_job_search_tasks.remove(task_id)
+                    get_job_progress().discard(task_id)
 
             # Check cover letter tasks independently
             for task_id in active_cover_letter_tasks[:]:
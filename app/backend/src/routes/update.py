@@ -3,15 +3,18 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 import aiofiles
+import asyncio
 import logging
 from pydantic import BaseModel
 from typing import List, Optional
 from dotenv import load_dotenv
 
+from ai.link_store import get_link_store
 from task_queue import (
     update_resume_with_links_task,
     update_resume_with_feedback_task,
     optimize_resume_for_job_task,
+    update_resume_combined_task,
     update_resume_with_tex,
 )
 
@@ -26,6 +29,7 @@ class LinkRequest(BaseModel):
     joblink: Optional[str] = ""
     tex_content: Optional[str] = ""
     template_id: Optional[str] = ""
+    profile: Optional[str] = None
 
 
 update_resume_router = APIRouter()
@@ -37,15 +41,8 @@ active_tasks = []
 @update_resume_router.post("/api/update-resume")
 async def update_resume(payload: LinkRequest):
     try:
-        # Read existing cached links
-        try:
-            async with aiofiles.open("assets/link_cache.txt") as f:
-                curr_links = [line.strip() async for line in f]
-        except FileNotFoundError:
-            curr_links = []
-
-        links_in_request = payload.links
-        links = list(set(links_in_request) - set(curr_links))
+        # Skip links already applied, including other spellings of the same URL
+        links = await asyncio.to_thread(get_link_store().new_links, payload.links)
         feedback = payload.feedback
         job_link = payload.joblink
         _tex_content = payload.tex_content
@@ -74,20 +71,37 @@ async def update_resume(payload: LinkRequest):
             logger.info(f"✓ Submitted tex task: {message.task_id}")
             tasks_submitted += 1
 
-        if len(links) > 0:
-            message = await update_resume_with_links_task.kiq(links)
+        has_job_link = bool(job_link and job_link.strip())
+        update_inputs = sum([len(links) > 0, len(feedback) > 0, has_job_link])
+
+        if update_inputs > 1:
+            # One crawl phase, one LLM rewrite and one compile for all inputs
+            message = await update_resume_combined_task.kiq(
+                links,
+                feedback,
+                job_link.strip() if has_job_link else "",
+                payload.profile,
+            )
+            active_tasks.append(message.task_id)
+            logger.info(f"✓ Submitted combined task: {message.task_id}")
+            tasks_submitted += 1
+
+        elif len(links) > 0:
+            message = await update_resume_with_links_task.kiq(links, payload.profile)
             active_tasks.append(message.task_id)
             logger.info(f"✓ Submitted links task: {message.task_id}")
             tasks_submitted += 1
 
-        if len(feedback) > 0:
-            message = await update_resume_with_feedback_task.kiq(feedback)
+        elif len(feedback) > 0:
+            message = await update_resume_with_feedback_task.kiq(
+                feedback, payload.profile
+            )
             active_tasks.append(message.task_id)
             logger.info(f"✓ Submitted feedback task: {message.task_id}")
             tasks_submitted += 1
 
-        if job_link and job_link.strip():
-            message = await optimize_resume_for_job_task.kiq(job_link)
+        elif has_job_link:
+            message = await optimize_resume_for_job_task.kiq(job_link, payload.profile)
             active_tasks.append(message.task_id)
             logger.info(f"✓ Submitted job task: {message.task_id}")
             tasks_submitted += 1
@@ -1,25 +1,29 @@
 """Simple task queue using Taskiq with in-memory broker - zero external setup needed."""
 
 from taskiq import InMemoryBroker
-import concurrent
 import asyncio
 import logging
+import os
 from pathlib import Path
 import threading
 import time
-import aiofiles
 from dotenv import load_dotenv
 
-from ai.prompts import (
-    build_generic_prompt,
-    build_editing_prompt,
-    build_editing_prompt,
-    build_job_optimize_prompt,
-)
+from ai.prompts import build_combined_prompt
 from ai.jobs import JobMatcher, JobMatcherError, ResumeParseError
+from ai.job_progress import get_job_progress
+from ai.job_store import get_job_store, job_key
+from ai.link_store import get_link_store
 from ai import append_and_compile
 from ai.utils import read_file, compile_tex
-from utils import initialise_pdf, clear_pdf, clear_link_cache, _extract_relevant_info
+from utils import (
+    initialise_pdf,
+    clear_pdf,
+    clear_link_cache,
+    _collect_relevant_info,
+    _extract_relevant_info,
+    _stream_relevant_info,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,36 +34,22 @@ broker = InMemoryBroker()
 
 load_dotenv()
 
+# Seconds the links update waits for slow sources before starting without them
+LINKS_FIRST_PASS_DEADLINE_SECONDS = float(
+    os.getenv("LINKS_FIRST_PASS_DEADLINE_SECONDS", "20")
+)
+
 
 @broker.task
-def update_resume_with_links_task(links):
+def update_resume_with_links_task(links, profile=None):
     """Update resume with extracted information from links."""
     try:
         logger.info(f"Processing links: {links}")
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop=loop)
-
-        with concurrent.futures.ProcessPoolExecutor() as pool:
-            relevant_info = loop.run_until_complete(
-                loop.run_in_executor(pool, _extract_relevant_info, links)
-            )
-
-        loop.close()
-
-        # Build prompt
-        curr_code = read_file("assets/user_file.tex")
-        curr_prompt = build_generic_prompt(relevant_info, curr_code)
-
-        # Update resume
-        asyncio.run(
-            append_and_compile(
-                relevant_info, "assets/user_file.tex", "assets", prompt=curr_prompt
-            )
-        )
+        extracted = asyncio.run(_update_with_links(links, profile))
 
-        # Cache links
-        asyncio.run(_cache_links(links))
+        # Remember applied links so they are not crawled again
+        asyncio.run(_record_links(extracted))
 
         logger.info("Resume update with links completed successfully")
         return {"status": "completed", "message": "Resume updated with links"}
@@ -70,20 +60,20 @@ def update_resume_with_links_task(links):
 
 
 @broker.task
-def update_resume_with_feedback_task(feedback):
+def update_resume_with_feedback_task(feedback, profile=None):
     """Update resume with user feedback."""
     try:
         logger.info(f"Processing feedback: {feedback}")
 
-        # Build editing prompt
-        curr_code = read_file("assets/user_file.tex")
-        curr_prompt = build_editing_prompt(feedback, curr_code)
-
-        # Update resume
-        relevant_info = {}  # No crawled info for feedback updates
+        # Update resume; the editing prompt (or per-section prompts for long
+        # resumes) is built from the feedback
         asyncio.run(
             append_and_compile(
-                relevant_info, "assets/user_file.tex", "assets", prompt=curr_prompt
+                feedback,
+                "assets/user_file.tex",
+                "assets",
+                kind="edit",
+                profile=profile,
             )
         )
 
@@ -96,38 +86,90 @@ def update_resume_with_feedback_task(feedback):
 
 
 @broker.task
-def optimize_resume_for_job_task(job_link):
+def optimize_resume_for_job_task(job_link, profile=None):
     """Optimize resume for specific job posting."""
     try:
         logger.info(f"Processing job link: {job_link}")
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop=loop)
+        job_description = asyncio.run(_extract_relevant_info(job_link, "job_desc"))
 
-        with concurrent.futures.ProcessPoolExecutor() as pool:
-            mode = "job_desc"
-            job_description = loop.run_until_complete(
-                loop.run_in_executor(pool, _extract_relevant_info, job_link, mode)
+        # Update resume; the optimization prompt is built from the description
+        asyncio.run(
+            append_and_compile(
+                job_description,
+                "assets/user_file.tex",
+                "assets",
+                kind="job",
+                profile=profile,
             )
+        )
 
-        loop.close()
+        logger.info("Resume optimization for job completed successfully")
+        return {"status": "completed", "message": "Resume optimized for job"}
 
-        # Build optimization prompt
+    except Exception as e:
+        logger.error(f"Error in optimize_resume_for_job_task: {str(e)}")
+        raise
+
+
+@broker.task
+def update_resume_combined_task(links, feedback, job_link, profile=None):
+    """Apply links, feedback and a job link together in one LLM pass and one compile."""
+    try:
+        logger.info(
+            f"Processing combined update - Links: {len(links)}, "
+            f"Feedback: {bool(feedback)}, JobLink: {bool(job_link)}"
+        )
+
+        # Crawl links and the job posting in parallel
+        async def crawl():
+            crawls = []
+            if links:
+                crawls.append(_collect_relevant_info(links))
+            if job_link:
+                crawls.append(_extract_relevant_info(job_link, "job_desc"))
+            return list(await asyncio.gather(*crawls))
+
+        crawled = asyncio.run(crawl())
+
+        relevant_info, extracted = crawled.pop(0) if links else ("", {})
+        job_description = crawled.pop(0) if job_link else ""
+
+        # Build one composite prompt
         curr_code = read_file("assets/user_file.tex")
-        curr_prompt = build_job_optimize_prompt(job_description, curr_code)
+        curr_prompt = build_combined_prompt(
+            relevant_info, feedback, job_description, curr_code
+        )
+        section_info = "\n\n".join(
+            f"### {label}:\n{value}"
+            for label, value in (
+                ("Additional Information", relevant_info),
+                ("User Feedback", feedback),
+                ("Job Description", job_description),
+            )
+            if value
+        )
 
         # Update resume
         asyncio.run(
             append_and_compile(
-                job_description, "assets/user_file.tex", "assets", prompt=curr_prompt
+                section_info,
+                "assets/user_file.tex",
+                "assets",
+                prompt=curr_prompt,
+                kind="combined",
+                profile=profile,
             )
         )
 
-        logger.info("Resume optimization for job completed successfully")
-        return {"status": "completed", "message": "Resume optimized for job"}
+        if extracted:
+            asyncio.run(_record_links(extracted))
+
+        logger.info("Combined resume update completed successfully")
+        return {"status": "completed", "message": "Resume updated in a single pass"}
 
     except Exception as e:
-        logger.error(f"Error in optimize_resume_for_job_task: {str(e)}")
+        logger.error(f"Error in update_resume_combined_task: {str(e)}")
         raise
 
 
@@ -155,15 +197,73 @@ def update_resume_with_tex(tex_content):
         raise
 
 
-async def _cache_links(links):
-    """Helper function to cache processed links."""
-    async with aiofiles.open("assets/link_cache.txt", mode="a") as f:
-        for link in links:
-            await f.write(link + "\n")
+async def _apply_sources(sources, profile=None):
+    """Run one resume update with the given extracted sources."""
+    relevant_info = "\n".join(sources[i] for i in sorted(sources))
+    await append_and_compile(
+        relevant_info,
+        "assets/user_file.tex",
+        "assets",
+        profile=profile,
+    )
+
+
+async def _update_with_links(links, profile=None):
+    """
+    Update the resume from links as their crawls complete.
+
+    Sources ready within the deadline go into a first update; sources that
+    finish later are folded in with a second update, so one slow site does
+    not hold back the rest.
+
+    Returns:
+        Extracted text per link that contributed to the resume
+    """
+    sources = {}
+
+    async def drain():
+        async for index, text in _stream_relevant_info(links):
+            sources[index] = text
+
+    def ready():
+        return {i: text for i, text in sources.items() if text}
+
+    crawling = asyncio.create_task(drain())
+    await asyncio.wait({crawling}, timeout=LINKS_FIRST_PASS_DEADLINE_SECONDS)
+    first_pass = ready()
+    if not first_pass:
+        # Nothing usable yet; wait for the rest rather than run an empty pass
+        await crawling
+        first_pass = ready()
+    if not first_pass:
+        logger.warning("No content could be extracted from the links")
+        return {}
+
+    if not crawling.done():
+        logger.info(
+            f"Updating resume with {len(first_pass)} of {len(links)} sources; "
+            "folding in the rest when they finish"
+        )
+    await _apply_sources(first_pass, profile)
+
+    await crawling
+    stragglers = {i: text for i, text in ready().items() if i not in first_pass}
+    if stragglers:
+        logger.info(f"Folding {len(stragglers)} late sources into the resume")
+        await _apply_sources(stragglers, profile)
+
+    return {links[i]: text for i, text in ready().items()}
+
+
+async def _record_links(extracted):
+    """Record applied links with their extracted text in the link store."""
+    await asyncio.to_thread(get_link_store().record, extracted)
 
 
 @broker.task
-def generate_cover_letter_task(job_description: str, company: str, title: str):
+def generate_cover_letter_task(
+    job_description: str, company: str, title: str, profile: str = None
+):
     """Task to generate a job-specific cover letter."""
 
     async def _generate_async():
@@ -175,7 +275,7 @@ def generate_cover_letter_task(job_description: str, company: str, title: str):
             from ai.cover_letter import CoverLetterGenerator
 
             # Concurrent: Create generator and validate paths
-            generator = CoverLetterGenerator()
+            generator = CoverLetterGenerator(profile=profile)
 
             # Generate cover letter (already async)
             result = await generator.generate(
@@ -227,71 +327,69 @@ def generate_cover_letter_task(job_description: str, company: str, title: str):
 
 
 @broker.task
-def generate_ats_resume_task(job_description: str, company: str, title: str):
-    """Task to generate ATS-optimized resume for specific job."""
+async def generate_ats_resume_task(
+    job_description: str,
+    company: str,
+    title: str,
+    profile: str = None,
+    keywords: list = None,
+):
+    """Task to generate ATS-optimized resume for specific job.
 
-    async def _generate_async():
-        """Async implementation for ATS resume generation."""
-        logger.info(f"Generating ATS resume for {company} - {title}")
+    Runs natively on the broker's event loop; blocking work (pandoc, file I/O,
+    pdflatex) is pushed to threads instead of spinning up extra event loops.
+    """
+    logger.info(f"Generating ATS resume for {company} - {title}")
 
-        try:
-            # Import here to avoid circular imports
-            from ai.ats_optimizer import ResumeATSOptimizer
-
-            # Create optimizer
-            optimizer = ResumeATSOptimizer(top_keywords=20)
-
-            # Generate optimized resume
-            resume_path = Path("assets/user_file.tex")
-            result = await asyncio.to_thread(
-                optimizer.optimize,
-                job_description=job_description,
-                company=company,
-                title=title,
-                resume_path=resume_path,
-            )
+    try:
+        # Import here to avoid circular imports
+        from ai.ats_optimizer import ResumeATSOptimizer
+
+        # Create optimizer
+        optimizer = ResumeATSOptimizer(top_keywords=20, profile=profile)
+
+        # Generate optimized resume
+        resume_path = Path("assets/user_file.tex")
+        result = await optimizer.optimize_async(
+            job_description=job_description,
+            company=company,
+            title=title,
+            resume_path=resume_path,
+            job_keywords=keywords,
+        )
 
-            # Ensure assets directory exists
-            assets_dir = Path("assets")
-            assets_dir.mkdir(parents=True, exist_ok=True)
+        # Ensure assets directory exists
+        assets_dir = Path("assets")
+        assets_dir.mkdir(parents=True, exist_ok=True)
 
-            # Write optimized resume
-            tex_path = assets_dir / "optimized_resume.tex"
+        # Write optimized resume
+        tex_path = assets_dir / "optimized_resume.tex"
 
-            await asyncio.to_thread(
-                lambda: open(tex_path, "w", encoding="utf-8").write(
-                    result["tex_content"]
-                )
-            )
+        await asyncio.to_thread(
+            tex_path.write_text, result["tex_content"], encoding="utf-8"
+        )
 
-            # Compile to PDF
-            await asyncio.to_thread(compile_tex, str(assets_dir), str(tex_path))
+        # Compile to PDF
+        compile_start = time.perf_counter()
+        await asyncio.to_thread(compile_tex, str(assets_dir), str(tex_path))
+        timings = dict(result["timings"])
+        timings["compile"] = round((time.perf_counter() - compile_start) * 1000, 2)
 
-            logger.info(
-                f"ATS resume generated and compiled successfully for {company}. "
-                f"Added {len(result['keywords_added'])} keywords, "
-                f"matched {len(result['keywords_matched'])} existing."
-            )
-
-            return {
-                "status": "completed",
-                "message": f"ATS resume generated for {company}",
-                "keywords_added": result["keywords_added"],
-                "keywords_matched": result["keywords_matched"],
-            }
+        logger.info(
+            f"ATS resume generated and compiled successfully for {company}. "
+            f"Added {len(result['keywords_added'])} keywords, "
+            f"matched {len(result['keywords_matched'])} existing. "
+            f"Timings (ms): {timings}"
+        )
 
-        except Exception as e:
-            logger.error(f"Error in ATS resume generation: {str(e)}", exc_info=True)
-            raise
+        return {
+            "status": "completed",
+            "message": f"ATS resume generated for {company}",
+            "keywords_added": result["keywords_added"],
+            "keywords_matched": result["keywords_matched"],
+            "timings": timings,
+        }
 
-    # Run in new event loop (same as other tasks)
-    try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(_generate_async())
-        finally:
-            loop.close()
     except Exception as e:
         logger.error(f"Error in generate_ats_resume_task: {str(e)}", exc_info=True)
         raise
@@ -306,6 +404,8 @@ def clear_resume_task():
         clear_pdf()
         initialise_pdf()
         clear_link_cache()
+        # Postings seen for the old resume shouldn't hide matches for the new one
+        get_job_store().clear()
         logger.info("Cleared and re-initialized resume.")
     except Exception as e:
         logger.error(f"[Clear Resume Error] {e}", exc_info=True)
@@ -315,10 +415,19 @@ def clear_resume_task():
 
 @broker.task
 def job_search_task(
-    resume_path: str, location: str, job_title: str, max_results: int, sites: list
+    resume_path: str,
+    location: str,
+    job_title: str,
+    max_results: int,
+    sites: list,
+    search_id: str = None,
+    refresh: bool = False,
 ):
     """
     Async task for job search.
+
+    Each site's jobs are published under `search_id` as soon as the site
+    finishes, for the SSE endpoint to stream before the full result is ready.
     """
     try:
         logger.info(
@@ -326,12 +435,20 @@ def job_search_task(
             f"max_results={max_results}"
         )
 
+        def publish(site_result):
+            if search_id:
+                get_job_progress().publish(
+                    search_id, {"task_id": search_id, **site_result.dict()}
+                )
+
         matcher = JobMatcher(Path(resume_path))
         result = matcher.search(
             location=location,
             job_title=job_title,
             max_results=max_results,
             sites=sites,
+            on_site_result=publish,
+            refresh=refresh,
         )
 
         logger.info(
@@ -339,7 +456,22 @@ def job_search_task(
             f"total_jobs={result.total_jobs}"
         )
 
-        return result.dict()
+        payload = result.dict()
+        if result.success:
+            # Keep the postings so later searches can report only what is new
+            try:
+                recorded = get_job_store().record_search(
+                    result.jobs, result.search_params
+                )
+                payload["new_jobs"] = recorded["new_jobs"]
+                payload["store_search_id"] = recorded["search_id"]
+                # Lets the client match postings from /api/jobs/new
+                for job in payload["jobs"]:
+                    job["job_key"] = job_key(job)
+            except Exception as e:
+                logger.error(f"Failed to record job search: {e}", exc_info=True)
+
+        return payload
 
     except Exception as e:
         logger.error(f"Error in job_search_task: {str(e)}", exc_info=True)
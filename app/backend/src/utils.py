@@ -12,6 +12,11 @@ def clear_pdf():
         if "template_preference.txt" in file_path or "custom_template.tex" in file_path:
             continue
 
+        # Cache and store directories (crawled pages, applied links, job
+        # postings) are not resume content; stores are reset by their owners
+        if os.path.isdir(file_path):
+            continue
+
         try:
             os.remove(file_path)
         except Exception as e:
@@ -19,12 +24,19 @@ def clear_pdf():
 
 
 def clear_link_cache():
-    with open("assets/link_cache.txt", "w") as f:
-        f.write("")
+    from ai.link_store import get_link_store
+    from ai.page_cache import get_page_cache
+
+    get_link_store().clear()
+    get_page_cache().clear()
 
 
-# Extract job description in new process to avoid event loop issues
-def _extract_relevant_info(link, task=None):
+async def _extract_relevant_info(link, task=None):
+    """Crawl link(s) and return the extracted text.
+
+    Browser work runs on the shared warm browser pool, so this can be awaited
+    from any event loop.
+    """
     if task is not None:
         mode = "job_desc"
     else:
@@ -34,13 +46,40 @@ def _extract_relevant_info(link, task=None):
 
     _link = [link] if not isinstance(link, list) else link
     extractor = InfoExtractor(mode=mode)
-    return asyncio.run(extractor.get_extracted_text(_link))
+    return await extractor.get_extracted_text(_link)
+
+
+async def _stream_relevant_info(links):
+    """Crawl links, yielding (index, extracted text) as each one completes.
+
+    The text is None for links nothing could be extracted from.
+    """
+    from ai.crawl import InfoExtractor
+
+    extractor = InfoExtractor()
+    async for index, content in extractor.stream_many(links):
+        yield index, (
+            InfoExtractor.format_source(index + 1, content) if content else None
+        )
+
+
+async def _collect_relevant_info(links):
+    """Crawl links and return the combined extracted text plus each link's text.
+
+    Links nothing could be extracted from are left out of both.
+    """
+    texts = {}
+    async for index, text in _stream_relevant_info(links):
+        if text:
+            texts[index] = text
+    combined = "\n".join(texts[i] for i in sorted(texts))
+    return combined, {links[i]: text for i, text in texts.items()}
 
 
 def initialise_pdf():
-    if (
-        len(os.listdir("assets")) <= 2
-    ):  # Allow for template_preference.txt, custom_template.tex
+    # Only the resume itself decides; template files and cache directories
+    # under assets/ persist across resets
+    if not os.path.exists("assets/user_file.tex"):
         content = basic_template
 
         # Check for template preference
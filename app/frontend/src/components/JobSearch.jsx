@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import {
     Box,
     Button,
@@ -23,10 +23,17 @@ const JobSearch = () => {
     const [loadingSkills, setLoadingSkills] = useState(true);
     const [jobs, setJobs] = useState([]);
     const [searching, setSearching] = useState(false);
+    // Task whose per-site results are currently shown
+    const streamingTaskRef = useRef(null);
+    // Postings no earlier search had returned, by job key
+    const [newJobKeys, setNewJobKeys] = useState(new Set());
+    const [showNewOnly, setShowNewOnly] = useState(false);
 
     // Cache key for session storage
     const CACHE_KEY = 'job_search_cache';
     const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
+    // Last stored search this browser has seen, for "new since" queries
+    const LAST_SEARCH_KEY = 'job_search_last_id';
 
     // Fetch skills when component mounts
     useEffect(() => {
@@ -116,16 +123,68 @@ const JobSearch = () => {
         }
     };
 
+    // Fetch postings first seen after the previous search this browser saw
+    const fetchNewJobs = async (storeSearchId) => {
+        const previous = localStorage.getItem(LAST_SEARCH_KEY);
+        localStorage.setItem(LAST_SEARCH_KEY, String(storeSearchId));
+        if (previous === null) {
+            setNewJobKeys(new Set());
+            return 0;
+        }
+
+        try {
+            const response = await fetch(
+                `http://localhost:8000/api/jobs/new?since_search_id=${encodeURIComponent(previous)}`
+            );
+            if (!response.ok) {
+                throw new Error('Failed to fetch new jobs');
+            }
+            const data = await response.json();
+            const keys = new Set((data.jobs || []).map((job) => job.job_key));
+            setNewJobKeys(keys);
+            return keys.size;
+        } catch (error) {
+            console.error('Error fetching new jobs:', error);
+            setNewJobKeys(new Set());
+            return 0;
+        }
+    };
+
     // Listen for SSE updates
     useEffect(() => {
         const eventSource = new EventSource('http://localhost:8000/api/events');
 
-        eventSource.addEventListener('job_update', (event) => {
+        // Each site's jobs arrive as soon as that site finishes
+        eventSource.addEventListener('job_site_update', (event) => {
+            try {
+                const data = JSON.parse(event.data);
+                if (!data.success) {
+                    console.warn(`Job search on ${data.site} failed: ${data.error}`);
+                    return;
+                }
+
+                if (streamingTaskRef.current !== data.task_id) {
+                    // First site of a new search replaces the previous results
+                    streamingTaskRef.current = data.task_id;
+                    setJobs(data.jobs || []);
+                } else {
+                    setJobs((current) => [...current, ...(data.jobs || [])]);
+                }
+            } catch (e) {
+                console.error('Error parsing job site update:', e);
+            }
+        });
+
+        eventSource.addEventListener('job_update', async (event) => {
             try {
                 const data = JSON.parse(event.data);
 
                 if (data.success) {
                     setJobs(data.jobs || []);
+                    setShowNewOnly(false);
+                    const newCount = data.store_search_id
+                        ? await fetchNewJobs(data.store_search_id)
+                        : 0;
 
                     // Cache the results
                     sessionStorage.setItem(CACHE_KEY, JSON.stringify({
@@ -136,7 +195,9 @@ const JobSearch = () => {
 
                     toaster.success({
                         title: 'Success',
-                        description: `Found ${data.total_jobs} jobs matching your skills!`,
+                        description: newCount > 0
+                            ? `Found ${data.total_jobs} jobs matching your skills, ${newCount} new since your last search!`
+                            : `Found ${data.total_jobs} jobs matching your skills!`,
                         duration: 3000,
                     });
                 } else {
@@ -273,11 +334,27 @@ const JobSearch = () => {
 
                 {!searching && jobs.length > 0 && (
                     <>
-                        <Heading size="md" mb={4}>
-                            Found {jobs.length} jobs
-                        </Heading>
+                        <Flex align="center" mb={4}>
+                            <Heading size="md">
+                                Found {jobs.length} jobs
+                            </Heading>
+                            <Spacer />
+                            {newJobKeys.size > 0 && (
+                                <Button
+                                    size="sm"
+                                    colorScheme="green"
+                                    variant={showNewOnly ? 'solid' : 'outline'}
+                                    onClick={() => setShowNewOnly((current) => !current)}
+                                >
+                                    {showNewOnly ? 'Show all jobs' : `Show only new (${newJobKeys.size})`}
+                                </Button>
+                            )}
+                        </Flex>
                         <VStack spacing={4} align="stretch">
-                            {jobs.map((job, index) => (
+                            {(showNewOnly
+                                ? jobs.filter((job) => newJobKeys.has(job.job_key))
+                                : jobs
+                            ).map((job, index) => (
                                 <Box
                                     key={index}
                                     p={6}
@@ -320,6 +397,18 @@ const JobSearch = () => {
                                             </Text>
 
                                             <HStack spacing={3} flexWrap="wrap">
+                                                {newJobKeys.has(job.job_key) && (
+                                                    <Badge
+                                                        colorScheme="green"
+                                                        variant="solid"
+                                                        fontSize="xs"
+                                                        px={2}
+                                                        py={1}
+                                                        borderRadius="md"
+                                                    >
+                                                        New
+                                                    </Badge>
+                                                )}
                                                 {job.location && (
                                                     <HStack spacing={1}>
                                                         <Text fontSize="sm" color="gray.600">📍</Text>
@@ -345,7 +434,7 @@ const JobSearch = () => {
                                                         py={1}
                                                         borderRadius="md"
                                                     >
-                                                        {job.match_score} match
+                                                        {job.match_score}% match
                                                     </Badge>
                                                 )}
                                             </HStack>